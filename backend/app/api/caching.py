@@ -0,0 +1,111 @@
+"""
+条件付きGET（ETag / Last-Modified）
+
+レース詳細・馬の情報は races / horses の data_version（内容が変わるたびに進める）から
+強い ETag を作る。If-None-Match が一致すれば、本体を組み立てずに 304 を返す。
+gzip のまま返す応答は、バイト列が非圧縮の応答と異なるため弱い ETag (W/) にする（If-None-Match は
+弱い比較なので、どちらの ETag でも 304 になる）。
+
+ETag には応答モデルの JSON スキーマのハッシュも含める。応答の形が変わるデプロイの後は、
+DBのデータが同じでも古いキャッシュを使わせない。
+"""
+
+import hashlib
+import json
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import cache
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+# 内容が変わりうる応答: キャッシュしてよいが、使う前に毎回 ETag で確認させる
+CACHE_CONTROL_REVALIDATE = "no-cache"
+# 圧縮の有無を Accept-Encoding で変える応答に付ける Vary
+VARY_ACCEPT_ENCODING = "Accept-Encoding"
+
+
+@cache
+def schema_tag(model: type[BaseModel]) -> str:
+    """応答モデルの JSON スキーマの短いハッシュ"""
+    schema = json.dumps(model.model_json_schema(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(schema.encode()).hexdigest()[:8]
+
+
+def make_etag(
+    model: type[BaseModel], pk: int, data_version: int, updated_at: datetime | None
+) -> str:
+    """
+    行の版から強い ETag を作る
+
+    Args:
+        model: 応答モデル
+        pk: 行の主キー
+        data_version: 行の data_version
+        updated_at: 行の updated_at（DBを作り直して版が振り直された場合も区別する）
+    """
+    stamp = int(updated_at.timestamp() * 1_000_000) if updated_at else 0
+    return f'"{pk}-{data_version}-{stamp:x}-{schema_tag(model)}"'
+
+
+def http_date(value: datetime) -> str:
+    """Last-Modified 等の HTTP 日付（タイムゾーンなしの日時はローカル時刻とみなす）"""
+    return format_datetime(value.astimezone(UTC), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """
+    クライアントのキャッシュがまだ有効か（304 を返してよいか）
+
+    If-None-Match があればそれだけで判定し、なければ If-Modified-Since を見る (RFC 9110)。
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match は弱い比較（W/ の有無を無視する）
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP 日付は秒単位
+    return last_modified.astimezone(UTC).replace(microsecond=0) <= since
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Accept-Encoding で gzip を受け付けているか（q=0 は拒否とみなす）"""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip()
+        if not quality.startswith("q="):
+            return True
+        try:
+            return float(quality[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def cache_headers(
+    etag: str, last_modified: datetime | None, cache_control: str, vary: str | None = None
+) -> dict[str, str]:
+    """200 / 304 の両方に付けるキャッシュ関連ヘッダー"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if vary is not None:
+        headers["Vary"] = vary
+    return headers
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    """304 Not Modified"""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,104 @@
+"""
+一覧APIのページング
+
+レース一覧はキーセット（カーソル）方式でページングする。並び順のキー (date desc, race_id) の
+前ページ最後の値をカーソルにして続きを引くため、何ページ目でも索引で位置を探すだけで済み、
+OFFSET のように読み飛ばす行数がDBの大きさに比例して増えることがない。
+
+総件数 (X-Total-Count) は絞り込み条件ごとにキャッシュし、races.id の最大値が変わった
+（レースが追加された）ときだけ数え直す。既存レースの会場・日付の訂正は次の追加まで反映されない。
+"""
+
+import base64
+import binascii
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from datetime import date
+
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Race
+
+# 1ページの件数（既定値 / 上限）
+RACE_LIST_DEFAULT_LIMIT = 100
+RACE_LIST_MAX_LIMIT = 500
+
+# 総件数をキャッシュする絞り込み条件の数（溢れたら最も古く使われたものから捨てる）
+RACE_COUNT_CACHE_SIZE = 256
+
+_CURSOR_SEPARATOR = "|"
+
+
+def encode_race_cursor(race_date: date, race_id: str) -> str:
+    """レース一覧のカーソル（ページ最後のレースの並び順のキー）を作る"""
+    raw = f"{race_date.isoformat()}{_CURSOR_SEPARATOR}{race_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_race_cursor(cursor: str) -> tuple[date, str]:
+    """
+    レース一覧のカーソルを (日付, レースID) に戻す
+
+    Raises:
+        ValueError: カーソルの形式が不正
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    race_date, separator, race_id = raw.partition(_CURSOR_SEPARATOR)
+    if not separator or not race_id:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return date.fromisoformat(race_date), race_id
+
+
+class RaceCountCache:
+    """絞り込み条件ごとのレース総件数のキャッシュ"""
+
+    def __init__(self, maxsize: int = RACE_COUNT_CACHE_SIZE) -> None:
+        self._maxsize = maxsize
+        # 条件 → (数えた時点の races.id の最大値, 件数)
+        self._counts: OrderedDict[Hashable, tuple[int, int]] = OrderedDict()
+
+    async def count(
+        self,
+        session: AsyncSession,
+        key: Hashable,
+        conditions: Sequence[ColumnElement[bool]],
+    ) -> int:
+        """
+        条件に合うレースの件数を返す（レースが追加されていなければキャッシュから返す）
+
+        Args:
+            session: DBセッション
+            key: 条件を表すキー（同じ条件には同じキーを渡す）
+            conditions: 件数を数える WHERE 条件
+        """
+        # 主キーの最大値は索引の端を読むだけで取れる
+        version = await session.scalar(select(func.coalesce(func.max(Race.id), 0)))
+        cached = self._counts.get(key)
+        if cached is not None and cached[0] == version:
+            self._counts.move_to_end(key)
+            return cached[1]
+
+        total = await session.scalar(select(func.count()).select_from(Race).where(*conditions))
+        self._counts[key] = (version or 0, total or 0)
+        self._counts.move_to_end(key)
+        while len(self._counts) > self._maxsize:
+            self._counts.popitem(last=False)
+        return total or 0
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+
+_race_count_cache: RaceCountCache | None = None
+
+
+def get_race_count_cache() -> RaceCountCache:
+    """アプリ全体で共有する総件数キャッシュ"""
+    global _race_count_cache
+    if _race_count_cache is None:
+        _race_count_cache = RaceCountCache()
+    return _race_count_cache
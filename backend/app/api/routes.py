@@ -2,52 +2,178 @@
 レース関連APIエンドポイント
 """
 
+import asyncio
+import gzip
+import json
 import logging
-from datetime import date
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.api.caching import (
+    CACHE_CONTROL_REVALIDATE,
+    VARY_ACCEPT_ENCODING,
+    accepts_gzip,
+    cache_headers,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
+from app.api.pagination import (
+    RACE_LIST_DEFAULT_LIMIT,
+    RACE_LIST_MAX_LIMIT,
+    decode_race_cursor,
+    encode_race_cursor,
+    get_race_count_cache,
+)
 from app.api.schemas import (
-    EntryResponse,
+    HorseAnalysisResponse,
     HorseResponse,
     RaceDetailResponse,
     RaceListItem,
+    ScrapeJobResponse,
     ScrapeRaceRequest,
+    ScrapeRangeRequest,
     ScrapeRequest,
     ScrapeResponse,
-    HorseAnalysisResponse,
 )
-from app.core.database import get_db
-from app.models import Horse, Race, RaceEntry
+from app.api.serialization import FastJSONResponse
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.models import Horse, Race, RaceDocument, RaceEntry, ScrapeJob
+from app.predictor.analysis import (
+    load_histories,
+    load_horse_stats,
+    summarize_histories,
+)
+from app.read_models.race_documents import (
+    RACE_DETAIL_FIELDS,
+    RACE_DOCUMENT_TAG,
+    RACE_ENTRY_COUNT,
+    is_complete,
+    load_race_details,
+)
+from app.scraper import SSE_KEEPALIVE_INTERVAL
+from app.scraper.events import EventBus, Subscription, get_event_bus
+from app.scraper.job_queue import get_job_queue
+from app.scraper.jobs import create_scrape_job, find_unfinished_job, job_progress
+from app.scraper.refresh_queue import get_horse_refresh_queue, history_is_stale
 from app.scraper.service import ScraperService
-from app.predictor.logic import determine_running_style
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api")
 
 
-@router.post("/scrape", response_model=ScrapeResponse)
+@router.post("/scrape", response_model=ScrapeJobResponse, status_code=202)
 async def scrape_races(
     request: ScrapeRequest,
     session: AsyncSession = Depends(get_db),
-) -> ScrapeResponse:
-    """指定日のレースデータを収集する"""
-    service = ScraperService(session)
-    try:
-        result = await service.scrape_date(request.date)
-        return ScrapeResponse(
-            total=int(result["total"]),
-            new=int(result["new"]),
-            skipped=int(result["skipped"]),
-            errors=int(result["errors"]),
-            race_ids=list(result["race_ids"]),  # type: ignore[arg-type]
+) -> ScrapeJobResponse:
+    """指定日のレースデータ収集をジョブとして登録する（結果はジョブの状態で確認する）"""
+    target_date = datetime.strptime(request.date, "%Y%m%d").date()
+    return await _enqueue_scrape_job(session, "date", target_date, target_date)
+
+
+@router.post("/scrape/range", response_model=ScrapeJobResponse, status_code=202)
+async def scrape_range(
+    request: ScrapeRangeRequest,
+    session: AsyncSession = Depends(get_db),
+) -> ScrapeJobResponse:
+    """期間内のレースデータ収集（バックフィル）をジョブとして登録する"""
+    if request.date_from > request.date_to:
+        raise HTTPException(status_code=422, detail="date_from must not be after date_to")
+    days = (request.date_to - request.date_from).days + 1
+    if days > settings.scrape_range_max_days:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Date range must not exceed {settings.scrape_range_max_days} days",
         )
+    return await _enqueue_scrape_job(session, "range", request.date_from, request.date_to)
+
+
+@router.get("/scrape/events")
+async def stream_scrape_events(
+    request: Request,
+    job_id: int | None = Query(None, description="このジョブのイベントだけを受け取る"),
+) -> StreamingResponse:
+    """
+    スクレイプの進捗イベントを Server-Sent Events で配信する。
+
+    遅いクライアントの分は古いイベントから捨てる（捨てた件数は dropped イベントで通知する）。
+    """
+    bus = get_event_bus()
+    return StreamingResponse(
+        _scrape_event_stream(request, bus, bus.subscribe(job_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _scrape_event_stream(
+    request: Request, bus: EventBus, subscription: Subscription
+) -> AsyncIterator[str]:
+    """購読したイベントを SSE の形式で送り出す（切断されたら購読を解除する）"""
+    try:
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=SSE_KEEPALIVE_INTERVAL)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if subscription.dropped:
+                yield f"event: dropped\ndata: {json.dumps({'count': subscription.dropped})}\n\n"
+                subscription.dropped = 0
+            yield f"event: {event.type}\ndata: {event.to_json()}\n\n"
     finally:
-        await service.close()
+        bus.unsubscribe(subscription)
+
+
+@router.get("/scrape/jobs/{job_id}", response_model=ScrapeJobResponse)
+async def get_scrape_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_read_db),
+) -> ScrapeJobResponse:
+    """スクレイプジョブの状態・進捗を取得する"""
+    job = await session.get(ScrapeJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scrape job not found")
+    return await _scrape_job_response(session, job)
+
+
+async def _enqueue_scrape_job(
+    session: AsyncSession, kind: str, date_from: date, date_to: date
+) -> ScrapeJobResponse:
+    """同じ期間の未完了ジョブがあればそれを、なければ新しいジョブをキューに入れる"""
+    job = await find_unfinished_job(session, kind, date_from, date_to)
+    if job is None:
+        job = await create_scrape_job(session, kind, date_from, date_to)
+    # ワーカーが別セッションで読めるよう、キューに入れる前にコミットする
+    await session.commit()
+    get_job_queue().submit(job.id)
+    return await _scrape_job_response(session, job)
+
+
+async def _scrape_job_response(session: AsyncSession, job: ScrapeJob) -> ScrapeJobResponse:
+    progress = await job_progress(session, job.id)
+    return ScrapeJobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        date_from=job.date_from,
+        date_to=job.date_to,
+        error=job.error,
+        dates=progress["dates"],
+        races=progress["races"],
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
 
 
 @router.post("/scrape/race", response_model=ScrapeResponse)
@@ -70,225 +196,303 @@ async def scrape_single_race(
         await service.close()
 
 
+# レース一覧で返す列（RaceListItem のフィールド）
+_RACE_LIST_COLUMNS = [getattr(Race, name) for name in RaceListItem.model_fields]
+
+
 @router.get("/races", response_model=list[RaceListItem])
 async def list_races(
+    response: Response,
     date_from: date | None = Query(None, description="開始日"),
     date_to: date | None = Query(None, description="終了日"),
     venue: str | None = Query(None, description="会場名"),
-    session: AsyncSession = Depends(get_db),
+    limit: int = Query(
+        RACE_LIST_DEFAULT_LIMIT, ge=1, le=RACE_LIST_MAX_LIMIT, description="1ページの件数"
+    ),
+    cursor: str | None = Query(None, description="前ページの X-Next-Cursor（続きを取得する）"),
+    include_total: bool = Query(False, description="総件数を X-Total-Count ヘッダーで返す"),
+    session: AsyncSession = Depends(get_read_db),
 ) -> list[RaceListItem]:
-    """レース一覧を取得する"""
-    stmt = select(Race).order_by(Race.date.desc(), Race.race_id)
+    """
+    レース一覧を新しい順に取得する
 
+    続きがある場合は X-Next-Cursor ヘッダーにカーソルを返す（cursor に渡すと次のページ）。
+    一覧に表示する列だけを読み、ORM オブジェクトは作らない。
+    """
+    conditions = []
     if date_from:
-        stmt = stmt.where(Race.date >= date_from)
+        conditions.append(Race.date >= date_from)
     if date_to:
-        stmt = stmt.where(Race.date <= date_to)
+        conditions.append(Race.date <= date_to)
     if venue:
-        stmt = stmt.where(Race.venue == venue)
+        conditions.append(Race.venue == venue)
 
-    result = await session.execute(stmt)
-    races = result.scalars().all()
+    stmt = select(*_RACE_LIST_COLUMNS).where(*conditions)
+    if cursor:
+        try:
+            cursor_date, cursor_race_id = decode_race_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from e
+        # 前ページ最後の (date, race_id) より後ろの行（date <= で索引の範囲検索にする）
+        stmt = stmt.where(
+            Race.date <= cursor_date,
+            or_(Race.date < cursor_date, Race.race_id > cursor_race_id),
+        )
 
-    return [
-        RaceListItem(
-            race_id=r.race_id,
-            name=r.name,
-            date=r.date,
-            venue=r.venue,
-            course_type=r.course_type,
-            distance=r.distance,
-            track_condition=r.track_condition,
-            race_class=r.race_class,
-            num_entries=r.num_entries,
+    # 1件多く読んで続きの有無を判定する
+    result = await session.execute(
+        stmt.order_by(Race.date.desc(), Race.race_id).limit(limit + 1)
+    )
+    rows = result.all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_race_cursor(rows[-1].date, rows[-1].race_id)
+
+    if include_total:
+        total = await get_race_count_cache().count(
+            session, (date_from, date_to, venue), conditions
         )
-        for r in races
-    ]
+        response.headers["X-Total-Count"] = str(total)
+
+    return [RaceListItem.model_validate(row._mapping) for row in rows]
+
+
+_HORSE_FIELDS = list(HorseResponse.model_fields)
+# レース詳細の文書から読む列（ORM オブジェクトは作らない）
+_DOCUMENT_COLUMNS = [
+    RaceDocument.race_pk,
+    RaceDocument.data_version,
+    RaceDocument.updated_at,
+    RaceDocument.race_date,
+    RaceDocument.complete,
+    RaceDocument.schema_tag,
+    RaceDocument.body,
+]
+
 
+def _race_cache_control(race_date: date, complete: bool) -> str:
+    """
+    レース詳細の Cache-Control
 
-@router.get("/races/{race_id}", response_model=RaceDetailResponse)
+    開催日を過ぎて全出走馬の記録がそろったレースは、RACE_CACHE_MAX_AGE の間だけ確認なしで
+    キャッシュさせる。確定後も馬の戦績の取り込みや再構築で内容（data_version）が変わりうるため、
+    期限は短くし、過ぎたら ETag で確認させる。
+    それ以外（未来のレース・一部の出走記録しかないスタブ）は毎回 ETag で確認させる。
+    """
+    if race_date < date.today() and complete:
+        return f"public, max-age={settings.race_cache_max_age}"
+    return CACHE_CONTROL_REVALIDATE
+
+
+@router.get(
+    "/races/{race_id}", response_model=RaceDetailResponse, response_class=FastJSONResponse
+)
 async def get_race_detail(
     race_id: str,
-    session: AsyncSession = Depends(get_db),
-) -> RaceDetailResponse:
-    """レース詳細（出走馬・結果含む）を取得する"""
-    stmt = (
-        select(Race)
-        .where(Race.race_id == race_id)
-        .options(selectinload(Race.entries).selectinload(RaceEntry.horse))
-    )
-    result = await session.execute(stmt)
-    race = result.scalar_one_or_none()
+    request: Request,
+    session: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """
+    レース詳細（出走馬・結果含む）を取得する
+
+    取り込み時に作った文書 (race_documents) があれば、主キーで1行読んで gzip のまま返す。
+    文書がない・古い場合は、応答に使う列だけを行として読み、dict に詰めてそのままエンコードする。
+    ETag はレースの data_version から作り、If-None-Match が一致すれば本体を読まずに 304 を返す。
+    """
+    document = (
+        await session.execute(select(*_DOCUMENT_COLUMNS).where(RaceDocument.race_id == race_id))
+    ).one_or_none()
+    if document is not None and document.schema_tag == RACE_DOCUMENT_TAG:
+        etag = make_etag(
+            RaceDetailResponse, document.race_pk, document.data_version, document.updated_at
+        )
+        gzipped = accepts_gzip(request)
+        headers = cache_headers(
+            # 圧縮した表現は弱い ETag にする（バイト列が非圧縮の応答と異なるため）
+            f"W/{etag}" if gzipped else etag,
+            document.updated_at,
+            _race_cache_control(document.race_date, document.complete),
+            vary=VARY_ACCEPT_ENCODING,
+        )
+        if is_not_modified(request, etag, document.updated_at):
+            return not_modified_response(headers)
+        if gzipped:
+            return Response(
+                document.body,
+                media_type=FastJSONResponse.media_type,
+                headers={**headers, "Content-Encoding": "gzip"},
+            )
+        return Response(
+            gzip.decompress(document.body), media_type=FastJSONResponse.media_type, headers=headers
+        )
+
+    race = (
+        await session.execute(
+            select(
+                Race.id,
+                Race.data_version,
+                Race.updated_at,
+                RACE_ENTRY_COUNT,
+                *(getattr(Race, name) for name in RACE_DETAIL_FIELDS),
+            ).where(Race.race_id == race_id)
+        )
+    ).one_or_none()
 
     if race is None:
         raise HTTPException(status_code=404, detail=f"Race {race_id} not found")
 
-    entries = [
-        EntryResponse(
-            horse_number=e.horse_number,
-            bracket_number=e.bracket_number,
-            horse=HorseResponse(
-                horse_id=e.horse.horse_id,
-                name=e.horse.name,
-                sex=e.horse.sex,
-                trainer=e.horse.trainer,
-                sire=e.horse.sire,
-                dam=e.horse.dam,
-            ),
-            jockey=e.jockey,
-            weight_carried=e.weight_carried,
-            odds=e.odds,
-            popularity=e.popularity,
-            finish_position=e.finish_position,
-            finish_time=e.finish_time,
-            margin=e.margin,
-            passing_order=e.passing_order,
-            last_3f=e.last_3f,
-            horse_weight=e.horse_weight,
-            horse_weight_diff=e.horse_weight_diff,
-            status=e.status,
-        )
-        for e in sorted(race.entries, key=lambda x: x.horse_number)
-    ]
-
-    return RaceDetailResponse(
-        race_id=race.race_id,
-        name=race.name,
-        date=race.date,
-        venue=race.venue,
-        course_type=race.course_type,
-        distance=race.distance,
-        direction=race.direction,
-        weather=race.weather,
-        track_condition=race.track_condition,
-        race_class=race.race_class,
-        num_entries=race.num_entries,
-        entries=entries,
+    etag = make_etag(RaceDetailResponse, race.id, race.data_version, race.updated_at)
+    headers = cache_headers(
+        etag,
+        race.updated_at,
+        _race_cache_control(race.date, is_complete(race.num_entries, race.entry_count)),
+        vary=VARY_ACCEPT_ENCODING,
     )
+    if is_not_modified(request, etag, race.updated_at):
+        return not_modified_response(headers)
+
+    details = await load_race_details(session, [race])
+    return FastJSONResponse(details[race.id], headers=headers)
 
 
-@router.get("/horses/{horse_id}")
+@router.get("/horses/{horse_id}", response_model=HorseResponse, response_class=FastJSONResponse)
 async def get_horse(
     horse_id: str,
-    session: AsyncSession = Depends(get_db),
-) -> HorseResponse:
-    """馬の詳細情報を取得する"""
-    result = await session.execute(
-        select(Horse).where(Horse.horse_id == horse_id)
-    )
-    horse = result.scalar_one_or_none()
+    request: Request,
+    session: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """馬の詳細情報を取得する（ETag は馬の data_version から作る）"""
+    horse = (
+        await session.execute(
+            select(
+                Horse.id,
+                Horse.data_version,
+                Horse.updated_at,
+                *(getattr(Horse, name) for name in _HORSE_FIELDS),
+            ).where(Horse.horse_id == horse_id)
+        )
+    ).one_or_none()
 
     if horse is None:
         raise HTTPException(status_code=404, detail=f"Horse {horse_id} not found")
 
-    return HorseResponse(
-        horse_id=horse.horse_id,
-        name=horse.name,
-        sex=horse.sex,
-        trainer=horse.trainer,
-        sire=horse.sire,
-        dam=horse.dam,
+    etag = make_etag(HorseResponse, horse.id, horse.data_version, horse.updated_at)
+    headers = cache_headers(etag, horse.updated_at, CACHE_CONTROL_REVALIDATE)
+    if is_not_modified(request, etag, horse.updated_at):
+        return not_modified_response(headers)
+
+    horse_values = horse._mapping
+    return FastJSONResponse(
+        {name: horse_values[name] for name in _HORSE_FIELDS}, headers=headers
     )
 
 
+# 分析に使う馬の列
+_ANALYSIS_HORSE_COLUMNS = (Horse.id, Horse.horse_id, Horse.name, Horse.last_scraped_at)
+# _ANALYSIS_HORSE_COLUMNS を選んだ行
+_AnalysisHorseRow = Row[int, str, str, datetime | None]
 
-import asyncio
 
-@router.get("/races/{race_id}/analysis", response_model=dict[str, HorseAnalysisResponse])
+@router.get(
+    "/races/{race_id}/analysis",
+    response_model=dict[str, HorseAnalysisResponse],
+    response_class=FastJSONResponse,
+)
 async def analyze_race_horses(
     race_id: str,
-    session: AsyncSession = Depends(get_db),
-) -> dict[str, HorseAnalysisResponse]:
+    session: AsyncSession = Depends(get_read_db),
+) -> Response:
     """レースに出走する全馬の分析データを一括取得する"""
-    # レースと出走馬を取得
-    stmt = (
-        select(Race)
-        .where(Race.race_id == race_id)
-        .options(selectinload(Race.entries).selectinload(RaceEntry.horse))
-    )
-    result = await session.execute(stmt)
-    race = result.scalar_one_or_none()
-
-    if race is None:
+    race_pk = await session.scalar(select(Race.id).where(Race.race_id == race_id))
+    if race_pk is None:
         raise HTTPException(status_code=404, detail=f"Race {race_id} not found")
 
-    # 各馬のスペック分析を並列実行
-    async def _analyze_entry(entry: RaceEntry) -> tuple[str, HorseAnalysisResponse]:
-        # analyze_horse_stats のロジックを再利用したいが、Dependsが使えないため
-        # 内部ロジックを切り出した関数を呼び出す形にするか、
-        # ここで直接処理を書く
-        # 今回はコード重複を避けるため、内部関数 _get_horse_analysis_logic を定義して共有する
-        analysis = await _get_horse_analysis_logic(entry.horse, session)
-        return entry.horse.horse_id, analysis
-
-    # 並列実行
-    tasks = [_analyze_entry(entry) for entry in race.entries]
-    results = await asyncio.gather(*tasks)
-    
-    return dict(results)
+    # 出走馬を取得
+    result = await session.execute(
+        select(*_ANALYSIS_HORSE_COLUMNS)
+        .join(RaceEntry, RaceEntry.horse_id == Horse.id)
+        .where(RaceEntry.race_id == race_pk)
+        .order_by(RaceEntry.horse_number)
+    )
+    analyses = await _analyze_horses(result.all(), session)
+    return FastJSONResponse({analysis["horse_id"]: analysis for analysis in analyses})
 
 
-@router.get("/analysis/horses/{horse_id}", response_model=HorseAnalysisResponse)
+@router.get(
+    "/analysis/horses/{horse_id}",
+    response_model=HorseAnalysisResponse,
+    response_class=FastJSONResponse,
+)
 async def analyze_horse_stats(
     horse_id: str,
-    session: AsyncSession = Depends(get_db),
-) -> HorseAnalysisResponse:
+    session: AsyncSession = Depends(get_read_db),
+) -> Response:
     """馬の傾向分析（脚質など）を取得する"""
     # 馬情報を取得
-    stmt = select(Horse).where(Horse.horse_id == horse_id)
-    result = await session.execute(stmt)
-    horse = result.scalar_one_or_none()
-    
+    result = await session.execute(
+        select(*_ANALYSIS_HORSE_COLUMNS).where(Horse.horse_id == horse_id)
+    )
+    horse = result.one_or_none()
+
     if not horse:
         raise HTTPException(status_code=404, detail="Horse not found")
 
-    return await _get_horse_analysis_logic(horse, session)
-
-
-async def _get_horse_analysis_logic(horse: Horse, session: AsyncSession) -> HorseAnalysisResponse:
-    """馬の分析ロジック（共通化）"""
-    # 過去レースの出走結果を取得 (新しい順)
-    async def _get_entries():
-        entry_stmt = (
-            select(RaceEntry)
-            .where(RaceEntry.horse_id == horse.horse_id)
-            .join(Race)
-            .options(selectinload(RaceEntry.race))
-            .order_by(Race.date.desc())
+    (analysis,) = await _analyze_horses([horse], session)
+    return FastJSONResponse(analysis)
+
+
+async def _analyze_horses(
+    horses: Sequence[_AnalysisHorseRow], session: AsyncSession
+) -> list[dict[str, Any]]:
+    """
+    馬の分析ロジック（共通化）
+
+    horse_stats の集計済みの行を全頭分まとめて引く。行がない馬（集計前のデータ）はその場で集計する
+    （読み出し専用のセッションで動くため保存はしない。scripts/rebuild_horse_stats.py で埋める）。
+    応答はDB上のデータだけで返し、過去成績が古い馬は stale として印を付けて
+    バックグラウンドの再取得に回す（応答時間にネットワーク取得を含めない）。
+
+    Args:
+        horses: id / horse_id / name / last_scraped_at 列を持つ馬の行
+        session: DBセッション
+
+    Returns:
+        HorseAnalysisResponse の形の dict（馬の順）
+    """
+    horse_ids = [horse.id for horse in horses]
+    stats: dict[int, tuple[str, float, int]] = {
+        horse_id: (row.style, row.speed, row.races_count)
+        for horse_id, row in (await load_horse_stats(session, horse_ids)).items()
+    }
+
+    missing = [horse_id for horse_id in horse_ids if horse_id not in stats]
+    if missing:
+        summary = summarize_histories(await load_histories(session, missing), missing)
+        stats.update(
+            (int(horse_id), (row.style, float(row.speed), int(row.races_count)))
+            for horse_id, row in summary.iterrows()
         )
-        entry_result = await session.execute(entry_stmt)
-        return entry_result.scalars().all()
 
-    entries = await _get_entries()
+    now = datetime.now()
+    stale = {horse.id for horse in horses if history_is_stale(horse.last_scraped_at, now)}
+    refresh_queue = get_horse_refresh_queue()
+    for horse in horses:
+        if horse.id in stale:
+            refresh_queue.submit(horse.horse_id)
 
-    # 履歴が1件以下（現レースのみ等）の場合は、自動的にスクレイプを試みる
-    if len(entries) <= 1:
-        # logger.info("Insufficient data for horse %s (%s), scraping history...", horse.horse_id, horse.name)
-        service = ScraperService(session)
-        try:
-            await service.scrape_horse_history(horse.horse_id)
-            entries = await _get_entries()
-        except Exception as e:
-            logger.warning("Failed to scrape horse history for %s: %s", horse.horse_id, str(e))
-        finally:
-            await service.close()
-
-    # 脚質判定
-    style = determine_running_style(entries)
-    
-    # 簡易スタッツ計算
-    last_3f_list = [e.last_3f for e in entries if e.last_3f]
-    avg_3f = sum(last_3f_list) / len(last_3f_list) if last_3f_list else 36.0
-    speed_score = max(30.0, min(100.0, 100.0 - (avg_3f - 33.0) * 10))
-
-    return HorseAnalysisResponse(
-        horse_id=horse.horse_id,
-        name=horse.name,
-        style=style.value,
-        stats={
-            "speed": float(f"{speed_score:.1f}"),
-            "stamina": 80.0,
-            "start_dash": 75.0,
-            "races_count": len(entries),
-        },
-    )
+    # stats は HorseAnalysisResponse と同じく全て float で返す
+    return [
+        {
+            "horse_id": horse.horse_id,
+            "name": horse.name,
+            "style": stats[horse.id][0],
+            "stats": {
+                "speed": float(stats[horse.id][1]),
+                "stamina": 80.0,
+                "start_dash": 75.0,
+                "races_count": float(stats[horse.id][2]),
+            },
+            "stale": horse.id in stale,
+        }
+        for horse in horses
+    ]
@@ -2,7 +2,7 @@
 Pydanticスキーマ（APIのリクエスト/レスポンス型）
 """
 
-from datetime import date
+from datetime import date, datetime
 
 from pydantic import BaseModel, Field
 
@@ -15,6 +15,13 @@ class ScrapeRequest(BaseModel):
     date: str = Field(..., pattern=r"^\d{8}$", description="日付 (YYYYMMDD形式)")
 
 
+class ScrapeRangeRequest(BaseModel):
+    """期間指定のスクレイプ（バックフィル）リクエスト"""
+
+    date_from: date = Field(..., description="開始日")
+    date_to: date = Field(..., description="終了日（この日を含む）")
+
+
 class ScrapeRaceRequest(BaseModel):
     """単一レースのスクレイプリクエスト"""
 
@@ -32,6 +39,22 @@ class ScrapeResponse(BaseModel):
     skipped: int
     errors: int
     race_ids: list[str]
+    failed_race_ids: list[str] = []
+
+
+class ScrapeJobResponse(BaseModel):
+    """スクレイプジョブの状態"""
+
+    job_id: int
+    kind: str
+    status: str  # "pending", "running", "completed", "failed"
+    date_from: date
+    date_to: date
+    error: str | None = None
+    dates: dict[str, int] = {}  # 日付のステータス → 件数
+    races: dict[str, int] = {}  # レースのステータス → 件数
+    created_at: datetime
+    updated_at: datetime
 
 
 class HorseResponse(BaseModel):
@@ -66,6 +89,10 @@ class EntryResponse(BaseModel):
     horse_weight: int | None = None
     horse_weight_diff: int | None = None
     status: str = "result"
+    # 数値化済みの結果（文字列カラムを取り込み時に変換したもの）
+    finish_time_sec: float | None = None
+    corner_positions: list[int | None] = []  # 1〜4コーナーの通過順位
+    margin_lengths: float | None = None
 
 
 class RaceListItem(BaseModel):
@@ -104,3 +131,4 @@ class HorseAnalysisResponse(BaseModel):
     name: str = ""
     style: str  # NIGE, SENKO, SASHI, OIKOMI, UNKNOWN
     stats: dict[str, float]  # speed, stamina, etc.
+    stale: bool = False  # 過去成績が古い（バックグラウンドで再取得を予約済み）
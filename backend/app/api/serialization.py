@@ -0,0 +1,26 @@
+"""
+読み出しAPIのJSONレスポンス
+
+レース詳細や分析のように件数の多い応答は、ルートでDBの行から直接 dict を組み立てて
+FastJSONResponse で返す。Response を返したルートでは FastAPI が response_model による
+再検証・再変換を行わないため、ORM オブジェクト → Pydantic モデル → JSON の変換が
+dict → JSON の1回で済む（response_model は OpenAPI のスキーマとしてだけ使われる）。
+どのルートをこの経路にするかはルートごとに選ぶ。
+
+エンコーダー（json / orjson）は設定 JSON_ENCODER で選ぶ（app.core.encoding）。
+"""
+
+from typing import Any
+
+from fastapi.responses import Response
+
+from app.core.encoding import get_encoder
+
+
+class FastJSONResponse(Response):
+    """検証を通さずに dict / list をそのままエンコードするJSONレスポンス"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return get_encoder()(content)
@@ -29,6 +29,43 @@ class Settings:
 
     # データベース (デフォルト: プロジェクトルート/data/keiba.db)
     database_url: str = f"sqlite+aiosqlite:///{BASE_DIR}/data/keiba.db"
+    sql_echo: bool = False  # 実行したSQLをログに出す（debug とは独立）
+
+    # SQLite の性能プロファイル: "performance"（WAL 等）/ "default"（SQLite の既定値）
+    sqlite_profile: str = "performance"
+    sqlite_mmap_size: int = 268_435_456  # 256 MiB
+    sqlite_cache_size: int = -65_536  # 負の値は KiB 単位（64 MiB）
+    sqlite_busy_timeout_ms: int = 5000
+
+    # 読み出し用エンジンの接続数と、プールの接続待ちの上限（秒）
+    db_read_pool_size: int = 4
+    db_pool_timeout: float = 60.0
+
+    # 取得済みHTMLのアーカイブ (デフォルト: プロジェクトルート/data/raw)
+    raw_archive_enabled: bool = True
+    raw_archive_dir: str = f"{BASE_DIR}/data/raw"
+
+    # HTMLパースの実行方式: "process" / "thread" / "inline"（イベントループ上で実行）
+    parse_executor: str = "process"
+    parse_workers: int = 0  # 0 ならCPUコア数
+
+    # HTMLパーサーのバックエンド: "html.parser" / "lxml" / "selectolax"
+    html_parser_backend: str = "html.parser"
+
+    # 読み出しAPIのJSONエンコーダー: "auto"（orjson があれば使う） / "orjson" / "json"
+    json_encoder: str = "auto"
+
+    # 結果が確定したレースの詳細を確認なしでキャッシュさせる秒数 (Cache-Control: max-age)。
+    # 過ぎたら ETag で確認させる
+    race_cache_max_age: int = 300
+
+    # バックグラウンドでスクレイプジョブを実行するワーカー数
+    scrape_workers: int = 1
+    # 1回のバックフィルで登録できる期間の上限（日数）
+    scrape_range_max_days: int = 366
+
+    # 馬の過去成績の鮮度（時間）。これより古い馬は分析時にバックグラウンドで再取得する
+    horse_history_ttl_hours: float = 168.0
 
     # CORS
     cors_origins: list[str] = field(
@@ -51,6 +88,23 @@ class Settings:
             port=int(os.getenv("PORT", "8000")),
             debug=os.getenv("DEBUG", "true").lower() == "true",
             database_url=db_url,
+            sql_echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+            sqlite_profile=os.getenv("SQLITE_PROFILE", "performance").lower(),
+            sqlite_mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", "268435456")),
+            sqlite_cache_size=int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),
+            sqlite_busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+            db_read_pool_size=int(os.getenv("DB_READ_POOL_SIZE", "4")),
+            db_pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "60")),
+            raw_archive_enabled=os.getenv("RAW_ARCHIVE_ENABLED", "true").lower() == "true",
+            raw_archive_dir=os.getenv("RAW_ARCHIVE_DIR", f"{BASE_DIR}/data/raw"),
+            parse_executor=os.getenv("PARSE_EXECUTOR", "process").lower(),
+            parse_workers=int(os.getenv("PARSE_WORKERS", "0")),
+            html_parser_backend=os.getenv("HTML_PARSER_BACKEND", "html.parser"),
+            json_encoder=os.getenv("JSON_ENCODER", "auto").lower(),
+            race_cache_max_age=int(os.getenv("RACE_CACHE_MAX_AGE", "300")),
+            scrape_workers=int(os.getenv("SCRAPE_WORKERS", "1")),
+            scrape_range_max_days=int(os.getenv("SCRAPE_RANGE_MAX_DAYS", "366")),
+            horse_history_ttl_hours=float(os.getenv("HORSE_HISTORY_TTL_HOURS", "168")),
             cors_origins=cors_origins,
         )
 
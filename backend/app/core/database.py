@@ -2,18 +2,102 @@
 データベース接続管理
 
 SQLAlchemy 2.0 の非同期セッションを提供する。
+
+SQLite では書き込みと読み出しでエンジンを分ける。
+- 書き込み用 (engine / async_session): 接続1本のプール。スクレイパーやジョブの書き込みを
+  プール上で直列化し、SQLite のロック競合 (database is locked) を起こさない。
+  接続を使うのはトランザクションの間だけなので、ScraperService はページ取得を待つ前に
+  コミットして接続を返す。
+- 読み出し用 (read_engine / read_session): 複数接続のプール。PRAGMA query_only を設定し、
+  GET の API が書き込みを待たずに並行して読めるようにする。
+
+性能プロファイル (SQLITE_PROFILE=performance) では接続ごとに WAL・synchronous=NORMAL・
+mmap・ページキャッシュを設定する。WAL では読み出しが書き込み中のトランザクションを待たない。
 """
 
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
-from app.core.config import settings
+from app.core.config import Settings, settings
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-)
+# SQLite の性能プロファイル
+SQLITE_PROFILE_PERFORMANCE = "performance"
+SQLITE_PROFILE_DEFAULT = "default"  # SQLite の既定値のまま（比較・トラブルシュート用）
+
+
+def sqlite_pragmas(config: Settings, readonly: bool = False) -> list[str]:
+    """
+    接続ごとに実行する PRAGMA の一覧
+
+    Args:
+        config: 設定
+        readonly: 読み出し専用の接続か
+    """
+    pragmas = [f"PRAGMA busy_timeout={config.sqlite_busy_timeout_ms}"]
+    if config.sqlite_profile == SQLITE_PROFILE_PERFORMANCE:
+        pragmas += [
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            f"PRAGMA mmap_size={config.sqlite_mmap_size}",
+            f"PRAGMA cache_size={config.sqlite_cache_size}",
+            "PRAGMA temp_store=MEMORY",
+        ]
+    if readonly:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def create_db_engine(
+    database_url: str,
+    config: Settings = settings,
+    readonly: bool = False,
+    pool_size: int = 1,
+) -> AsyncEngine:
+    """
+    設定に沿ったエンジンを作る（SQLite なら接続時に PRAGMA を設定する）
+
+    Args:
+        database_url: 接続先
+        config: 設定（プロファイル・SQLログ）
+        readonly: 読み出し専用にするか
+        pool_size: プールの接続数（書き込み用は1で直列化する）
+    """
+    url = make_url(database_url)
+    options: dict[str, Any] = {"echo": config.sql_echo}
+    is_sqlite = url.get_backend_name() == "sqlite"
+    if is_sqlite and url.database not in (None, "", ":memory:"):
+        options.update(
+            pool_size=pool_size,
+            max_overflow=0,
+            pool_timeout=config.db_pool_timeout,
+        )
+
+    db_engine = create_async_engine(database_url, **options)
+
+    if is_sqlite:
+        pragmas = sqlite_pragmas(config, readonly)
+
+        @event.listens_for(db_engine.sync_engine, "connect")
+        def _set_pragmas(dbapi_connection: Any, _record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return db_engine
+
+
+# 書き込み用（スクレイパー・ジョブ・POST）
+engine = create_db_engine(settings.database_url)
 
 async_session = async_sessionmaker(
     engine,
@@ -21,9 +105,20 @@ async_session = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# 読み出し用（GET）
+read_engine = create_db_engine(
+    settings.database_url, readonly=True, pool_size=settings.db_read_pool_size
+)
+
+read_session = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """FastAPIの依存性注入用DBセッション"""
+    """FastAPIの依存性注入用DBセッション（書き込み用）"""
     async with async_session() as session:
         try:
             yield session
@@ -31,3 +126,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPIの依存性注入用DBセッション（読み出し専用。GET のエンドポイントで使う）"""
+    async with read_session() as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    """全エンジンの接続を閉じる（アプリ終了時）"""
+    await read_engine.dispose()
+    await engine.dispose()
@@ -0,0 +1,84 @@
+"""
+JSONエンコーダー
+
+読み出しAPIの応答と、取り込み時に作るレース詳細の文書 (app.read_models) で共用する。
+
+    json    標準ライブラリ（追加依存なし）
+    orjson  orjson（pip install orjson・高速）
+
+どちらのエンコーダーでも、Pydantic で直列化した場合と同じJSONになる（tests/test_api.py で検証）。
+"""
+
+import json
+from collections.abc import Callable
+from datetime import date, datetime
+from functools import cache
+from importlib.util import find_spec
+from typing import Any
+
+from app.core.config import settings
+
+ENCODER_AUTO = "auto"
+ENCODER_JSON = "json"
+ENCODER_ORJSON = "orjson"
+
+
+def _default(value: Any) -> Any:
+    """標準ライブラリの json が扱えない型（日付）を文字列にする"""
+    if isinstance(value, date | datetime):
+        return value.isoformat()
+    msg = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+def _dumps_json(content: Any) -> bytes:
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+def _dumps_orjson(content: Any) -> bytes:
+    import orjson
+
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# エンコーダー名 → (エンコード関数, 必要なモジュール)
+_ENCODERS: dict[str, tuple[Callable[[Any], bytes], str | None]] = {
+    ENCODER_JSON: (_dumps_json, None),
+    ENCODER_ORJSON: (_dumps_orjson, "orjson"),
+}
+
+
+def available_encoders() -> list[str]:
+    """インストール済みで利用可能なエンコーダー名を返す"""
+    return [
+        name
+        for name, (_, module) in _ENCODERS.items()
+        if module is None or find_spec(module) is not None
+    ]
+
+
+def get_encoder(name: str | None = None) -> Callable[[Any], bytes]:
+    """
+    エンコード関数を返す
+
+    Args:
+        name: エンコーダー名（省略時は設定 JSON_ENCODER。"auto" は orjson があれば orjson）
+
+    Raises:
+        ValueError: 未知のエンコーダー名の場合
+    """
+    return _resolve_encoder(name or settings.json_encoder)
+
+
+@cache
+def _resolve_encoder(name: str) -> Callable[[Any], bytes]:
+    if name == ENCODER_AUTO:
+        name = ENCODER_ORJSON if ENCODER_ORJSON in available_encoders() else ENCODER_JSON
+    try:
+        dumps, _ = _ENCODERS[name]
+    except KeyError:
+        msg = f"Unknown JSON encoder: {name}"
+        raise ValueError(msg) from None
+    return dumps
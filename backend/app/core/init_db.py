@@ -1,18 +1,26 @@
 """
 データベース初期化
 
-テーブルの作成を行う。
+テーブルの作成と未適用のマイグレーション (app.core.migrations) の実行を行う。
 アプリケーション起動時に呼ばれる。
 """
 
+import logging
+
 from app.core.database import engine
+from app.core.migrations import run_migrations
 from app.models import Base
 
+logger = logging.getLogger(__name__)
+
 
 async def init_db() -> None:
-    """全テーブルを作成する（存在しない場合のみ）"""
+    """全テーブルを作成し（存在しない場合のみ）、未適用のマイグレーションを実行する"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        applied = await conn.run_sync(run_migrations)
+        if applied:
+            logger.info("Applied migrations: %s", applied)
 
 
 async def drop_db() -> None:
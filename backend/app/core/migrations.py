@@ -0,0 +1,199 @@
+"""
+スキーマのマイグレーション
+
+create_all は既存のテーブルを変更しないため、列や索引の追加はここに番号付きで積む。
+適用済みのバージョンは SQLite の PRAGMA user_version に記録し、起動時 (init_db) と
+scripts/migrate.py から未適用のものだけを順に実行する。
+
+各マイグレーションは冪等に書く（create_all で最新のスキーマが作られた新規DBにも
+バージョン0から全て適用されるため）。適用済みのマイグレーションは書き換えず、変更は
+新しいバージョンとして足す。後からモデルが変わっても結果が変わらないよう、追加する列と
+バージョン3以降の索引は DDL を直接書く。
+"""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import cast
+
+from sqlalchemy import Connection, Table, bindparam, inspect, select, text, update
+
+from app.models import Race, RaceEntry
+from app.scraper.mapping import entry_numeric_values
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """1件のマイグレーション"""
+
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def get_schema_version(conn: Connection) -> int:
+    """DBに記録されたスキーマのバージョン"""
+    return int(conn.execute(text("PRAGMA user_version")).scalar_one())
+
+
+def set_schema_version(conn: Connection, version: int) -> None:
+    """スキーマのバージョンを記録する"""
+    # PRAGMA はバインド変数を使えないため int に限定して埋め込む
+    conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+
+# バージョン管理以前にモデルへ追加された列 (テーブル名, 列名, 型)。マイグレーション1が足す。
+# 以後に追加する列は、この一覧ではなく新しいマイグレーションで足す
+_PRE_VERSIONING_COLUMNS: list[tuple[str, str, str]] = [
+    ("horses", "last_scraped_at", "DATETIME"),
+    ("race_entries", "finish_time_sec", "FLOAT"),
+    ("race_entries", "pass_1", "INTEGER"),
+    ("race_entries", "pass_2", "INTEGER"),
+    ("race_entries", "pass_3", "INTEGER"),
+    ("race_entries", "pass_4", "INTEGER"),
+    ("race_entries", "margin_lengths", "FLOAT"),
+]
+
+
+def _add_missing_columns(conn: Connection) -> set[tuple[str, str]]:
+    """
+    _PRE_VERSIONING_COLUMNS のうち既存テーブルにない列を追加する
+    （create_all は既存テーブルを変更しないため）。
+
+    Returns:
+        追加した (テーブル名, 列名)
+    """
+    added: set[tuple[str, str]] = set()
+    inspector = inspect(conn)
+    existing: dict[str, set[str]] = {}
+    for table, column, column_type in _PRE_VERSIONING_COLUMNS:
+        if not inspector.has_table(table):
+            continue
+        if table not in existing:
+            existing[table] = {c["name"] for c in inspector.get_columns(table)}
+        if column in existing[table]:
+            continue
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"))
+        logger.info("Added column %s.%s", table, column)
+        added.add((table, column))
+    return added
+
+
+def _backfill_entry_numbers(conn: Connection, batch_size: int = 5000) -> int:
+    """
+    既存の出走記録の数値カラム（finish_time_sec / pass_1〜4 / margin_lengths）を
+    文字列カラムから埋める。取り込み時と同じ変換 (entry_numeric_values) を使う。
+
+    Returns:
+        更新した行数
+    """
+    entries = cast(Table, RaceEntry.__table__)
+    numeric_columns = list(entry_numeric_values(None, None, None))
+    stmt = (
+        update(entries)
+        .where(entries.c.id == bindparam("_id"))
+        .values({column: bindparam(column) for column in numeric_columns})
+    )
+
+    last_id = 0
+    count = 0
+    while True:
+        rows = conn.execute(
+            select(entries.c.id, entries.c.finish_time, entries.c.passing_order, entries.c.margin)
+            .where(entries.c.id > last_id)
+            .order_by(entries.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return count
+        conn.execute(
+            stmt,
+            [
+                {
+                    "_id": row.id,
+                    **entry_numeric_values(row.finish_time, row.passing_order, row.margin),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+        count += len(rows)
+
+
+def _catch_up_columns(conn: Connection) -> None:
+    """バージョン管理以前のDBに、その頃までにモデルに追加された列を足す"""
+    added = _add_missing_columns(conn)
+    # 数値カラムを追加した既存DBは、文字列カラムから埋める
+    if ("race_entries", "finish_time_sec") in added:
+        count = _backfill_entry_numbers(conn)
+        logger.info("Backfilled numeric columns for %d race entries", count)
+
+
+def _create_query_indexes(conn: Connection) -> None:
+    """分析・一覧のクエリが使う索引を作る"""
+    for index in (
+        *cast(Table, RaceEntry.__table__).indexes,
+        *cast(Table, Race.__table__).indexes,
+    ):
+        if index.name in ("ix_race_entries_horse_id", "ix_races_venue_date"):
+            index.create(conn, checkfirst=True)
+
+
+def _create_race_list_indexes(conn: Connection) -> None:
+    """レース一覧のキーセットページングの並び順 (date desc, race_id) に沿った索引に替える"""
+    conn.execute(
+        text("CREATE INDEX IF NOT EXISTS ix_races_date_race_id ON races (date DESC, race_id)")
+    )
+    conn.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_races_venue_date_race_id "
+            "ON races (venue, date DESC, race_id)"
+        )
+    )
+    # (venue, date) は上の索引の先頭部分で代用できる
+    conn.execute(text("DROP INDEX IF EXISTS ix_races_venue_date"))
+
+
+def _add_data_versions(conn: Connection) -> None:
+    """races / horses に応答のキャッシュ検証用の data_version / updated_at 列を足す"""
+    inspector = inspect(conn)
+    for table in ("races", "horses"):
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        if "data_version" not in existing:
+            conn.execute(
+                text(f"ALTER TABLE {table} ADD COLUMN data_version INTEGER NOT NULL DEFAULT 1")
+            )
+        if "updated_at" not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN updated_at DATETIME"))
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "add columns introduced before versioned migrations", _catch_up_columns),
+    Migration(2, "index race_entries(horse_id) and races(venue, date)", _create_query_indexes),
+    Migration(3, "index races in race list order (date desc, race_id)", _create_race_list_indexes),
+    Migration(4, "add data_version / updated_at to races and horses", _add_data_versions),
+]
+
+
+def pending_migrations(conn: Connection) -> list[Migration]:
+    """未適用のマイグレーション（バージョン順）"""
+    current = get_schema_version(conn)
+    return [migration for migration in MIGRATIONS if migration.version > current]
+
+
+def run_migrations(conn: Connection) -> list[int]:
+    """
+    未適用のマイグレーションを順に実行する（呼び出し側のトランザクション内で実行する）。
+
+    Returns:
+        適用したバージョン
+    """
+    applied: list[int] = []
+    for migration in pending_migrations(conn):
+        logger.info("Applying migration %d: %s", migration.version, migration.description)
+        migration.upgrade(conn)
+        set_schema_version(conn, migration.version)
+        applied.append(migration.version)
+    return applied
@@ -10,16 +10,28 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router as api_router
 from app.core.config import settings
+from app.core.database import dispose_engines
 from app.core.init_db import init_db
+from app.scraper.executor import shutdown_parse_executor
+from app.scraper.job_queue import get_job_queue
+from app.scraper.refresh_queue import get_horse_refresh_queue
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     """アプリケーションのライフサイクル管理"""
-    # 起動時: DBテーブル初期化
+    # 起動時: DBテーブル初期化・スクレイプジョブと過去成績再取得のワーカー起動
     await init_db()
+    job_queue = get_job_queue()
+    refresh_queue = get_horse_refresh_queue()
+    await job_queue.start()
+    await refresh_queue.start()
     yield
-    # 終了時: 必要ならクリーンアップ処理
+    # 終了時: スクレイプジョブ・過去成績再取得・パース用のワーカーを停止し、DB接続を閉じる
+    await refresh_queue.stop()
+    await job_queue.stop()
+    shutdown_parse_executor()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -36,6 +48,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # レース一覧のページング用ヘッダーをブラウザから読めるようにする
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 # ルーター登録
@@ -6,7 +6,22 @@ SQLAlchemy ORM モデルの公開インターフェース。
 
 from app.models.base import Base
 from app.models.horse import Horse
+from app.models.horse_stats import HorseStats
 from app.models.race import Race
+from app.models.race_calendar import RaceCalendar
+from app.models.race_document import RaceDocument
 from app.models.race_entry import RaceEntry
+from app.models.scrape_job import ScrapeJob, ScrapeJobDate, ScrapeJobRace
 
-__all__ = ["Base", "Race", "Horse", "RaceEntry"]
+__all__ = [
+    "Base",
+    "Race",
+    "Horse",
+    "HorseStats",
+    "RaceEntry",
+    "RaceCalendar",
+    "RaceDocument",
+    "ScrapeJob",
+    "ScrapeJobDate",
+    "ScrapeJobRace",
+]
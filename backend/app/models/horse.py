@@ -5,7 +5,9 @@
 複数レースに出走するため、RaceEntry から参照される。
 """
 
-from sqlalchemy import Integer, String
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -33,6 +35,17 @@ class Horse(Base):
     dam: Mapped[str | None] = mapped_column(String(50), nullable=True)  # 母
     sire_of_dam: Mapped[str | None] = mapped_column(String(50), nullable=True)  # 母父
 
+    # 馬のページ（過去成績）を最後に取得した日時。未取得なら None
+    last_scraped_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    # 応答のキャッシュ検証 (ETag / Last-Modified) 用。プロフィールが変わるたびに進める
+    data_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True, default=datetime.now
+    )
+
     # リレーション
     entries: Mapped[list["RaceEntry"]] = relationship(  # type: ignore[name-defined]  # noqa: F821
         "RaceEntry", back_populates="horse"
@@ -0,0 +1,42 @@
+"""
+馬の集計成績 (HorseStats) テーブルモデル
+
+出走記録から求めた脚質・スピード指数などを馬ごとに1行で保持する。
+出走記録を保存するたびに ScraperService がその馬の行を更新し、
+分析APIは過去成績を読み直さずにこの行を参照する。
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class HorseStats(Base):
+    """馬の集計成績テーブル"""
+
+    __tablename__ = "horse_stats"
+
+    horse_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("horses.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    style: Mapped[str] = mapped_column(String(10), nullable=False)  # RunningStyle の値
+    # 位置取りの平均（通過順を頭数で正規化。先頭=0.0, 最後方=1.0）
+    position_rate: Mapped[float | None] = mapped_column(Float, nullable=True)
+    avg_last_3f: Mapped[float | None] = mapped_column(Float, nullable=True)  # 上がり3Fの平均（秒）
+    speed: Mapped[float] = mapped_column(Float, nullable=False)  # スピード指数 (30-100)
+    races_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_race_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, onupdate=datetime.now
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<HorseStats(horse_id={self.horse_id}, style={self.style}, "
+            f"races={self.races_count})>"
+        )
@@ -4,9 +4,9 @@
 1レースの基本情報を保持する。
 """
 
-from datetime import date
+from datetime import date, datetime
 
-from sqlalchemy import Date, Integer, String
+from sqlalchemy import Date, DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -46,6 +46,15 @@ class Race(Base):
     # 出走頭数
     num_entries: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
+    # 応答のキャッシュ検証 (ETag / Last-Modified) 用。レース詳細の内容（出走記録・出走馬の情報）が
+    # 変わるたびに data_version を進め、updated_at を更新する
+    data_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True, default=datetime.now
+    )
+
     # リレーション
     entries: Mapped[list["RaceEntry"]] = relationship(  # type: ignore[name-defined]  # noqa: F821
         "RaceEntry", back_populates="race", cascade="all, delete-orphan"
@@ -53,3 +62,9 @@ class Race(Base):
 
     def __repr__(self) -> str:
         return f"<Race(race_id={self.race_id}, name={self.name}, date={self.date})>"
+
+
+# レース一覧 (GET /api/races) の並び順 (date desc, race_id) と会場での絞り込み。
+# キーセットページングの各ページを、ソートなしで索引を読むだけで返せる
+Index("ix_races_date_race_id", Race.date.desc(), Race.race_id)
+Index("ix_races_venue_date_race_id", Race.venue, Race.date.desc(), Race.race_id)
@@ -0,0 +1,34 @@
+"""
+開催カレンダー (RaceCalendar) テーブルモデル
+
+日付ごとのレースID一覧をキャッシュする。
+開催のない日も空の一覧として記録し、バックフィルでレース一覧ページの再取得を省く。
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class RaceCalendar(Base):
+    """開催カレンダーテーブル"""
+
+    __tablename__ = "race_calendar"
+
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    # その日のレースID（カンマ区切り。開催なしは空文字）
+    race_ids: Mapped[str] = mapped_column(Text, nullable=False, default="")
+
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+    @property
+    def race_id_list(self) -> list[str]:
+        """レースIDのリスト"""
+        return self.race_ids.split(",") if self.race_ids else []
+
+    def __repr__(self) -> str:
+        return f"<RaceCalendar(date={self.date}, races={len(self.race_id_list)})>"
@@ -0,0 +1,43 @@
+"""
+レース詳細の文書 (RaceDocument) テーブルモデル
+
+GET /api/races/{race_id} の応答JSONを gzip で圧縮して、レースごとに1行で保持する。
+レース・出走記録を保存するたびに ScraperService がそのレースの行を作り直し、
+レース詳細APIは races / race_entries / horses を読まずに、この行の本体をそのまま返す。
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class RaceDocument(Base):
+    """レース詳細の文書テーブル"""
+
+    __tablename__ = "race_documents"
+
+    # APIのパスで指定される netkeiba レースID（主キーの検索1回で引けるようにする）
+    race_id: Mapped[str] = mapped_column(String(20), primary_key=True)
+    race_pk: Mapped[int] = mapped_column(
+        Integer, ForeignKey("races.id", ondelete="CASCADE"), nullable=False
+    )
+
+    # 作成時点の races.data_version / updated_at（ETag・Last-Modified に使う）
+    data_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Cache-Control の判定用: 開催日と、全出走馬の記録がそろっているか
+    race_date: Mapped[date] = mapped_column(Date, nullable=False)
+    complete: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    # 応答モデルの JSON スキーマのハッシュ（形が変わったら使わずに組み立て直す）
+    schema_tag: Mapped[str] = mapped_column(String(16), nullable=False)
+
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # gzip 圧縮したJSON
+
+    def __repr__(self) -> str:
+        return (
+            f"<RaceDocument(race_id={self.race_id}, version={self.data_version}, "
+            f"bytes={len(self.body)})>"
+        )
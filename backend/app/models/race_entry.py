@@ -8,7 +8,7 @@ Race と Horse を結ぶ中間テーブル。
 シミュレーションのアニメーションデータソースでもある。
 """
 
-from sqlalchemy import Float, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import Float, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -65,7 +65,7 @@ class RaceEntry(Base):
     last_3f: Mapped[float | None] = mapped_column(
         Float, nullable=True
     )  # 上がり3F（秒）→ ラストスパートの速度変化に使用
-    
+
     status: Mapped[str] = mapped_column(
         String(20), default="result", server_default="result"
     )  # "result", "scratched", "excluded", "dnf"
@@ -79,14 +79,32 @@ class RaceEntry(Base):
         Integer, nullable=True
     )  # 馬体重増減 (kg)
 
+    # === 集計用の数値カラム（取り込み時に上の文字列カラムから変換） ===
+    # SQLite 内で平均タイム等を集計でき、読み出しのたびに文字列をパースせずに済む
+
+    finish_time_sec: Mapped[float | None] = mapped_column(
+        Float, nullable=True
+    )  # 走破タイム（秒）
+    pass_1: Mapped[int | None] = mapped_column(Integer, nullable=True)  # 1コーナー通過順位
+    pass_2: Mapped[int | None] = mapped_column(Integer, nullable=True)  # 2コーナー通過順位
+    pass_3: Mapped[int | None] = mapped_column(Integer, nullable=True)  # 3コーナー通過順位
+    pass_4: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )  # 4コーナー（最後のコーナー）通過順位
+    margin_lengths: Mapped[float | None] = mapped_column(
+        Float, nullable=True
+    )  # 前の馬との着差（馬身）。戦績ページの秒差からは入らない
+
     # === リレーション ===
 
     race: Mapped["Race"] = relationship("Race", back_populates="entries")
     horse: Mapped["Horse"] = relationship("Horse", back_populates="entries")
 
-    # 同じレースに同じ馬が2度出走することはない
+    # 同じレースに同じ馬が2度出走することはない（race_id での検索もこの索引を使う）
+    # 馬ごとの過去成績の読み込み（分析・馬詳細）は horse_id の索引を使う
     __table_args__ = (
         UniqueConstraint("race_id", "horse_id", name="uq_race_horse"),
+        Index("ix_race_entries_horse_id", "horse_id"),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,99 @@
+"""
+スクレイプジョブ (ScrapeJob) テーブルモデル
+
+期間指定のバックフィルなど、長時間かかる収集処理の進捗を永続化する。
+日付ごと・レースごとのチェックポイントを持ち、中断後に続きから再開できる。
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+
+class ScrapeJob(Base):
+    """スクレイプジョブテーブル"""
+
+    __tablename__ = "scrape_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)  # "date", "range"
+    date_from: Mapped[date] = mapped_column(Date, nullable=False)
+    date_to: Mapped[date] = mapped_column(Date, nullable=False)
+
+    status: Mapped[str] = mapped_column(
+        String(20), default="pending", server_default="pending"
+    )  # "pending", "running", "completed", "failed"
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, onupdate=datetime.now
+    )
+
+    # リレーション
+    dates: Mapped[list["ScrapeJobDate"]] = relationship(
+        back_populates="job", cascade="all, delete-orphan", order_by="ScrapeJobDate.date"
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ScrapeJob(id={self.id}, kind={self.kind}, "
+            f"{self.date_from}..{self.date_to}, status={self.status})>"
+        )
+
+
+class ScrapeJobDate(Base):
+    """ジョブの日付ごとの進捗"""
+
+    __tablename__ = "scrape_job_dates"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("scrape_jobs.id", ondelete="CASCADE"), nullable=False
+    )
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    status: Mapped[str] = mapped_column(
+        String(20), default="pending", server_default="pending"
+    )  # "pending", "done", "no_races", "failed"
+    race_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # リレーション
+    job: Mapped["ScrapeJob"] = relationship(back_populates="dates")
+
+    __table_args__ = (UniqueConstraint("job_id", "date", name="uq_job_date"),)
+
+    def __repr__(self) -> str:
+        return f"<ScrapeJobDate(job_id={self.job_id}, date={self.date}, status={self.status})>"
+
+
+class ScrapeJobRace(Base):
+    """ジョブのレースごとの進捗"""
+
+    __tablename__ = "scrape_job_races"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("scrape_jobs.id", ondelete="CASCADE"), nullable=False
+    )
+
+    # netkeiba のレースID
+    race_id: Mapped[str] = mapped_column(String(20), nullable=False)
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    status: Mapped[str] = mapped_column(
+        String(20), default="pending", server_default="pending"
+    )  # "pending", "saved", "skipped", "failed"
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (UniqueConstraint("job_id", "race_id", name="uq_job_race"),)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ScrapeJobRace(job_id={self.job_id}, race_id={self.race_id}, "
+            f"status={self.status})>"
+        )
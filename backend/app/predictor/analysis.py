@@ -0,0 +1,205 @@
+"""
+出走馬の一括分析
+
+出走馬全頭の過去成績を1回のクエリで読み込み、脚質・スピード指数を pandas でまとめて計算する。
+1頭ずつ履歴を引いて Python のループで集計する方式より、頭数が増えても往復が増えない。
+
+計算結果は horse_stats テーブルに保存する。出走記録を保存した馬について
+ScraperService が refresh_horse_stats を呼び、分析APIは load_horse_stats で行を引くだけで済む。
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import HorseStats, Race, RaceEntry
+from app.predictor.logic import (
+    RunningStyle,
+    classify_horses,
+    corner_position_rates,
+    passing_position_rates,
+)
+
+# 脚質判定に使う直近のレース数
+ANALYSIS_HISTORY_LIMIT = 30
+
+# 上がり3Fの記録がない馬に使う値（秒）
+DEFAULT_LAST_3F = 36.0
+
+CORNER_COLUMNS = ["pass_1", "pass_2", "pass_3", "pass_4"]
+
+HISTORY_COLUMNS = [
+    "horse_id",
+    "date",
+    "num_entries",
+    *CORNER_COLUMNS,
+    "passing_order",
+    "last_3f",
+    "races_count",
+]
+
+
+async def load_histories(session: AsyncSession, horse_ids: list[int]) -> pd.DataFrame:
+    """
+    複数頭の直近の出走記録を1回のクエリで読み込む。
+
+    馬ごとに新しい順の順位 (ROW_NUMBER) と総出走数 (COUNT) をウィンドウ関数で付け、
+    直近 ANALYSIS_HISTORY_LIMIT 件だけを返す。
+
+    Args:
+        session: DBセッション
+        horse_ids: horses.id の一覧
+
+    Returns:
+        horse_id / date / num_entries / pass_1〜pass_4 / passing_order / last_3f /
+        races_count 列の DataFrame
+    """
+    if not horse_ids:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+    ranked = (
+        select(
+            RaceEntry.horse_id,
+            Race.date,
+            Race.num_entries,
+            RaceEntry.pass_1,
+            RaceEntry.pass_2,
+            RaceEntry.pass_3,
+            RaceEntry.pass_4,
+            RaceEntry.passing_order,
+            RaceEntry.last_3f,
+            func.row_number()
+            .over(partition_by=RaceEntry.horse_id, order_by=(Race.date.desc(), Race.id.desc()))
+            .label("recency"),
+            func.count().over(partition_by=RaceEntry.horse_id).label("races_count"),
+        )
+        .join(Race, RaceEntry.race_id == Race.id)
+        .where(RaceEntry.horse_id.in_(horse_ids))
+        .subquery()
+    )
+    result = await session.execute(
+        select(
+            ranked.c.horse_id,
+            ranked.c.date,
+            ranked.c.num_entries,
+            ranked.c.pass_1,
+            ranked.c.pass_2,
+            ranked.c.pass_3,
+            ranked.c.pass_4,
+            ranked.c.passing_order,
+            ranked.c.last_3f,
+            ranked.c.races_count,
+        ).where(ranked.c.recency <= ANALYSIS_HISTORY_LIMIT)
+    )
+    return pd.DataFrame(result.all(), columns=HISTORY_COLUMNS)
+
+
+def summarize_histories(history: pd.DataFrame, horse_ids: list[int]) -> pd.DataFrame:
+    """
+    出走記録から馬ごとの脚質・スピード指数を計算する。
+
+    脚質は頭数で正規化した位置取りの平均（classify_horses）、スピード指数は上がり3Fの平均から求める。
+
+    Args:
+        history: load_histories の結果
+        horse_ids: 結果に含める horses.id（記録がない馬は UNKNOWN・件数0）
+
+    Returns:
+        horse_id をインデックスとし、style / position_rate / avg_last_3f / speed /
+        races_count / last_race_date 列を持つ DataFrame
+    """
+    by_horse = history["horse_id"]
+
+    # 通過順位は取り込み時に数値化済みの列を使う（文字列はパースしない）
+    corners = history[CORNER_COLUMNS].to_numpy(dtype=float, na_value=np.nan)
+    rates = corner_position_rates(corners, history["num_entries"])
+    # 数値化されていない出走記録（取り込み以外で追加した行）だけ通過順の文字列から求める
+    unconverted = np.isnan(rates) & history["passing_order"].notna().to_numpy()
+    if unconverted.any():
+        rates[unconverted] = passing_position_rates(
+            history["passing_order"][unconverted], history["num_entries"][unconverted]
+        )
+    styles = classify_horses(by_horse.to_numpy(), rates).reindex(horse_ids)
+
+    # 上がり3F（記録なし・0 は除外）
+    last_3f = pd.to_numeric(history["last_3f"], errors="coerce")
+    avg_last_3f = last_3f.where(last_3f > 0).groupby(by_horse).mean().reindex(horse_ids)
+    speed = np.clip(100.0 - (avg_last_3f.fillna(DEFAULT_LAST_3F) - 33.0) * 10, 30.0, 100.0)
+
+    grouped = history.groupby("horse_id")
+    races_count = grouped["races_count"].first().reindex(horse_ids)
+    last_race_date = grouped["date"].max().reindex(horse_ids)
+
+    return pd.DataFrame(
+        {
+            "style": styles["style"].fillna(RunningStyle.UNKNOWN.value).to_numpy(),
+            "position_rate": styles["position_rate"].to_numpy(dtype=float),
+            "avg_last_3f": avg_last_3f.to_numpy(dtype=float),
+            "speed": speed.to_numpy(dtype=float).round(1),
+            "races_count": races_count.fillna(0).astype(int).to_numpy(),
+            "last_race_date": last_race_date.to_numpy(dtype=object),
+        },
+        index=pd.Index(horse_ids, name="horse_id"),
+    )
+
+
+async def refresh_horse_stats(session: AsyncSession, horse_ids: Iterable[int]) -> None:
+    """
+    指定した馬の集計成績を出走記録から計算し直して horse_stats に保存する（コミットはしない）。
+
+    対象の馬だけを読み直すため、出走記録を追加した直後に呼べば他の馬の行はそのまま使える。
+
+    Args:
+        session: DBセッション
+        horse_ids: horses.id の一覧
+    """
+    horse_ids = sorted(set(horse_ids))
+    if not horse_ids:
+        return
+
+    summary = summarize_histories(await load_histories(session, horse_ids), horse_ids)
+    now = datetime.now()
+    rows = [
+        {
+            "horse_id": int(horse_id),
+            "style": row.style,
+            "position_rate": None if pd.isna(row.position_rate) else float(row.position_rate),
+            "avg_last_3f": None if pd.isna(row.avg_last_3f) else float(row.avg_last_3f),
+            "speed": float(row.speed),
+            "races_count": int(row.races_count),
+            "last_race_date": None if pd.isna(row.last_race_date) else row.last_race_date,
+            "updated_at": now,
+        }
+        for horse_id, row in summary.iterrows()
+    ]
+    stmt = sqlite_insert(HorseStats).values(rows)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[HorseStats.horse_id],
+            set_={key: stmt.excluded[key] for key in rows[0] if key != "horse_id"},
+        )
+    )
+
+
+async def load_horse_stats(session: AsyncSession, horse_ids: list[int]) -> dict[int, HorseStats]:
+    """
+    horse_stats から指定した馬の行を主キーで引く。
+
+    他のセッションが更新した行も読み直す（populate_existing）。
+
+    Returns:
+        horses.id → HorseStats（行がない馬は含まない）
+    """
+    if not horse_ids:
+        return {}
+    result = await session.execute(
+        select(HorseStats)
+        .where(HorseStats.horse_id.in_(horse_ids))
+        .execution_options(populate_existing=True)
+    )
+    return {stats.horse_id: stats for stats in result.scalars()}
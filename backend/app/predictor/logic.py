@@ -1,6 +1,10 @@
-from enum import Enum
 import logging
-from typing import List, Optional
+from collections.abc import Sequence
+from enum import Enum
+from typing import Any
+
+import numpy as np
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -11,46 +15,129 @@ class RunningStyle(Enum):
     OIKOMI = "OIKOMI"    # 追込
     UNKNOWN = "UNKNOWN"
 
-def determine_running_style(entries: List) -> RunningStyle:
+# 判定しきい値 (暫定): 位置取り（先頭=0.0, 最後方=1.0）の平均がこの値以下ならその脚質
+# 16頭立てならおおむね 2番手まで逃げ、5番手まで先行、10番手まで差し
+STYLE_THRESHOLDS = [
+    (0.1, RunningStyle.NIGE),
+    (0.3, RunningStyle.SENKO),
+    (0.65, RunningStyle.SASHI),
+]
+
+# 頭数が不明なレース（馬の戦績から作ったスタブ等）で仮定する頭数
+ASSUMED_FIELD_SIZE = 16
+
+
+def passing_position_rates(
+    passing_orders: Sequence[str | None] | pd.Series,
+    num_entries: Sequence[int | None] | pd.Series,
+) -> np.ndarray:
+    """
+    通過順と頭数から、出走ごとの位置取りを求める。
+
+    "3-3-2-1" のような通過順の平均順位を、そのレースの頭数で 先頭=0.0 / 最後方=1.0 に正規化する。
+    頭数が不明 (0・None) なら ASSUMED_FIELD_SIZE とみなす。
+
+    Args:
+        passing_orders: 出走ごとの通過順
+        num_entries: 出走ごとのレースの頭数
+
+    Returns:
+        出走ごとの位置取り（通過順が空、または数値でない区間を含む出走は NaN）
     """
-    出走記録の通過順から脚質を判定する。
+    orders = pd.Series(np.asarray(passing_orders, dtype=object))
+    tokens = orders.fillna("").astype(str).str.split("-").explode().str.strip()
+    tokens = tokens[tokens != ""]
+    numbers = pd.to_numeric(tokens, errors="coerce")
+    invalid = numbers.isna().groupby(level=0).any()
+    mean_positions = numbers.groupby(level=0).mean().mask(invalid).reindex(orders.index)
+    return _normalize_positions(mean_positions.to_numpy(dtype=float), num_entries)
+
+
+def corner_position_rates(
+    corners: np.ndarray, num_entries: Sequence[int | None] | pd.Series
+) -> np.ndarray:
+    """
+    コーナーごとの通過順位（race_entries.pass_1〜pass_4）と頭数から、出走ごとの位置取りを求める。
+
+    passing_position_rates と同じ正規化を、取り込み時に数値化済みの列に対して行う
+    （文字列をパースしない）。
+
+    Args:
+        corners: 出走数 × コーナー数の配列（通過順位のないコーナーは NaN）
+        num_entries: 出走ごとのレースの頭数
+
+    Returns:
+        出走ごとの位置取り（通過順位が1つもない出走は NaN）
+    """
+    corners = np.asarray(corners, dtype=float)
+    counts = (~np.isnan(corners)).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_positions = np.where(counts > 0, np.nansum(corners, axis=1) / counts, np.nan)
+    return _normalize_positions(mean_positions, num_entries)
+
+
+def _normalize_positions(
+    mean_positions: np.ndarray, num_entries: Sequence[int | None] | pd.Series
+) -> np.ndarray:
+    """平均順位を頭数で 先頭=0.0 / 最後方=1.0 に正規化する（頭数不明は ASSUMED_FIELD_SIZE）"""
+    field = pd.to_numeric(pd.Series(np.asarray(num_entries, dtype=object)), errors="coerce")
+    field_sizes: np.ndarray = field.where(field > 1, ASSUMED_FIELD_SIZE).to_numpy(dtype=float)
+    # 頭数を超える通過順（頭数の誤り）も最後方に収める
+    rates: np.ndarray = np.clip((mean_positions - 1) / (field_sizes - 1), 0.0, 1.0)
+    return rates
+
+
+def classify_running_styles(position_rates: np.ndarray) -> np.ndarray:
+    """
+    位置取りの平均の配列から脚質名の配列を求める。
+
+    NaN（判定材料なし）は UNKNOWN になる。
+    """
+    conditions = [position_rates <= threshold for threshold, _ in STYLE_THRESHOLDS]
+    conditions.append(position_rates > STYLE_THRESHOLDS[-1][0])
+    choices = [style.value for _, style in STYLE_THRESHOLDS] + [RunningStyle.OIKOMI.value]
+    return np.select(conditions, choices, default=RunningStyle.UNKNOWN.value)
+
+
+def classify_horses(
+    horse_ids: Sequence[int] | np.ndarray, position_rates: np.ndarray
+) -> pd.DataFrame:
+    """
+    多数の馬の出走記録をまとめて脚質判定する。
+
+    引数は1出走1要素の同じ長さの配列（位置取りは passing_position_rates /
+    corner_position_rates で求める）。DB全体の出走記録を渡して一度に再判定することもできる。
+
+    Returns:
+        馬IDをインデックスとし、position_rate（位置取りの平均）/ style 列を持つ DataFrame
+    """
+    mean_rates = pd.Series(position_rates).groupby(np.asarray(horse_ids)).mean()
+    return pd.DataFrame(
+        {
+            "position_rate": mean_rates.to_numpy(),
+            "style": classify_running_styles(mean_rates.to_numpy(dtype=float)),
+        },
+        index=mean_rates.index,
+    )
+
+
+def determine_running_style(
+    entries: Sequence[Any], num_entries: Sequence[int | None] | None = None
+) -> RunningStyle:
+    """
+    出走記録の通過順から脚質を判定する（1頭分。多数の馬は classify_horses を使う）。
+
+    Args:
+        entries: passing_order を持つ出走記録
+        num_entries: 各出走のレースの頭数（省略時は不明として扱う）
     """
     if not entries:
         return RunningStyle.UNKNOWN
 
-    position_rates = []
-    
-    for entry in entries:
-        if not entry.passing_order:
-            continue
-            
-        # "1-2-2-3" などの形式をパース
-        try:
-            positions = [int(p) for p in entry.passing_order.split("-") if p.strip()]
-            if not positions:
-                continue
-            
-            # 各地点での相対位置 (1位=0.0, 最後尾=1.0 に近い値)
-            # レースごとの頭数が不明なため、1位かどうかと推移で見る
-            # 簡易的に平均順位で見る
-            avg_pos = sum(positions) / len(positions)
-            position_rates.append(avg_pos)
-        except (ValueError, AttributeError):
-            continue
-
-    if not position_rates:
+    rates = passing_position_rates(
+        [entry.passing_order for entry in entries],
+        num_entries if num_entries is not None else [None] * len(entries),
+    )
+    if np.isnan(rates).all():
         return RunningStyle.UNKNOWN
-
-    # 全レースの平均順位
-    mean_avg_pos = sum(position_rates) / len(position_rates)
-
-    # 判定しきい値 (暫定)
-    # 1〜3番手なら逃げ/先行、それ以降なら差し/追込
-    if mean_avg_pos <= 2.0:
-        return RunningStyle.NIGE
-    elif mean_avg_pos <= 5.0:
-        return RunningStyle.SENKO
-    elif mean_avg_pos <= 10.0:
-        return RunningStyle.SASHI
-    else:
-        return RunningStyle.OIKOMI
+    return RunningStyle(classify_running_styles(np.array([np.nanmean(rates)]))[0])
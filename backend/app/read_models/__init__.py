@@ -0,0 +1 @@
+"""読み出し用モデル（取り込み時に作り、APIがそのまま返すデータ）"""
@@ -0,0 +1,188 @@
+"""
+レース詳細の文書（読み出し用モデル）
+
+GET /api/races/{race_id} の応答は、レース・出走記録・馬を結合して組み立てる。内容が変わるのは
+取り込みの時だけなので、ScraperService が保存と同じトランザクションで応答JSONを組み立てて
+gzip で圧縮し、race_documents に書いておく。レース詳細APIは主キーで1行読むだけで、
+クライアントが gzip を受け付ければ圧縮されたバイト列をそのまま返す。
+
+文書がないレース（テーブル追加前のデータ・アーカイブから作り直したDB）や、文書の形
+(RACE_DOCUMENT_TAG) が変わって古くなった文書は、APIが従来どおり行から組み立てて返す。
+まとめて作り直すには scripts/rebuild_race_documents.py を使う。
+
+API・スクレイパー・スクリプトの共用モジュールのため、app.api には依存しない。文書の形は
+レース詳細の応答モデル (RaceDetailResponse) に合わせる（tests/test_api.py で一致を検証）。
+"""
+
+import gzip
+import hashlib
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.encoding import get_encoder
+from app.models import Horse, Race, RaceDocument, RaceEntry
+from app.predictor.analysis import CORNER_COLUMNS
+
+# レース詳細で返す列（RaceDetailResponse / EntryResponse / HorseResponse のフィールド）
+RACE_DETAIL_FIELDS = [
+    "race_id",
+    "name",
+    "date",
+    "venue",
+    "course_type",
+    "distance",
+    "direction",
+    "weather",
+    "track_condition",
+    "race_class",
+    "num_entries",
+]
+# 出走記録の列（horse と corner_positions は別に組み立てる）
+ENTRY_FIELDS = [
+    "horse_number",
+    "bracket_number",
+    "jockey",
+    "weight_carried",
+    "odds",
+    "popularity",
+    "finish_position",
+    "finish_time",
+    "margin",
+    "passing_order",
+    "last_3f",
+    "horse_weight",
+    "horse_weight_diff",
+    "status",
+    "finish_time_sec",
+    "margin_lengths",
+]
+HORSE_FIELDS = ["horse_id", "name", "sex", "trainer", "sire", "dam"]
+
+# 文書の組み立て方を変えたら上げる（列の増減は RACE_DOCUMENT_TAG に自動で反映される）
+_DOCUMENT_FORMAT = 1
+
+# 文書の形の短いハッシュ。保存した文書の schema_tag と異なれば、APIは文書を使わない
+RACE_DOCUMENT_TAG = hashlib.sha256(
+    json.dumps([_DOCUMENT_FORMAT, RACE_DETAIL_FIELDS, ENTRY_FIELDS, HORSE_FIELDS]).encode()
+).hexdigest()[:8]
+
+# レースの出走記録の件数（結果が確定したかの判定に使う）
+RACE_ENTRY_COUNT = (
+    select(func.count())
+    .where(RaceEntry.race_id == Race.id)
+    .correlate(Race)
+    .scalar_subquery()
+    .label("entry_count")
+)
+
+# 1回の一括 UPSERT で書く文書の数（SQLite のバインド変数の上限に収める）
+_UPSERT_BATCH = 500
+
+
+def is_complete(num_entries: int | None, entry_count: int) -> bool:
+    """全出走馬の出走記録がそろっているか（頭数が不明なレースは確定扱いにしない）"""
+    return num_entries is not None and num_entries > 0 and entry_count >= num_entries
+
+
+def compress_document(content: Any) -> bytes:
+    """応答JSONを gzip で圧縮する（同じ内容なら同じバイト列になるよう mtime を固定する）"""
+    return gzip.compress(get_encoder()(content), mtime=0)
+
+
+async def load_race_details(
+    session: AsyncSession, races: Iterable[Row[Any]]
+) -> dict[int, dict[str, Any]]:
+    """
+    レースの行から、レース詳細の応答 dict を組み立てる
+
+    出走記録と馬は、全レース分を1回のクエリで読む。
+
+    Args:
+        session: DBセッション
+        races: races.id（id 列）と RACE_DETAIL_FIELDS の列を持つ行
+
+    Returns:
+        races.id → 応答 dict
+    """
+    details: dict[int, dict[str, Any]] = {
+        race.id: {**{name: race._mapping[name] for name in RACE_DETAIL_FIELDS}, "entries": []}
+        for race in races
+    }
+    if not details:
+        return details
+
+    result = await session.execute(
+        select(
+            RaceEntry.race_id,
+            *(getattr(RaceEntry, name) for name in ENTRY_FIELDS),
+            *(getattr(RaceEntry, column) for column in CORNER_COLUMNS),
+            *(getattr(Horse, name) for name in HORSE_FIELDS),
+        )
+        .join(Horse, RaceEntry.horse_id == Horse.id)
+        .where(RaceEntry.race_id.in_(details))
+        .order_by(RaceEntry.race_id, RaceEntry.horse_number)
+    )
+    corners_start = 1 + len(ENTRY_FIELDS)
+    horse_start = corners_start + len(CORNER_COLUMNS)
+    for row in result.all():
+        details[row[0]]["entries"].append(
+            {
+                **dict(zip(ENTRY_FIELDS, row[1:corners_start], strict=True)),
+                "corner_positions": list(row[corners_start:horse_start]),
+                "horse": dict(zip(HORSE_FIELDS, row[horse_start:], strict=True)),
+            }
+        )
+    return details
+
+
+async def refresh_race_documents(session: AsyncSession, race_pks: Iterable[int]) -> None:
+    """
+    指定したレースの文書を組み立て直して race_documents に保存する（コミットはしない）。
+
+    Args:
+        session: DBセッション
+        race_pks: races.id の一覧
+    """
+    race_pks = sorted(set(race_pks))
+    for start in range(0, len(race_pks), _UPSERT_BATCH):
+        batch = race_pks[start : start + _UPSERT_BATCH]
+        races = (
+            await session.execute(
+                select(
+                    Race.id,
+                    Race.data_version,
+                    Race.updated_at,
+                    RACE_ENTRY_COUNT,
+                    *(getattr(Race, name) for name in RACE_DETAIL_FIELDS),
+                ).where(Race.id.in_(batch))
+            )
+        ).all()
+        if not races:
+            continue
+
+        details = await load_race_details(session, races)
+        rows = [
+            {
+                "race_id": race.race_id,
+                "race_pk": race.id,
+                "data_version": race.data_version,
+                "updated_at": race.updated_at,
+                "race_date": race.date,
+                "complete": is_complete(race.num_entries, race.entry_count),
+                "schema_tag": RACE_DOCUMENT_TAG,
+                "body": compress_document(details[race.id]),
+            }
+            for race in races
+        ]
+        stmt = sqlite_insert(RaceDocument).values(rows)
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[RaceDocument.race_id],
+                set_={key: stmt.excluded[key] for key in rows[0] if key != "race_id"},
+            )
+        )
@@ -12,6 +12,35 @@ REQUEST_DELAY_MIN = 1.0  # リクエスト間の最小待機秒数
 REQUEST_DELAY_MAX = 2.5  # リクエスト間の最大待機秒数
 MAX_RETRIES = 3  # リトライ回数
 
+# 並列取得設定
+MAX_CONCURRENT_REQUESTS = 4  # 同時に実行するリクエスト数の上限
+RATE_LIMIT_BURST = 1.0  # トークンバケットの容量（連続で即時発行できるリクエスト数）
+RATE_LIMIT_MIN_RATE = 0.1  # 減速時の下限レート（リクエスト/秒）
+RATE_LIMIT_LATENCY_FACTOR = 2.0  # 基準レイテンシのこの倍率を超えたら減速する
+
+# DB保存設定
+SCRAPE_COMMIT_BATCH = 12  # scrape_date でまとめてコミットするレース数
+
+# 進捗イベント配信設定
+EVENT_QUEUE_SIZE = 256  # 購読者ごとに保持するイベント数（溢れたら古いものから捨てる）
+SSE_KEEPALIVE_INTERVAL = 15.0  # イベントがない間、SSE接続維持のコメントを送る間隔（秒）
+
+# ページ種別（アーカイブのキー・TTL判定に使用）
+PAGE_RACE_RESULT = "race_result"
+PAGE_RACE_LIST = "race_list"
+PAGE_HORSE_RESULT = "horse_result"
+
+# アーカイブの有効期限（秒）。None は無期限（確定済みで変化しないページ）
+ARCHIVE_TTL: dict[str, float | None] = {
+    PAGE_RACE_RESULT: None,  # レース結果は確定後に変わらない
+    PAGE_RACE_LIST: 24 * 60 * 60,
+    PAGE_HORSE_RESULT: 24 * 60 * 60,  # 出走のたびに戦績が増える
+}
+# 無期限の種別でも、確定前（結果の表がない）ページに使う有効期限（秒）
+ARCHIVE_PENDING_TTL = 60 * 60
+# 開催カレンダーの空の一覧の有効期限（秒）。一時的な障害ページも空の一覧になるため取り直す
+CALENDAR_EMPTY_TTL = 24 * 60 * 60
+
 # User-Agent（一般的なブラウザを模倣）
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
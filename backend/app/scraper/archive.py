@@ -0,0 +1,179 @@
+"""
+取得済みHTMLのアーカイブ
+
+netkeiba.com から取得したレスポンス本文を gzip 圧縮してディスクに保存する。
+本文はコンテンツハッシュ (SHA-256) をキーに保存するため、同じ内容は1回しか書き込まれない。
+URLごとの参照ファイルが最新の本文ハッシュと取得日時を指す。
+
+    <root>/objects/ab/abcdef....html.gz       本文（コンテンツアドレス）
+    <root>/refs/<page_type>/12/1234....json   URL → 本文ハッシュ・取得日時
+
+再スクレイプ・デバッグ・パーサー修正後の再パースでネットワークアクセスを省く。
+
+レース結果ページは確定後に変わらないため無期限に使うが、結果の掲載前に取得したページ
+（結果の表がない）は ARCHIVE_PENDING_TTL が過ぎたら取得し直す。
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.core.config import settings
+from app.scraper import ARCHIVE_PENDING_TTL, ARCHIVE_TTL, PAGE_RACE_RESULT
+
+# 結果の表の目印（パーサーの _RESULT_TABLE_MARKERS と同じ）
+_RESULT_TABLE_MARKERS = (b"race_table_01", b"RaceTable01")
+
+
+def is_final_page(page_type: str, content: bytes) -> bool:
+    """
+    確定済みで内容が変わらないページか
+
+    レース結果ページは、結果の表があり、その後に出走馬へのリンクがある場合だけ確定済みとみなす。
+    それ以外の種別は常に True（有効期限は ARCHIVE_TTL に従う）。
+    """
+    if page_type != PAGE_RACE_RESULT:
+        return True
+    for marker in _RESULT_TABLE_MARKERS:
+        index = content.find(marker)
+        if index >= 0 and content.find(b"/horse/", index) >= 0:
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class ArchivedPage:
+    """アーカイブ済みページの参照情報"""
+
+    url: str
+    page_type: str
+    sha256: str
+    fetched_at: float  # UNIX時刻
+
+
+class RawPageArchive:
+    """gzip 圧縮・コンテンツアドレス型のHTMLアーカイブ"""
+
+    def __init__(self, root: str | Path) -> None:
+        self._root = Path(root)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _object_path(self, sha256: str) -> Path:
+        return self._root / "objects" / sha256[:2] / f"{sha256}.html.gz"
+
+    def _ref_path(self, url: str, page_type: str) -> Path:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self._root / "refs" / page_type / key[:2] / f"{key}.json"
+
+    def lookup(self, url: str, page_type: str) -> ArchivedPage | None:
+        """URLの参照情報を取得する（有効期限は考慮しない）"""
+        try:
+            data = json.loads(self._ref_path(url, page_type).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return ArchivedPage(**data)
+
+    def get(self, url: str, page_type: str) -> bytes | None:
+        """
+        有効期限内のアーカイブ済み本文を取得する。
+
+        Args:
+            url: ページのURL
+            page_type: ページ種別（ARCHIVE_TTL のキー）
+
+        Returns:
+            本文のバイト列。未保存・期限切れの場合は None
+        """
+        ref = self.lookup(url, page_type)
+        if ref is None:
+            return None
+
+        ttl = ARCHIVE_TTL.get(page_type)
+        if ttl is not None and time.time() - ref.fetched_at > ttl:
+            return None
+
+        try:
+            content = self.read_object(ref.sha256)
+        except FileNotFoundError:
+            return None
+
+        # 無期限の種別でも、確定前のページは短い有効期限で取得し直す
+        if (
+            ttl is None
+            and not is_final_page(page_type, content)
+            and time.time() - ref.fetched_at > ARCHIVE_PENDING_TTL
+        ):
+            return None
+        return content
+
+    def read_object(self, sha256: str) -> bytes:
+        """本文ハッシュから本文を読み込む"""
+        return gzip.decompress(self._object_path(sha256).read_bytes())
+
+    def put(self, url: str, page_type: str, content: bytes) -> ArchivedPage:
+        """
+        本文を保存し、URLの参照を更新する。
+
+        Args:
+            url: ページのURL
+            page_type: ページ種別
+            content: レスポンス本文
+
+        Returns:
+            保存したページの参照情報
+        """
+        sha256 = hashlib.sha256(content).hexdigest()
+        object_path = self._object_path(sha256)
+        if not object_path.exists():
+            _atomic_write(object_path, gzip.compress(content))
+
+        ref = ArchivedPage(url=url, page_type=page_type, sha256=sha256, fetched_at=time.time())
+        payload = json.dumps(asdict(ref), ensure_ascii=False).encode("utf-8")
+        _atomic_write(self._ref_path(url, page_type), payload)
+        return ref
+
+    def iter_pages(self, page_type: str) -> Iterator[ArchivedPage]:
+        """指定種別のアーカイブ済みページを列挙する"""
+        base = self._root / "refs" / page_type
+        if not base.exists():
+            return
+        for path in sorted(base.glob("*/*.json")):
+            try:
+                yield ArchivedPage(**json.loads(path.read_text(encoding="utf-8")))
+            except (json.JSONDecodeError, TypeError):
+                continue
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """一時ファイル経由で書き込み、途中状態のファイルを残さない"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+_default_archive: RawPageArchive | None = None
+
+
+def get_default_archive() -> RawPageArchive | None:
+    """設定に基づくデフォルトのアーカイブを取得する（無効なら None）"""
+    global _default_archive
+    if not settings.raw_archive_enabled:
+        return None
+    if _default_archive is None:
+        _default_archive = RawPageArchive(settings.raw_archive_dir)
+    return _default_archive
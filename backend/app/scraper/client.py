@@ -7,18 +7,22 @@ netkeiba.com へのHTTPリクエストを管理する。
 
 import asyncio
 import logging
-import random
+import time
 
 import httpx
 
 from app.scraper import (
+    MAX_CONCURRENT_REQUESTS,
     MAX_RETRIES,
     NETKEIBA_BASE_URL,
-    REQUEST_DELAY_MAX,
-    REQUEST_DELAY_MIN,
+    PAGE_HORSE_RESULT,
+    PAGE_RACE_LIST,
+    PAGE_RACE_RESULT,
     REQUEST_TIMEOUT,
     USER_AGENT,
 )
+from app.scraper.archive import RawPageArchive, get_default_archive
+from app.scraper.rate_limiter import RateLimiter, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +30,22 @@ logger = logging.getLogger(__name__)
 class ScraperClient:
     """netkeiba.com 用HTTPクライアント"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        limiter: RateLimiter | None = None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        archive: RawPageArchive | None = None,
+    ) -> None:
+        """
+        Args:
+            limiter: レートリミッター（省略時はプロセス共有のものを使う）
+            max_concurrency: 同時に実行するリクエスト数の上限
+            archive: HTMLアーカイブ（省略時は設定に基づくデフォルト）
+        """
         self._client: httpx.AsyncClient | None = None
+        self._limiter = limiter or get_rate_limiter()
+        self._archive = archive or get_default_archive()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
 
     async def _get_client(self) -> httpx.AsyncClient:
         """HTTPクライアントを取得（遅延初期化）"""
@@ -47,14 +65,17 @@ class ScraperClient:
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
-    async def fetch_page(self, url: str) -> str:
+    async def fetch_page(self, url: str, page_type: str | None = None) -> str:
         """
         ページのHTMLを取得する。
 
-        レート制限とリトライを自動的に適用する。
+        page_type を指定した場合はアーカイブを先に参照し、
+        有効期限内であればネットワークにアクセスしない。
+        取得した本文はアーカイブに保存される。
 
         Args:
             url: 取得するURL
+            page_type: ページ種別（PAGE_* 定数）
 
         Returns:
             HTMLの文字列
@@ -62,60 +83,103 @@ class ScraperClient:
         Raises:
             httpx.HTTPError: リトライ後も取得に失敗した場合
         """
-        client = await self._get_client()
+        if page_type is None or self._archive is None:
+            return decode_html(await self._fetch_content(url))
+
+        content = await asyncio.to_thread(self._archive.get, url, page_type)
+        if content is not None:
+            logger.debug("Archive hit: %s", url)
+            return decode_html(content)
 
-        for attempt in range(MAX_RETRIES):
-            try:
-                # レート制限: ランダムな待機時間
-                if attempt > 0:
-                    wait = random.uniform(REQUEST_DELAY_MIN * 2, REQUEST_DELAY_MAX * 2)
-                else:
-                    wait = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
-                await asyncio.sleep(wait)
+        content = await self._fetch_content(url)
+        await asyncio.to_thread(self._archive.put, url, page_type, content)
+        return decode_html(content)
+
+    async def _fetch_content(self, url: str) -> bytes:
+        """
+        レスポンス本文をネットワークから取得する。
+
+        レート制限とリトライを自動的に適用する。
+        """
+        client = await self._get_client()
 
-                response = await client.get(url)
-                response.raise_for_status()
+        async with self._semaphore:
+            for attempt in range(MAX_RETRIES):
+                # レート制限: 共有トークンバケットから発行を待つ
+                await self._limiter.acquire()
 
-                # netkeiba.com は EUC-JP が多いが、ヘッダーに含まれないこともある
-                # まず EUC-JP でのデコードを試みる
+                started = time.monotonic()
                 try:
-                    return response.content.decode("euc-jp")
-                except UnicodeDecodeError:
-                    # 失敗したら UTF-8、それもだめなら httpx の推定に任せる
-                    try:
-                        return response.content.decode("utf-8")
-                    except UnicodeDecodeError:
-                        return response.text
-
-            except httpx.HTTPStatusError as e:
-                logger.warning(
-                    "HTTP %d: %s (attempt %d/%d)",
-                    e.response.status_code,
-                    url,
-                    attempt + 1,
-                    MAX_RETRIES,
+                    response = await client.get(url)
+                except httpx.RequestError as e:
+                    self._limiter.record_error()
+                    logger.warning(
+                        "Request error: %s for %s (attempt %d/%d)",
+                        str(e),
+                        url,
+                        attempt + 1,
+                        MAX_RETRIES,
+                    )
+                    if attempt == MAX_RETRIES - 1:
+                        raise
+                    continue
+
+                self._limiter.record_response(
+                    response.status_code,
+                    time.monotonic() - started,
+                    _parse_retry_after(response),
                 )
-                if attempt == MAX_RETRIES - 1:
-                    raise
-            except httpx.RequestError as e:
-                logger.warning(
-                    "Request error: %s for %s (attempt %d/%d)",
-                    str(e),
-                    url,
-                    attempt + 1,
-                    MAX_RETRIES,
-                )
-                if attempt == MAX_RETRIES - 1:
-                    raise
+
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    logger.warning(
+                        "HTTP %d: %s (attempt %d/%d)",
+                        e.response.status_code,
+                        url,
+                        attempt + 1,
+                        MAX_RETRIES,
+                    )
+                    if attempt == MAX_RETRIES - 1:
+                        raise
+                    continue
+
+                return response.content
 
         # ここには到達しないはずだが、型安全のため
         msg = f"Failed to fetch {url} after {MAX_RETRIES} retries"
         raise httpx.RequestError(msg)
 
+    async def fetch_pages(
+        self, urls: list[str], page_type: str | None = None
+    ) -> list[str | BaseException]:
+        """
+        複数ページを並列に取得する。
+
+        同時実行数は max_concurrency、リクエスト間隔は共有レートリミッターで制御される。
+        失敗したページは例外オブジェクトとして返し、他のページの取得は継続する。
+
+        Args:
+            urls: 取得するURLのリスト
+            page_type: ページ種別（PAGE_* 定数）
+
+        Returns:
+            urls と同じ順序の HTML 文字列または例外
+        """
+        return await asyncio.gather(
+            *(self.fetch_page(url, page_type) for url in urls), return_exceptions=True
+        )
+
     async def fetch_race_result(self, race_id: str) -> str:
         """レース結果ページのHTMLを取得する"""
         url = f"{NETKEIBA_BASE_URL}/race/{race_id}/"
-        return await self.fetch_page(url)
+        return await self.fetch_page(url, PAGE_RACE_RESULT)
+
+    async def fetch_race_results(self, race_ids: list[str]) -> dict[str, str | BaseException]:
+        """複数レースの結果ページを並列に取得する"""
+        urls = [f"{NETKEIBA_BASE_URL}/race/{race_id}/" for race_id in race_ids]
+        pages = await self.fetch_pages(urls, PAGE_RACE_RESULT)
+        return dict(zip(race_ids, pages, strict=True))
 
     async def fetch_race_list(self, date_str: str) -> str:
         """
@@ -125,10 +189,37 @@ class ScraperClient:
             date_str: "YYYYMMDD" 形式の日付文字列
         """
         url = f"{NETKEIBA_BASE_URL}/?pid=race_list&kaisai_date={date_str}"
-        return await self.fetch_page(url)
+        return await self.fetch_page(url, PAGE_RACE_LIST)
 
     async def fetch_horse_page(self, horse_id: str) -> str:
         """馬のプロフィール（過去成績）ページのHTMLを取得する"""
         # 「戦績」ページには必ず過去のレース結果テーブルが含まれる
         url = f"{NETKEIBA_BASE_URL}/horse/result/{horse_id}/"
-        return await self.fetch_page(url)
+        return await self.fetch_page(url, PAGE_HORSE_RESULT)
+
+
+def decode_html(content: bytes) -> str:
+    """
+    レスポンス本文を文字列にデコードする。
+
+    netkeiba.com は EUC-JP が多いが、ヘッダーに含まれないこともある。
+    まず EUC-JP、失敗したら UTF-8 を試し、それもだめなら置換文字で読めるだけ読む。
+    """
+    try:
+        return content.decode("euc-jp")
+    except UnicodeDecodeError:
+        try:
+            return content.decode("utf-8")
+        except UnicodeDecodeError:
+            return content.decode("euc-jp", errors="replace")
+
+
+def _parse_retry_after(response: httpx.Response) -> float | None:
+    """Retry-After ヘッダー（秒数形式）を読み取る"""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,155 @@
+"""
+HTMLパーサーバックエンド
+
+パーサー (app.scraper.parser) が使う最小限のDOM操作を共通インターフェースにまとめ、
+実装を差し替えられるようにする。
+
+    html.parser  BeautifulSoup + 標準ライブラリ（追加依存なし・最も遅い）
+    lxml         BeautifulSoup + lxml（pip install lxml）
+    selectolax   selectolax の Lexbor エンジン（pip install selectolax・最速）
+
+どのバックエンドでも Parsed* データクラスの出力は同じになる（tests/test_parser.py で検証）。
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from importlib.util import find_spec
+from typing import Any
+
+from bs4 import BeautifulSoup, Tag
+
+from app.core.config import settings
+
+BACKEND_HTML_PARSER = "html.parser"
+BACKEND_LXML = "lxml"
+BACKEND_SELECTOLAX = "selectolax"
+
+
+class Node(ABC):
+    """DOMノードの共通インターフェース"""
+
+    @abstractmethod
+    def select(self, selector: str) -> list["Node"]:
+        """CSSセレクタに一致する子孫ノードをすべて返す"""
+
+    @abstractmethod
+    def select_one(self, selector: str) -> "Node | None":
+        """CSSセレクタに一致する最初の子孫ノードを返す"""
+
+    @abstractmethod
+    def text(self) -> str:
+        """テキストノードをそれぞれ strip して連結した文字列（get_text(strip=True) 相当）"""
+
+    @abstractmethod
+    def full_text(self) -> str:
+        """テキストノードをそのまま連結した文字列（get_text() 相当）"""
+
+    @abstractmethod
+    def attr(self, name: str) -> str | None:
+        """属性値を返す。存在しなければ None"""
+
+
+class SoupNode(Node):
+    """BeautifulSoup のタグをラップするノード"""
+
+    __slots__ = ("_tag",)
+
+    def __init__(self, tag: Tag) -> None:
+        self._tag = tag
+
+    def select(self, selector: str) -> list[Node]:
+        return [SoupNode(t) for t in self._tag.select(selector)]
+
+    def select_one(self, selector: str) -> Node | None:
+        tag = self._tag.select_one(selector)
+        return SoupNode(tag) if tag is not None else None
+
+    def text(self) -> str:
+        return self._tag.get_text(strip=True)
+
+    def full_text(self) -> str:
+        return self._tag.get_text()
+
+    def attr(self, name: str) -> str | None:
+        value = self._tag.get(name)
+        if value is None:
+            return None
+        return " ".join(value) if isinstance(value, list) else str(value)
+
+
+class LexborNode(Node):
+    """selectolax (Lexbor) のノードをラップするノード"""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Any) -> None:
+        self._node = node
+
+    def select(self, selector: str) -> list[Node]:
+        return [LexborNode(n) for n in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> Node | None:
+        node = self._node.css_first(selector)
+        return LexborNode(node) if node is not None else None
+
+    def text(self) -> str:
+        return str(self._node.text(strip=True))
+
+    def full_text(self) -> str:
+        return str(self._node.text())
+
+    def attr(self, name: str) -> str | None:
+        value = self._node.attributes.get(name)
+        return str(value) if value is not None else None
+
+
+def _parse_html_parser(html: str) -> Node:
+    return SoupNode(BeautifulSoup(html, "html.parser"))
+
+
+def _parse_lxml(html: str) -> Node:
+    return SoupNode(BeautifulSoup(html, "lxml"))
+
+
+def _parse_selectolax(html: str) -> Node:
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    return LexborNode(tree.root if tree.root is not None else tree)
+
+
+# バックエンド名 → (パース関数, 必要なモジュール)
+_BACKENDS: dict[str, tuple[Callable[[str], Node], str | None]] = {
+    BACKEND_HTML_PARSER: (_parse_html_parser, None),
+    BACKEND_LXML: (_parse_lxml, "lxml"),
+    BACKEND_SELECTOLAX: (_parse_selectolax, "selectolax"),
+}
+
+
+def available_backends() -> list[str]:
+    """インストール済みで利用可能なバックエンド名を返す"""
+    return [
+        name
+        for name, (_, module) in _BACKENDS.items()
+        if module is None or find_spec(module) is not None
+    ]
+
+
+def parse_document(html: str, backend: str | None = None) -> Node:
+    """
+    HTMLをパースしてルートノードを返す。
+
+    Args:
+        html: ページのHTML文字列
+        backend: バックエンド名（省略時は設定 HTML_PARSER_BACKEND）
+
+    Raises:
+        ValueError: 未知のバックエンド名の場合
+    """
+    name = backend or settings.html_parser_backend
+    try:
+        parse, _ = _BACKENDS[name]
+    except KeyError:
+        msg = f"Unknown HTML parser backend: {name}"
+        raise ValueError(msg) from None
+    return parse(html)
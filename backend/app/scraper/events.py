@@ -0,0 +1,97 @@
+"""
+スクレイプ進捗イベント
+
+ScraperService が発行する進捗（レースの保存・失敗、日付・ジョブの完了）を購読者に配信する。
+SSE エンドポイント (GET /api/scrape/events) がこれを購読してクライアントへ流す。
+
+購読者ごとのキューは上限付きで、溢れたら古いイベントから捨てる。
+発行側は待たされないため、遅いクライアントがスクレイパーを止めることはない。
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from app.scraper import EVENT_QUEUE_SIZE
+
+# イベント種別
+EVENT_RACE_SAVED = "race_saved"
+EVENT_RACE_FAILED = "race_failed"
+EVENT_DATE_FINISHED = "date_finished"
+EVENT_JOB_STARTED = "job_started"
+EVENT_JOB_FINISHED = "job_finished"
+
+
+@dataclass(frozen=True)
+class ScrapeEvent:
+    """進捗イベント1件"""
+
+    type: str
+    job_id: int | None = None
+    race_id: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, default=str)
+
+
+class Subscription:
+    """購読者1人分の上限付きキュー"""
+
+    def __init__(self, maxsize: int, job_id: int | None = None) -> None:
+        self._queue: asyncio.Queue[ScrapeEvent] = asyncio.Queue(maxsize=maxsize)
+        self._job_id = job_id
+        self.dropped = 0  # 溢れて捨てたイベント数（取り出し側で読んだら0に戻す）
+
+    def offer(self, event: ScrapeEvent) -> None:
+        """イベントを入れる。満杯なら最も古いイベントを捨てる（待たない）"""
+        if self._job_id is not None and event.job_id != self._job_id:
+            return
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def get(self) -> ScrapeEvent:
+        return await self._queue.get()
+
+
+class EventBus:
+    """プロセス内の進捗イベント配信"""
+
+    def __init__(self, maxsize: int = EVENT_QUEUE_SIZE) -> None:
+        self._maxsize = maxsize
+        self._subscribers: set[Subscription] = set()
+
+    def subscribe(self, job_id: int | None = None) -> Subscription:
+        """
+        購読を開始する。
+
+        Args:
+            job_id: 指定した場合、そのジョブのイベントだけを受け取る
+        """
+        subscription = Subscription(self._maxsize, job_id)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: ScrapeEvent) -> None:
+        """全購読者にイベントを配る（イベントループ上から呼ぶこと）"""
+        for subscription in self._subscribers:
+            subscription.offer(event)
+
+
+_event_bus: EventBus | None = None
+
+
+def get_event_bus() -> EventBus:
+    """プロセス共有のイベントバスを取得する"""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus()
+    return _event_bus
@@ -0,0 +1,84 @@
+"""
+パース実行環境
+
+BeautifulSoup によるパースは CPU を占有するため、イベントループ上で直接実行すると
+その間すべてのリクエストが待たされる。パース関数をプロセスプール（またはスレッドプール）で
+実行し、非同期に結果を待つ。
+
+パース結果の Parsed* データクラスはモジュールレベルで定義されており、pickle 可能。
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import ParamSpec, TypeVar
+
+from app.core.config import settings
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_executor: Executor | None = None
+
+
+def create_parse_executor(mode: str, workers: int = 0) -> Executor | None:
+    """
+    パース用のエグゼキューターを作成する。
+
+    Args:
+        mode: "process" / "thread" / "inline"
+        workers: ワーカー数（0 ならCPUコア数）
+
+    Returns:
+        エグゼキューター。"inline" の場合は None
+    """
+    max_workers = workers or os.cpu_count() or 1
+    if mode == "process":
+        # aiosqlite 等のスレッドを抱えたまま fork しないよう spawn を使う
+        return ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    if mode == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parse")
+    if mode == "inline":
+        return None
+    msg = f"Unknown parse executor: {mode}"
+    raise ValueError(msg)
+
+
+def get_parse_executor() -> Executor | None:
+    """設定に基づくプロセス共有のエグゼキューターを取得する（遅延初期化）"""
+    global _executor
+    if _executor is None:
+        _executor = create_parse_executor(settings.parse_executor, settings.parse_workers)
+    return _executor
+
+
+def shutdown_parse_executor() -> None:
+    """エグゼキューターを停止する（アプリ終了時に呼ぶ）"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+async def run_parser(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """
+    パース関数をエグゼキューター上で実行し、結果を待つ。
+
+    Args:
+        func: モジュールレベルのパース関数（プロセスプールでは pickle されるため）
+        *args: パース関数の引数
+
+    Returns:
+        パース関数の戻り値
+    """
+    executor = get_parse_executor()
+    if executor is None:
+        return func(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    # functools.partial はモジュールレベル関数であれば pickle 可能
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
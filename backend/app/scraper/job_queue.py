@@ -0,0 +1,131 @@
+"""
+スクレイプジョブキュー
+
+API で登録したジョブを、プロセス内のワーカーがバックグラウンドで実行する。
+HTTPリクエストはジョブIDを返してすぐに終わり、進捗は scrape_jobs 系テーブルから参照する。
+
+ジョブの状態はDBにあるため、起動時に未完了のジョブを積み直して続きから再開する。
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models import ScrapeJob
+from app.scraper.service import ScraperService
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeJobQueue:
+    """ジョブIDのキューと、それを消化するワーカータスク群"""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        workers: int = 1,
+        service_factory: Callable[[AsyncSession], ScraperService] = ScraperService,
+    ) -> None:
+        self._session_factory = session_factory
+        self._workers = max(1, workers)
+        self._service_factory = service_factory
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._tasks: list[asyncio.Task[None]] = []
+        # キュー投入済み・実行中のジョブ（同じジョブを二重に走らせない）
+        self._active: set[int] = set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def submit(self, job_id: int) -> bool:
+        """
+        ジョブをキューに入れる。
+
+        Returns:
+            新たに投入した場合 True（投入済み・実行中なら False）
+        """
+        if job_id in self._active:
+            return False
+        self._active.add(job_id)
+        self._queue.put_nowait(job_id)
+        return True
+
+    async def start(self) -> None:
+        """
+        ワーカーを起動し、未完了のジョブを積み直す
+
+        積み直すのは待機中 (pending) と停止で中断された実行中 (running) のジョブ。
+        失敗 (failed) したジョブは起動のたびに同じ障害を繰り返さないよう自動では積み直さず、
+        同じ期間を再び登録したときに続きから再開する。
+        """
+        if self._tasks:
+            return
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(ScrapeJob.id)
+                .where(ScrapeJob.status.in_(("pending", "running")))
+                .order_by(ScrapeJob.id)
+            )
+            for job_id in result.scalars():
+                self.submit(job_id)
+
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"scrape-worker-{i}")
+            for i in range(self._workers)
+        ]
+        logger.info("Started %d scrape workers", self._workers)
+
+    async def stop(self) -> None:
+        """ワーカーを停止する（実行中のジョブは中断され、次回起動時に再開される）"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def join(self) -> None:
+        """キュー内のジョブがすべて終わるまで待つ"""
+        await self._queue.join()
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Scrape job %d failed", job_id)
+            finally:
+                self._active.discard(job_id)
+                self._queue.task_done()
+
+    async def _run(self, job_id: int) -> None:
+        """ジョブを専用のセッションで実行する"""
+        async with self._session_factory() as session:
+            job = await session.get(ScrapeJob, job_id)
+            if job is None:
+                logger.warning("Scrape job %d not found", job_id)
+                return
+
+            service = self._service_factory(session)
+            try:
+                await service.scrape_range(job.date_from, job.date_to, job_id=job_id)
+            finally:
+                await service.close()
+
+
+_job_queue: ScrapeJobQueue | None = None
+
+
+def get_job_queue() -> ScrapeJobQueue:
+    """プロセス共有のジョブキューを取得する"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = ScrapeJobQueue(async_session, workers=settings.scrape_workers)
+    return _job_queue
@@ -0,0 +1,79 @@
+"""
+スクレイプジョブの永続化
+
+scrape_jobs 系テーブルへのジョブ作成・検索・進捗集計をまとめる。
+ScraperService（実行側）とジョブキュー・API（登録・参照側）で共有する。
+"""
+
+from datetime import date, timedelta
+from typing import cast
+
+from sqlalchemy import Table, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ScrapeJob, ScrapeJobDate, ScrapeJobRace
+
+
+async def find_unfinished_job(
+    session: AsyncSession, kind: str, date_from: date, date_to: date
+) -> ScrapeJob | None:
+    """同じ種別・期間の未完了ジョブ（最新のもの）を返す"""
+    result = await session.execute(
+        select(ScrapeJob)
+        .where(ScrapeJob.kind == kind)
+        .where(ScrapeJob.date_from == date_from)
+        .where(ScrapeJob.date_to == date_to)
+        .where(ScrapeJob.status != "completed")
+        .order_by(ScrapeJob.id.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def create_scrape_job(
+    session: AsyncSession, kind: str, date_from: date, date_to: date
+) -> ScrapeJob:
+    """
+    ジョブを日付ごとの進捗行とともに作成する（コミットは呼び出し側）。
+
+    Args:
+        session: DBセッション
+        kind: ジョブ種別（"date" / "range"）
+        date_from: 開始日
+        date_to: 終了日（この日を含む）
+
+    Returns:
+        作成したジョブ
+    """
+    job = ScrapeJob(kind=kind, date_from=date_from, date_to=date_to)
+    session.add(job)
+    await session.flush()
+
+    days = (date_to - date_from).days + 1
+    if days > 0:
+        await session.execute(
+            insert(cast(Table, ScrapeJobDate.__table__)),
+            [
+                {"job_id": job.id, "date": date_from + timedelta(days=i), "status": "pending"}
+                for i in range(days)
+            ],
+        )
+    return job
+
+
+async def job_progress(session: AsyncSession, job_id: int) -> dict[str, dict[str, int]]:
+    """
+    ジョブの進捗を集計する。
+
+    Returns:
+        {"dates": {ステータス: 件数}, "races": {ステータス: 件数}}
+    """
+    progress: dict[str, dict[str, int]] = {}
+    for key, model in (("dates", ScrapeJobDate), ("races", ScrapeJobRace)):
+        result = await session.execute(
+            select(model.status, func.count())
+            .where(model.job_id == job_id)
+            .group_by(model.status)
+        )
+        progress[key] = {status: count for status, count in result}
+    return progress
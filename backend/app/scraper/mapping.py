@@ -0,0 +1,207 @@
+"""
+パース結果 → DBカラムの変換
+
+パーサーの Parsed* データクラスを各テーブルのカラム辞書に変換する。
+ScraperService（ORM経由の保存）と再パース（一括INSERT）で同じ変換を共有する。
+"""
+
+import re
+from datetime import date, datetime
+from typing import Any
+
+from app.scraper.parser import (
+    ParsedEntryResult,
+    ParsedHorseHistoryEntry,
+    ParsedHorsePage,
+    ParsedRaceInfo,
+)
+
+# 通過順を保存するコーナー数（pass_1〜pass_4。最後のコーナーが常に pass_4）
+CORNER_COUNT = 4
+
+# 着差の言葉 → 馬身
+_MARGIN_WORDS: dict[str, float] = {
+    "同着": 0.0,
+    "ハナ": 0.05,
+    "アタマ": 0.1,
+    "クビ": 0.25,
+    "大": 10.0,  # 大差（10馬身超）
+}
+
+# "1/2" / "1.1/2" / "1 1/2" / "3" / "2.3/4"（整数部と分数の間は "." か空白）
+_MARGIN_LENGTHS_PATTERN = re.compile(r"^(?:(\d+)[.\s]?)?(?:(\d)/(\d))?$")
+
+
+def finish_time_seconds(value: str | None) -> float | None:
+    """走破タイム "1:33.5" / "59.8" を秒に変換する（空・不正なら None）"""
+    if not value:
+        return None
+    minutes, _, seconds = value.strip().rpartition(":")
+    try:
+        return round(int(minutes or 0) * 60 + float(seconds), 1)
+    except ValueError:
+        return None
+
+
+def corner_positions(value: str | None) -> list[int | None]:
+    """
+    通過順 "3-3-2-1" をコーナーごとの順位 [pass_1, pass_2, pass_3, pass_4] に変換する。
+
+    コーナーが4つ未満のレースは後ろ詰め（"5-4" → [None, None, 5, 4]）。
+    数値でない区間を含む通過順は全て None。
+    """
+    tokens = [token.strip() for token in (value or "").split("-") if token.strip()]
+    if not tokens or not all(token.isdigit() for token in tokens):
+        return [None] * CORNER_COUNT
+    positions: list[int | None] = [int(token) for token in tokens[-CORNER_COUNT:]]
+    return [None] * (CORNER_COUNT - len(positions)) + positions
+
+
+def margin_lengths(value: str | None) -> float | None:
+    """
+    着差の表記（"クビ" / "1.1/2" / "1 1/2" / "3" / "大" など）を馬身に変換する。
+
+    レース結果ページの表記（前の馬との差）だけを対象にし、
+    馬の戦績ページの秒差（"0.5" / "-0.3"）や空欄は None を返す。
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value in _MARGIN_WORDS:
+        return _MARGIN_WORDS[value]
+    match = _MARGIN_LENGTHS_PATTERN.match(value)
+    if not match or not any(match.groups()) or ("." in value and "/" not in value):
+        return None
+    whole, numerator, denominator = match.groups()
+    lengths = float(whole or 0)
+    if numerator and denominator:
+        lengths += int(numerator) / int(denominator)
+    return lengths
+
+
+def entry_numeric_values(
+    finish_time: str | None, passing_order: str | None, margin: str | None
+) -> dict[str, Any]:
+    """出走記録の文字列カラムから、集計用の数値カラムを作る"""
+    return {
+        "finish_time_sec": finish_time_seconds(finish_time),
+        **{
+            f"pass_{corner}": position
+            for corner, position in enumerate(corner_positions(passing_order), start=1)
+        },
+        "margin_lengths": margin_lengths(margin),
+    }
+
+
+def parse_date(value: str | None) -> date:
+    """"YYYY-MM-DD" を date に変換する。空なら今日の日付"""
+    return datetime.strptime(value, "%Y-%m-%d").date() if value else date.today()
+
+
+def race_values(info: ParsedRaceInfo) -> dict[str, Any]:
+    """レース結果ページのレース情報 → races カラム"""
+    return {
+        "race_id": info.race_id,
+        "name": info.name,
+        "date": parse_date(info.date),
+        "venue": info.venue,
+        "course_type": info.course_type,
+        "distance": info.distance,
+        "direction": info.direction,
+        "weather": info.weather,
+        "track_condition": info.track_condition,
+        "race_class": info.race_class,
+        "num_entries": info.num_entries,
+    }
+
+
+def stub_race_values(entry: ParsedHorseHistoryEntry) -> dict[str, Any]:
+    """馬の戦績1行 → races カラム（結果ページ未取得のスタブ）"""
+    return {
+        "race_id": entry.race_id,
+        "name": entry.race_name,
+        "date": parse_date(entry.date),
+        "venue": entry.venue,
+        "course_type": entry.course_type,
+        "distance": entry.distance,
+        "track_condition": entry.track_condition,
+        "num_entries": entry.num_entries or 0,  # 不明なら0
+    }
+
+
+def entry_horse_id(entry: ParsedEntryResult) -> str:
+    """出走馬の netkeiba 馬ID（リンクがない場合は馬名から仮IDを作る）"""
+    return entry.horse_id or f"unknown_{entry.horse_name}"
+
+
+def entry_horse_values(entry: ParsedEntryResult) -> dict[str, Any]:
+    """レース結果の出走馬 → horses カラム"""
+    return {
+        "horse_id": entry_horse_id(entry),
+        "name": entry.horse_name,
+        "sex": entry.sex_age[0] if entry.sex_age else None,
+        "trainer": entry.trainer,
+    }
+
+
+def horse_page_values(page: ParsedHorsePage) -> dict[str, Any]:
+    """馬のプロフィールページ → horses カラム"""
+    return {
+        "horse_id": page.horse_id,
+        "name": page.name,
+        "sex": page.sex,
+        "trainer": page.trainer,
+        "sire": page.sire,
+        "dam": page.dam,
+    }
+
+
+def horse_profile_updates(page: ParsedHorsePage) -> dict[str, Any]:
+    """既存の馬に対して、プロフィールページで上書きするカラム"""
+    return {
+        "trainer": page.trainer,
+        "sire": page.sire,
+        "dam": page.dam,
+    }
+
+
+def result_entry_values(entry: ParsedEntryResult) -> dict[str, Any]:
+    """レース結果の1行 → race_entries カラム（race_id / horse_id を除く）"""
+    return {
+        "bracket_number": entry.bracket_number,
+        "horse_number": entry.horse_number,
+        "jockey": entry.jockey,
+        "weight_carried": entry.weight_carried,
+        "odds": entry.odds,
+        "popularity": entry.popularity,
+        "finish_position": entry.finish_position,
+        "finish_time": entry.finish_time,
+        "margin": entry.margin,
+        "passing_order": entry.passing_order,
+        "last_3f": entry.last_3f,
+        "horse_weight": entry.horse_weight,
+        "horse_weight_diff": entry.horse_weight_diff,
+        "status": entry.status,
+        **entry_numeric_values(entry.finish_time, entry.passing_order, entry.margin),
+    }
+
+
+def history_entry_values(entry: ParsedHorseHistoryEntry) -> dict[str, Any]:
+    """馬の戦績1行 → race_entries カラム（race_id / horse_id を除く）"""
+    return {
+        "bracket_number": entry.bracket_number,
+        "horse_number": entry.horse_number,
+        "jockey": entry.jockey,
+        "weight_carried": entry.weight_carried,
+        "odds": entry.odds,
+        "popularity": entry.popularity,
+        "finish_position": entry.finish_position,
+        "finish_time": entry.finish_time,
+        "margin": entry.margin,
+        "passing_order": entry.passing_order,
+        "last_3f": entry.last_3f,
+        "horse_weight": entry.horse_weight,
+        "horse_weight_diff": entry.horse_weight_diff,
+        "status": entry.status,
+        **entry_numeric_values(entry.finish_time, entry.passing_order, entry.margin),
+    }
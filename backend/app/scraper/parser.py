@@ -6,9 +6,11 @@ HTTP通信から分離されており、単体でテスト可能。
 """
 
 import re
+import unicodedata
 from dataclasses import dataclass, field
 
-from bs4 import BeautifulSoup, Tag
+from app.scraper import VENUE_CODE_MAP
+from app.scraper.dom import Node, parse_document
 
 
 @dataclass
@@ -85,6 +87,7 @@ class ParsedHorseHistoryEntry:
     horse_weight: int | None
     horse_weight_diff: int | None
     status: str = "result"
+    num_entries: int | None = None  # 頭数
 
 
 @dataclass
@@ -101,138 +104,156 @@ class ParsedHorsePage:
     history: list[ParsedHorseHistoryEntry] = field(default_factory=list)
 
 
-def parse_race_result_page(html: str, race_id: str) -> ParsedRacePage:
+def parse_race_result_page(
+    html: str, race_id: str, backend: str | None = None
+) -> ParsedRacePage:
     """
     レース結果ページ (db.netkeiba.com/race/XXXX/) をパースする。
 
+    ページ全体ではなく、ヘッダー部分と結果テーブル部分だけを切り出してパースする。
+
     Args:
         html: ページのHTML文字列
         race_id: レースID
+        backend: HTMLパーサーのバックエンド名（省略時は設定値）
 
     Returns:
         ParsedRacePage: パース済みレースデータ
     """
-    soup = BeautifulSoup(html, "html.parser")
+    body_start = _find_body_start(html)
+    table_range = _find_element(html, _RESULT_TABLE_MARKERS, "table", body_start)
+
+    # ヘッダー: レース情報ブロックの先頭から結果テーブルの直前まで
+    header_end = table_range[0] if table_range else len(html)
+    header_start = _find_first_marker(html, _RACE_HEADER_MARKERS, body_start, header_end)
+    header_html = html[header_start if header_start is not None else body_start : header_end]
 
-    race_info = _parse_race_info(soup, race_id)
-    entries = _parse_result_table(soup)
+    race_info = _parse_race_info(parse_document(header_html, backend), race_id)
+
+    entries: list[ParsedEntryResult] = []
+    if table_range:
+        table_html = html[table_range[0] : table_range[1]]
+        entries = _parse_result_table(parse_document(table_html, backend))
     race_info.num_entries = len(entries)
 
     return ParsedRacePage(race_info=race_info, entries=entries)
 
 
-def _parse_race_info(soup: BeautifulSoup, race_id: str) -> ParsedRaceInfo:
-    """レース情報をパースする"""
+# レース情報ブロックの開始位置の目印（最も手前にあるものを採用）
+_RACE_HEADER_MARKERS = (
+    "data_intro",
+    "racedata",
+    "smalltxt",
+    "RaceName",
+    "RaceData01",
+    "race_head",
+)
+_RESULT_TABLE_MARKERS = ("race_table_01", "RaceTable01")
+_HORSE_HISTORY_MARKERS = ("db_h_race_results", "summary=\"全成績\"", "summary='全成績'")
+
+# ヘッダーの各項目を1回の走査で拾うためのパターン
+# course: "芝右2000m", "ダ左1200m", "芝右 外1600m"（間は数字・改行・区切りを含まない数文字まで）
+_RACE_HEADER_PATTERN = re.compile(
+    r"(?P<course>(?P<course_type>芝|ダート|ダ)(?P<course_mid>[^\d\n/]{0,8}?)(?P<distance>\d{3,5})m)"
+    r"|(?:芝|ダート|ダ)\s*[:：]\s*(?P<track>良|稍重|重|不良)"
+    r"|天候\s*[:：]\s*(?P<weather>[^\s/]+)"
+    r"|(?P<year>\d{4})年(?P<month>\d{1,2})月(?P<day>\d{1,2})日"
+)
+_GRADE_PATTERN = re.compile(r"G(?:III|II|I|[123])|オープン|リステッド")
+_GRADE_NORMALIZE = {"GI": "G1", "GII": "G2", "GIII": "G3"}
+
+
+def _find_body_start(html: str) -> int:
+    """<body> の開始位置（なければ先頭）"""
+    index = html.find("<body")
+    return index if index >= 0 else 0
+
+
+def _find_first_marker(
+    html: str, markers: tuple[str, ...], start: int, end: int
+) -> int | None:
+    """目印のうち最も手前にあるものを含むタグの開始位置を返す"""
+    positions = [i for i in (html.find(m, start, end) for m in markers) if i >= 0]
+    if not positions:
+        return None
+    tag_start = html.rfind("<", start, min(positions))
+    return tag_start if tag_start >= 0 else min(positions)
+
+
+def _find_element(
+    html: str, markers: tuple[str, ...], tag: str, start: int
+) -> tuple[int, int] | None:
+    """目印を含む要素の (開始位置, 終了位置) を返す。入れ子の同名タグは考慮しない"""
+    for marker in markers:
+        index = html.find(marker, start)
+        if index < 0:
+            continue
+        tag_start = html.rfind(f"<{tag}", start, index)
+        if tag_start < 0:
+            continue
+        close = html.find(f"</{tag}>", index)
+        tag_end = close + len(f"</{tag}>") if close >= 0 else len(html)
+        return tag_start, tag_end
+    return None
+
+
+def _parse_race_info(header: Node, race_id: str) -> ParsedRaceInfo:
+    """レース情報をパースする（header はレース情報ブロックのみのノード）"""
     # レース名
     name = ""
-    race_name_tag = soup.select_one(".racedata fc .race_title, h1.racedata_title")
+    race_name_tag = header.select_one(".racedata fc .race_title, h1.racedata_title, .racedata h1")
     if race_name_tag is None:
         # 別パターン: race_name クラス
-        race_name_tag = soup.select_one(".racename, .RaceName")
+        race_name_tag = header.select_one(".racename, .RaceName")
     if race_name_tag:
-        name = race_name_tag.get_text(strip=True)
-
-    # レース日付 — race_id から推定
-    # race_id format: YYYYVVKKDDRR (Y=年, V=会場, K=回, D=日, R=レース番号)
-    year = race_id[:4]
-    date_str = f"{year}-01-01"  # デフォルト
-
-    # 日付パース: ページ内の特定クラス、またはヘッダー付近のテキストから探す
-    # 例: "2024年12月22日"
-    date_found = False
-    
-    # 優先セレクタ
-    date_tags = soup.select(".smalltxt, .Race_Date, p.smalltxt, .race_head_inner")
-    for tag in date_tags:
-        text = tag.get_text(strip=True)
-        date_match = re.search(r"(\d{4})年(\d{1,2})月(\d{1,2})日", text)
-        if date_match:
-            y, m, d = date_match.groups()
-            date_str = f"{y}-{int(m):02d}-{int(d):02d}"
-            date_found = True
-            break
-            
-    # タイトル周辺のテキストからも探す（バックアップ）
-    if not date_found:
-        header_text = soup.select_one("div.racedata")
-        if header_text:
-            date_match = re.search(r"(\d{4})年(\d{1,2})月(\d{1,2})日", header_text.get_text())
-            if date_match:
-                y, m, d = date_match.groups()
-                date_str = f"{y}-{int(m):02d}-{int(d):02d}"
+        name = race_name_tag.text()
 
     # 会場 — race_id から取得
+    # race_id format: YYYYVVKKDDRR (Y=年, V=会場, K=回, D=日, R=レース番号)
     venue_code = race_id[4:6]
-    from app.scraper import VENUE_CODE_MAP
-
     venue = VENUE_CODE_MAP.get(venue_code, "不明")
 
+    # コース・天候・馬場・日付を1回の走査で拾う
+    # 優先: コース情報の span（diary_snap_cut / .RaceData01）と日付の行
+    # 見つからない項目があれば、ヘッダー全体のテキストで再走査する
+    fields: dict[str, str] = {}
+    priority_text = " / ".join(
+        tag.text()
+        for tag in header.select("span, .smalltxt, .Race_Date, .race_head_inner")
+    )
+    _scan_race_header(priority_text, fields)
+    if not {"course_type", "track", "weather", "year"} <= fields.keys():
+        _scan_race_header(header.full_text(), fields)
+
+    # 日付（見つからなければ race_id の年から推定）
+    date_str = f"{race_id[:4]}-01-01"
+    if "year" in fields:
+        date_str = f"{fields['year']}-{int(fields['month']):02d}-{int(fields['day']):02d}"
+
     # コース情報（例: "芝右2000m"、"ダ左1200m"、"芝2500m"）
     course_type = "芝"
     distance = 0
     direction = ""
-    weather = ""
-    track_condition = ""
-    race_class = ""
+    if "course_type" in fields:
+        course_type = "ダート" if fields["course_type"] in ("ダ", "ダート") else "芝"
+        distance = int(fields["distance"])
 
-    # レース詳細情報のパース
-    # diary_snap_cut span: 通常の結果ページ
-    # .RaceData01 span: 一部のページ
-    race_data_spans = soup.select("diary_snap_cut span, .RaceData01 span, span, .racedata")
-    
-    # 全テキストを結合して検索するアプローチも試す（構造が崩れている場合用）
-    full_header_text = ""
-    if race_data_spans:
-        full_header_text = " ".join([s.get_text(strip=True) for s in race_data_spans])
-
-    # 距離・コース種別
-    # "芝2500m", "ダート1800m", "芝右 外1600m" などに対応
-    course_match = re.search(r"(芝|ダート|ダ)(?:[^0-9m]*?)(\d{3,5})m", full_header_text)
-    if not course_match:
-        # 個別のspanからも再トライ
-        for span in race_data_spans:
-            text = span.get_text(strip=True)
-            m = re.search(r"(芝|ダート|ダ)(?:[^0-9m]*?)(\d{3,5})m", text)
-            if m:
-                course_match = m
-                break
-    
-    if course_match:
-        ct = course_match.group(1)
-        course_type = "ダート" if ct in ("ダ", "ダート") else "芝"
-        distance = int(course_match.group(2))
-        
         # 方向 ("右", "左", "直線")
-        if "右" in full_header_text:
-            direction = "右"
-        elif "左" in full_header_text:
-            direction = "左"
-        elif "直線" in full_header_text:
-            direction = "直線"
-
-    # 天候
-    if "天候" in full_header_text:
-        weather_match = re.search(r"天候\s*[:：]\s*(\S+)", full_header_text)
-        if weather_match:
-            weather = weather_match.group(1)
-    
-    # 馬場状態
-    if "芝" in full_header_text or "ダート" in full_header_text:
-        condition_match = re.search(r"(芝|ダート|ダ)\s*[:：]\s*(良|稍重|重|不良)", full_header_text)
-        if condition_match:
-            track_condition = condition_match.group(2)
+        for candidate in ("右", "左", "直線"):
+            if candidate in fields["course_mid"]:
+                direction = candidate
+                break
 
     # レースクラス（グレード）
-    class_tag = soup.select_one(".racedata .grade, .Icon_GradeType, span.GradeIcon")
+    race_class = ""
+    class_tag = header.select_one(".racedata .grade, .Icon_GradeType, span.GradeIcon")
     if class_tag:
-        race_class = class_tag.get_text(strip=True)
+        race_class = class_tag.text()
     else:
-        # テキストからクラスを推定
-        full_text = soup.get_text()
-        for grade in ["G1", "G2", "G3", "GI", "GII", "GIII", "オープン", "リステッド"]:
-            if grade in full_text:
-                race_class = grade.replace("GI", "G1").replace("GII", "G2").replace("GIII", "G3")
-                break
+        # レース名・条件のテキストからクラスを推定
+        grade_match = _GRADE_PATTERN.search(header.full_text())
+        if grade_match:
+            race_class = _GRADE_NORMALIZE.get(grade_match.group(0), grade_match.group(0))
 
     return ParsedRaceInfo(
         race_id=race_id,
@@ -242,14 +263,130 @@ def _parse_race_info(soup: BeautifulSoup, race_id: str) -> ParsedRaceInfo:
         course_type=course_type,
         distance=distance,
         direction=direction,
-        weather=weather,
-        track_condition=track_condition,
+        weather=fields.get("weather", ""),
+        track_condition=fields.get("track", ""),
         race_class=race_class,
         num_entries=0,
     )
 
 
-def _parse_result_table(soup: BeautifulSoup) -> list[ParsedEntryResult]:
+def _scan_race_header(text: str, fields: dict[str, str]) -> None:
+    """ヘッダーのテキストを走査し、未取得の項目を fields に埋める（最初の一致を優先）"""
+    for match in _RACE_HEADER_PATTERN.finditer(text):
+        if match.group("course") and "course_type" not in fields:
+            fields["course_type"] = match.group("course_type")
+            fields["course_mid"] = match.group("course_mid")
+            fields["distance"] = match.group("distance")
+        elif match.group("track") and "track" not in fields:
+            fields["track"] = match.group("track")
+        elif match.group("weather") and "weather" not in fields:
+            fields["weather"] = match.group("weather")
+        elif match.group("year") and "year" not in fields:
+            fields["year"] = match.group("year")
+            fields["month"] = match.group("month")
+            fields["day"] = match.group("day")
+
+
+# 結果テーブルの列名（NFKC正規化・空白除去後）→ フィールド名
+_RESULT_COLUMN_ALIASES: dict[str, tuple[str, ...]] = {
+    "finish_position": ("着順",),
+    "bracket_number": ("枠番", "枠"),
+    "horse_number": ("馬番",),
+    "horse_name": ("馬名",),
+    "sex_age": ("性齢",),
+    "weight_carried": ("斤量",),
+    "jockey": ("騎手",),
+    "finish_time": ("タイム",),
+    "margin": ("着差",),
+    "passing_order": ("通過", "コーナー通過順"),
+    "last_3f": ("上り", "上がり", "後3F"),
+    "odds": ("単勝", "オッズ", "単勝オッズ"),
+    "popularity": ("人気",),
+    "horse_weight": ("馬体重", "馬体重(増減)"),
+    "trainer": ("調教師", "厩舎"),
+}
+
+# ヘッダー行がない場合の列配置
+_RESULT_DEFAULT_COLUMNS: dict[str, int] = {
+    "finish_position": 0,
+    "bracket_number": 1,
+    "horse_number": 2,
+    "horse_name": 3,
+    "sex_age": 4,
+    "weight_carried": 5,
+    "jockey": 6,
+    "finish_time": 7,
+    "margin": 8,
+    "passing_order": 9,
+    "last_3f": 10,
+    "horse_weight": 11,
+    "odds": 12,
+    "popularity": 13,
+    "trainer": 14,
+}
+
+_HORSE_ID_PATTERN = re.compile(r"/horse/(\w+)")
+_RACE_ID_LINK_PATTERN = re.compile(r"/race/(\d+)")
+_HORSE_WEIGHT_PATTERN = re.compile(r"(\d{3,4})\(([+-]?\d+)\)")
+_HISTORY_DISTANCE_PATTERN = re.compile(r"(芝|ダ|障)(\d+)")
+
+
+def _build_column_map(
+    table: Node, aliases: dict[str, tuple[str, ...]], default: dict[str, int]
+) -> dict[str, int]:
+    """
+    テーブルの th 見出しを1回だけ読み、フィールド名 → 列インデックスの対応を作る。
+
+    見出しが1つもない場合は default の列配置を使う。
+    見出しにないフィールドは対応に含めない（値は None になる）。
+    """
+    headers = [_normalize_header(th.text()) for th in table.select("th")]
+    if not headers:
+        return dict(default)
+
+    positions = {header: i for i, header in reversed(list(enumerate(headers)))}
+    columns: dict[str, int] = {}
+    for field_name, names in aliases.items():
+        for name in names:
+            if name in positions:
+                columns[field_name] = positions[name]
+                break
+    return columns
+
+
+def _normalize_header(text: str) -> str:
+    """見出しの表記ゆれ（半角カナ・全角英数・空白）をならす"""
+    return "".join(unicodedata.normalize("NFKC", text).split())
+
+
+def _cell_text(cells: list[Node], columns: dict[str, int], field_name: str) -> str:
+    """列対応から該当セルのテキストを返す（列がなければ空文字）"""
+    index = columns.get(field_name)
+    if index is None or index >= len(cells):
+        return ""
+    return cells[index].text()
+
+
+def _parse_status(text: str) -> tuple[str, int | None]:
+    """着順セルから (ステータス, 着順) を返す"""
+    if "取" in text:
+        return "scratched", None
+    if "除" in text:
+        return "excluded", None
+    if "中" in text:
+        return "dnf", None
+    return "result", _safe_int(text)
+
+
+def _parse_horse_weight(text: str) -> tuple[int | None, int | None]:
+    """馬体重セル「468(-4)」→ (468, -4)。計不などは (None, None)"""
+    match = _HORSE_WEIGHT_PATTERN.match(text)
+    if match is None:
+        return None, None
+    return int(match.group(1)), int(match.group(2))
+
+
+def _parse_result_table(soup: Node) -> list[ParsedEntryResult]:
     """結果テーブル (result_table) をパースする"""
     entries: list[ParsedEntryResult] = []
 
@@ -258,147 +395,65 @@ def _parse_result_table(soup: BeautifulSoup) -> list[ParsedEntryResult]:
     if table is None:
         return entries
 
-    rows = table.select("tr")[1:]  # ヘッダー行をスキップ
-    for row in rows:
-        entry = _parse_result_row(row)
+    columns = _build_column_map(table, _RESULT_COLUMN_ALIASES, _RESULT_DEFAULT_COLUMNS)
+    for row in table.select("tr"):
+        entry = _parse_result_row(row.select("td"), columns)
         if entry:
             entries.append(entry)
 
     return entries
 
 
-def _parse_result_row(row: Tag) -> ParsedEntryResult | None:
-    """結果テーブルの1行をパースする"""
-    cells = row.select("td")
+def _parse_result_row(cells: list[Node], columns: dict[str, int]) -> ParsedEntryResult | None:
+    """結果テーブルの1行をパースする（ヘッダー行など td が足りない行は None）"""
     if len(cells) < 10:
         return None
 
-    try:
-        # 着順とステータス
-        finish_pos_text = cells[0].get_text(strip=True)
-        status = "result"
-        finish_position = None
-        
-        if "取" in finish_pos_text:
-            status = "scratched"
-        elif "除" in finish_pos_text:
-            status = "excluded"
-        elif "中" in finish_pos_text:
-            status = "dnf"
-        else:
-            finish_position = _safe_int(finish_pos_text)
-
-        # 枠番
-        bracket_number = _safe_int(cells[1].get_text(strip=True))
-
-        # 馬番
-        horse_number_val = _safe_int(cells[2].get_text(strip=True))
-        if horse_number_val is None:
-            return None
-
-        # 馬名・馬ID
-        horse_link = cells[3].select_one("a")
-        horse_name = cells[3].get_text(strip=True)
-        horse_id = ""
-        if horse_link and horse_link.get("href"):
-            href = str(horse_link["href"])
+    # 着順とステータス
+    status, finish_position = _parse_status(_cell_text(cells, columns, "finish_position"))
+
+    # 馬番
+    horse_number_val = _safe_int(_cell_text(cells, columns, "horse_number"))
+    if horse_number_val is None:
+        return None
+
+    # 馬名・馬ID
+    horse_id = ""
+    horse_name = ""
+    name_index = columns.get("horse_name")
+    if name_index is not None and name_index < len(cells):
+        horse_name = cells[name_index].text()
+        horse_link = cells[name_index].select_one("a")
+        if horse_link:
             # /horse/XXXXXXXXXXX/ から馬IDを抽出
-            id_match = re.search(r"/horse/(\w+)", href)
+            id_match = _HORSE_ID_PATTERN.search(horse_link.attr("href") or "")
             if id_match:
                 horse_id = id_match.group(1)
 
-        # 性齢
-        sex_age = cells[4].get_text(strip=True) if len(cells) > 4 else None
-
-        # 斤量
-        weight_carried = _safe_float(cells[5].get_text(strip=True)) if len(cells) > 5 else None
-
-        # 騎手
-        jockey = cells[6].get_text(strip=True) if len(cells) > 6 else None
-
-        # タイム
-        finish_time = cells[7].get_text(strip=True) if len(cells) > 7 else None
-        if finish_time == "":
-            finish_time = None
-
-        # 着差
-        margin = cells[8].get_text(strip=True) if len(cells) > 8 else None
-        if margin == "":
-            margin = None
-
-        # 通過順 (9列目あたり、ページにより位置が変わることがある)
-        passing_order = None
-        last_3f = None
-        horse_weight_val = None
-        horse_weight_diff_val = None
-        odds = None
-        popularity = None
-        trainer = None
-
-        # 残りのカラムを柔軟にパース
-        for i in range(9, len(cells)):
-            text = cells[i].get_text(strip=True)
-
-            # 通過順パターン: "3-3-2-1"
-            if re.match(r"^\d+-\d+(-\d+)*$", text):
-                passing_order = text
-                continue
-
-            # 上がり3F: "33.8" のような小数
-            if passing_order and last_3f is None:
-                f_val = _safe_float(text)
-                if f_val and 25.0 < f_val < 50.0:
-                    last_3f = f_val
-                    continue
-
-            # 馬体重パターン: "468(-4)" or "468(+4)"
-            weight_match = re.match(r"(\d{3,4})\(([+-]?\d+)\)", text)
-            if weight_match:
-                horse_weight_val = int(weight_match.group(1))
-                horse_weight_diff_val = int(weight_match.group(2))
-                continue
-
-            # オッズ: 小数点1桁の数値
-            if odds is None:
-                odds_val = _safe_float(text)
-                if odds_val and odds_val > 1.0:
-                    odds = odds_val
-                    continue
-
-            # 人気: 1桁〜2桁の整数
-            if popularity is None and text.isdigit() and 1 <= int(text) <= 30:
-                popularity = int(text)
-                continue
-
-            # 調教師
-            trainer_link = cells[i].select_one("a")
-            if trainer_link and "/trainer/" in str(trainer_link.get("href", "")):
-                trainer = text
-                continue
-
-        return ParsedEntryResult(
-            horse_id=horse_id,
-            horse_name=horse_name,
-            bracket_number=bracket_number,
-            horse_number=horse_number_val,
-            jockey=jockey or "",
-            weight_carried=weight_carried,
-            odds=odds,
-            popularity=popularity,
-            finish_position=finish_position,
-            finish_time=finish_time,
-            margin=margin,
-            passing_order=passing_order,
-            last_3f=last_3f,
-            horse_weight=horse_weight_val,
-            horse_weight_diff=horse_weight_diff_val,
-            sex_age=sex_age,
-            trainer=trainer,
-            status=status,
-        )
+    horse_weight_val, horse_weight_diff_val = _parse_horse_weight(
+        _cell_text(cells, columns, "horse_weight")
+    )
 
-    except (ValueError, IndexError):
-        return None
+    return ParsedEntryResult(
+        horse_id=horse_id,
+        horse_name=horse_name,
+        bracket_number=_safe_int(_cell_text(cells, columns, "bracket_number")),
+        horse_number=horse_number_val,
+        jockey=_cell_text(cells, columns, "jockey"),
+        weight_carried=_safe_float(_cell_text(cells, columns, "weight_carried")),
+        odds=_safe_float(_cell_text(cells, columns, "odds")),
+        popularity=_safe_int(_cell_text(cells, columns, "popularity")),
+        finish_position=finish_position,
+        finish_time=_cell_text(cells, columns, "finish_time") or None,
+        margin=_cell_text(cells, columns, "margin") or None,
+        passing_order=_cell_text(cells, columns, "passing_order") or None,
+        last_3f=_safe_float(_cell_text(cells, columns, "last_3f")),
+        horse_weight=horse_weight_val,
+        horse_weight_diff=horse_weight_diff_val,
+        sex_age=_cell_text(cells, columns, "sex_age") or None,
+        trainer=_cell_text(cells, columns, "trainer") or None,
+        status=status,
+    )
 
 
 def _safe_int(text: str) -> int | None:
@@ -417,7 +472,7 @@ def _safe_float(text: str) -> float | None:
         return None
 
 
-def parse_race_list_page(html: str) -> list[str]:
+def parse_race_list_page(html: str, backend: str | None = None) -> list[str]:
     """
     レース一覧ページからレースIDのリストを取得する。
 
@@ -425,17 +480,18 @@ def parse_race_list_page(html: str) -> list[str]:
 
     Args:
         html: ページのHTML文字列
+        backend: HTMLパーサーのバックエンド名（省略時は設定値）
 
     Returns:
         レースIDのリスト
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_document(html, backend)
     race_ids: list[str] = []
 
     # レースへのリンクを検索
     links = soup.select("a[href*='/race/']")
     for link in links:
-        href = str(link.get("href", ""))
+        href = link.attr("href") or ""
         # /race/202506010101/ のようなパターン
         match = re.search(r"/race/(\d{12})", href)
         if match:
@@ -446,24 +502,139 @@ def parse_race_list_page(html: str) -> list[str]:
     return race_ids
 
 
-def parse_horse_page(html: str, horse_id: str) -> ParsedHorsePage:
+# 戦績テーブルの列名（NFKC正規化・空白除去後）→ フィールド名
+_HISTORY_COLUMN_ALIASES: dict[str, tuple[str, ...]] = {
+    "date": ("日付",),
+    "venue": ("開催",),
+    "race_name": ("レース名",),
+    "bracket_number": ("枠番",),
+    "horse_number": ("馬番",),
+    "odds": ("オッズ", "単勝"),
+    "popularity": ("人気",),
+    "finish_position": ("着順",),
+    "num_entries": ("頭数",),
+    "jockey": ("騎手",),
+    "weight_carried": ("斤量",),
+    "distance": ("距離",),
+    "track_condition": ("馬場",),
+    "finish_time": ("タイム",),
+    "margin": ("着差",),
+    "passing_order": ("通過",),
+    "last_3f": ("上り", "上がり"),
+    "horse_weight": ("馬体重",),
+}
+
+# ヘッダー行がない場合の列配置
+_HISTORY_DEFAULT_COLUMNS: dict[str, int] = {
+    "date": 0,
+    "venue": 1,
+    "race_name": 4,
+    "bracket_number": 6,
+    "horse_number": 7,
+    "odds": 8,
+    "popularity": 9,
+    "finish_position": 10,
+    "num_entries": 11,
+    "jockey": 12,
+    "weight_carried": 13,
+    "distance": 14,
+    "track_condition": 16,
+    "finish_time": 18,
+    "margin": 19,
+    "passing_order": 21,
+    "last_3f": 23,
+    "horse_weight": 24,
+}
+
+
+def _parse_history_row(
+    cells: list[Node], columns: dict[str, int]
+) -> ParsedHorseHistoryEntry | None:
+    """戦績テーブルの1行をパースする（レースへのリンクがない行は None）"""
+    if len(cells) < 10:
+        return None
+
+    # レースID（レース名セルのリンク）
+    name_index = columns.get("race_name")
+    if name_index is None or name_index >= len(cells):
+        return None
+    race_link = cells[name_index].select_one("a")
+    if not race_link:
+        return None
+    rid_match = _RACE_ID_LINK_PATTERN.search(race_link.attr("href") or "")
+    if not rid_match:
+        return None
+
+    status, rank = _parse_status(_cell_text(cells, columns, "finish_position"))
+
+    dist_match = _HISTORY_DISTANCE_PATTERN.search(_cell_text(cells, columns, "distance"))
+    c_type = "芝"
+    dist_val = 0
+    if dist_match:
+        c_type = "ダート" if dist_match.group(1) == "ダ" else "芝"
+        dist_val = int(dist_match.group(2))
+
+    hw, hw_diff = _parse_horse_weight(_cell_text(cells, columns, "horse_weight"))
+
+    return ParsedHorseHistoryEntry(
+        race_id=rid_match.group(1),
+        date=_cell_text(cells, columns, "date").replace("/", "-"),
+        venue=_cell_text(cells, columns, "venue"),
+        race_name=cells[name_index].text(),
+        horse_number=_safe_int(_cell_text(cells, columns, "horse_number")) or 0,
+        bracket_number=_safe_int(_cell_text(cells, columns, "bracket_number")),
+        odds=_safe_float(_cell_text(cells, columns, "odds")),
+        popularity=_safe_int(_cell_text(cells, columns, "popularity")),
+        finish_position=rank,
+        jockey=_cell_text(cells, columns, "jockey"),
+        weight_carried=_safe_float(_cell_text(cells, columns, "weight_carried")),
+        distance=dist_val,
+        course_type=c_type,
+        track_condition=_cell_text(cells, columns, "track_condition"),
+        finish_time=_cell_text(cells, columns, "finish_time"),
+        margin=_cell_text(cells, columns, "margin"),
+        passing_order=_cell_text(cells, columns, "passing_order"),
+        last_3f=_safe_float(_cell_text(cells, columns, "last_3f")),
+        horse_weight=hw,
+        horse_weight_diff=hw_diff,
+        status=status,
+        num_entries=_safe_int(_cell_text(cells, columns, "num_entries")),
+    )
+
+
+def parse_horse_page(html: str, horse_id: str, backend: str | None = None) -> ParsedHorsePage:
     """
     馬のプロフィールページ (db.netkeiba.com/horse/XXXX/) をパースする。
+
+    戦績テーブルが見つかれば、プロフィール部分（テーブルより前）と
+    戦績テーブル部分だけを切り出してパースする。
     """
-    soup = BeautifulSoup(html, "html.parser")
+    # db.netkeiba.com の馬ページは .db_h_race_results または table[summary="全成績"]
+    body_start = _find_body_start(html)
+    table_range = _find_element(html, _HORSE_HISTORY_MARKERS, "table", body_start)
+
+    history_table: Node | None
+    if table_range:
+        soup = parse_document(html[body_start : table_range[0]], backend)
+        history_table = parse_document(
+            html[table_range[0] : table_range[1]], backend
+        ).select_one("table")
+    else:
+        soup = parse_document(html, backend)
+        history_table = None
 
     # 基本情報
     name = ""
     name_tag = soup.select_one(".horse_title h1")
     if name_tag:
-        name = name_tag.get_text(strip=True)
+        name = name_tag.text()
 
     # プロフィール詳細
     txt_txt = soup.select_one(".db_prof_area_02 .txt_01")
     sex = None
     age = None
     if txt_txt:
-        text = txt_txt.get_text(strip=True)
+        text = txt_txt.text()
         # "牡3歳 鹿毛"
         m = re.match(r"(牡|牝|セ)(\d+)歳", text)
         if m:
@@ -473,7 +644,7 @@ def parse_horse_page(html: str, horse_id: str) -> ParsedHorsePage:
     trainer = ""
     trainer_link = soup.select_one("a[href*='/trainer/']")
     if trainer_link:
-        trainer = trainer_link.get_text(strip=True).replace("(", "").replace(")", "")
+        trainer = trainer_link.text().replace("(", "").replace(")", "")
 
     # 血統
     sire = ""
@@ -482,121 +653,26 @@ def parse_horse_page(html: str, horse_id: str) -> ParsedHorsePage:
     if blood_table:
         blood_links = blood_table.select("a")
         if len(blood_links) >= 2:
-            sire = blood_links[0].get_text(strip=True)
-            dam = blood_links[1].get_text(strip=True)
+            sire = blood_links[0].text()
+            dam = blood_links[1].text()
 
     # 過去成績
     history: list[ParsedHorseHistoryEntry] = []
-    # db.netkeiba.com の馬ページは .db_h_race_results または table[summary="全成績"]
-    # 複数のセレクタでテーブルを探す
-    history_table = (
-        soup.select_one("table.db_h_race_results") or 
-        soup.find("table", class_="db_h_race_results") or
-        soup.select_one("table[summary='全成績']")
-    )
-    
-    # 見つからない場合は、最も列数（td）が多いテーブルを探す
+
+    # 目印が見つからない場合は、最も列数（td）が多いテーブルを探す
     if not history_table:
-        tables = soup.find_all("table")
+        tables = soup.select("table")
         if tables:
-            history_table = max(tables, key=lambda t: len(t.find_all("td")))
+            history_table = max(tables, key=lambda t: len(t.select("td")))
 
     if history_table:
-        rows = history_table.find_all("tr")
-        for row in rows:
-            cells = row.find_all("td")
-            if len(cells) < 10: # 大幅に緩和
-                continue
-            
-            try:
-                # レースID (通常 4番目のセルにある a タグ)
-                race_link = cells[4].select_one("a")
-                if not race_link: continue
-                rid_match = re.search(r"/race/(\d+)", race_link.get("href", ""))
-                if not rid_match: continue
-                race_id = rid_match.group(1)
-
-                date_str = cells[0].get_text(strip=True).replace("/", "-")
-                venue = cells[1].get_text(strip=True)
-                race_name = cells[4].get_text(strip=True)
-                
-                # 枠番 (6) / 馬番 (7) / 人気 (9) / 着順 (10)
-                bracket_number = _safe_int(cells[6].get_text(strip=True))
-                horse_number = _safe_int(cells[7].get_text(strip=True)) or 0
-                
-                odds = _safe_float(cells[9].get_text(strip=True))
-                pop = _safe_int(cells[8].get_text(strip=True)) # 人気とオッズが逆転している場合があるが、大体このあたり
-                
-                rank_text = cells[10].get_text(strip=True)
-                status = "result"
-                rank = None
-                if "取" in rank_text:
-                    status = "scratched"
-                elif "除" in rank_text:
-                    status = "excluded"
-                elif "中" in rank_text:
-                    status = "dnf"
-                else:
-                    rank = _safe_int(rank_text)
-                jockey = cells[12].get_text(strip=True)
-                weight = _safe_float(cells[13].get_text(strip=True))
-                
-                dist_text = cells[14].get_text(strip=True) # "芝2500"
-                dist_match = re.search(r"(芝|ダ|障)(\d+)", dist_text)
-                c_type = "芝"
-                dist_val = 0
-                if dist_match:
-                    c_type = "ダート" if dist_match.group(1) == "ダ" else "芝"
-                    dist_val = int(dist_match.group(2))
-                
-                track = cells[16].get_text(strip=True)
-                f_time = cells[18].get_text(strip=True)
-                margin = cells[19].get_text(strip=True)
-                
-                # 通過順は 21番目あたりにあることが多いが、可変なため探索
-                passing = ""
-                for idx in [21, 20, 22]:
-                    if idx < len(cells):
-                        val = cells[idx].get_text(strip=True)
-                        if re.match(r"^\d+-\d+", val):
-                            passing = val
-                            break
-                
-                last3f = _safe_float(cells[23].get_text(strip=True))
-                
-                hw_text = cells[24].get_text(strip=True) # "504(+2)"
-                hw_match = re.match(r"(\d+)\((.+)\)", hw_text)
-                hw = None
-                hw_diff = None
-                if hw_match:
-                    hw = int(hw_match.group(1))
-                    hw_diff = int(hw_match.group(2))
-
-                history.append(ParsedHorseHistoryEntry(
-                    race_id=race_id,
-                    date=date_str,
-                    venue=venue,
-                    race_name=race_name,
-                    horse_number=horse_number,
-                    bracket_number=bracket_number,
-                    odds=odds,
-                    popularity=pop,
-                    finish_position=rank,
-                    jockey=jockey,
-                    weight_carried=weight,
-                    distance=dist_val,
-                    course_type=c_type,
-                    track_condition=track,
-                    finish_time=f_time,
-                    margin=margin,
-                    passing_order=passing,
-                    last_3f=last3f,
-                    horse_weight=hw,
-                    horse_weight_diff=hw_diff,
-                    status=status,
-                ))
-            except Exception:
-                continue
+        columns = _build_column_map(
+            history_table, _HISTORY_COLUMN_ALIASES, _HISTORY_DEFAULT_COLUMNS
+        )
+        for row in history_table.select("tr"):
+            h_entry = _parse_history_row(row.select("td"), columns)
+            if h_entry:
+                history.append(h_entry)
 
     return ParsedHorsePage(
         horse_id=horse_id,
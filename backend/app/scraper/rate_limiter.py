@@ -0,0 +1,157 @@
+"""
+レート制限
+
+netkeiba.com へのリクエスト間隔を制御するトークンバケット。
+プロセス内の全 ScraperClient で1つのバケットを共有し、
+並列取得時も平均リクエストレートを REQUEST_DELAY_MIN/MAX 相当に保つ。
+
+429 / 5xx やレイテンシの悪化を検知すると自動的にレートを下げ、
+正常なレスポンスが続けば元のレートまで徐々に戻す。
+"""
+
+import asyncio
+import threading
+import time
+
+from app.scraper import (
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_LATENCY_FACTOR,
+    RATE_LIMIT_MIN_RATE,
+    REQUEST_DELAY_MAX,
+    REQUEST_DELAY_MIN,
+)
+
+# レート調整の係数
+_BACKOFF_FACTOR = 0.5  # 429 / 5xx / 通信エラー時の減速率
+_LATENCY_BACKOFF_FACTOR = 0.8  # レイテンシ悪化時の減速率
+_RECOVERY_STEP = 0.1  # 正常時に最大レートの何割ずつ戻すか
+_LATENCY_EWMA_ALPHA = 0.2  # レイテンシ平滑化係数
+_BASELINE_DRIFT = 0.01  # 基準レイテンシが上方向に追従する速さ
+
+
+class RateLimiter:
+    """適応型トークンバケット"""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = RATE_LIMIT_BURST,
+        min_rate: float = RATE_LIMIT_MIN_RATE,
+    ) -> None:
+        """
+        Args:
+            rate: 平常時のレート（リクエスト/秒）
+            burst: バケット容量
+            min_rate: 減速時の下限レート
+        """
+        self._max_rate = rate
+        self._min_rate = min(min_rate, rate)
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._latency_ewma: float | None = None
+        self._latency_baseline: float | None = None
+        # 複数のイベントループ・スレッドから使われても整合性を保つ
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """現在のレート（リクエスト/秒）"""
+        return self._rate
+
+    def _refill(self, now: float) -> None:
+        """経過時間分のトークンを補充する（ロック取得済みで呼ぶこと）"""
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        トークンを1つ予約し、発行までの待機秒数を返す。
+
+        トークンが不足している場合は負債として積み上げるため、
+        同時に呼ばれた場合も順番に間隔が空く。
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    async def acquire(self) -> None:
+        """トークンが発行されるまで待機する"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """指定秒数の間、新しいトークンを発行しない"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, -seconds * self._rate)
+
+    def record_response(
+        self, status_code: int, latency: float, retry_after: float | None = None
+    ) -> None:
+        """
+        レスポンス結果をフィードバックしてレートを調整する。
+
+        Args:
+            status_code: HTTPステータスコード
+            latency: レスポンスまでの秒数
+            retry_after: Retry-After ヘッダーの秒数（あれば）
+        """
+        if status_code == 429 or status_code >= 500:
+            self._slow_down(_BACKOFF_FACTOR)
+            self.pause(retry_after if retry_after is not None else 1.0 / self._rate)
+            return
+
+        with self._lock:
+            if self._latency_ewma is None:
+                self._latency_ewma = latency
+            else:
+                self._latency_ewma += _LATENCY_EWMA_ALPHA * (latency - self._latency_ewma)
+
+            if self._latency_baseline is None or self._latency_ewma < self._latency_baseline:
+                self._latency_baseline = self._latency_ewma
+            else:
+                self._latency_baseline += _BASELINE_DRIFT * (
+                    self._latency_ewma - self._latency_baseline
+                )
+            degraded = self._latency_ewma > self._latency_baseline * RATE_LIMIT_LATENCY_FACTOR
+
+        if degraded:
+            self._slow_down(_LATENCY_BACKOFF_FACTOR)
+        else:
+            self._speed_up()
+
+    def record_error(self) -> None:
+        """通信エラー（タイムアウト等）をフィードバックする"""
+        self._slow_down(_BACKOFF_FACTOR)
+
+    def _slow_down(self, factor: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = max(self._min_rate, self._rate * factor)
+
+    def _speed_up(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = min(self._max_rate, self._rate + self._max_rate * _RECOVERY_STEP)
+
+
+# 平均待機時間 (MIN + MAX) / 2 に相当するレート
+DEFAULT_RATE = 2.0 / (REQUEST_DELAY_MIN + REQUEST_DELAY_MAX)
+
+_shared_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """プロセス全体で共有するレートリミッターを取得する"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        _shared_limiter = RateLimiter(DEFAULT_RATE)
+    return _shared_limiter
@@ -0,0 +1,130 @@
+"""
+馬の過去成績の再取得キュー
+
+分析APIは手元のデータですぐに応答し、過去成績が古い馬（horses.last_scraped_at が
+HORSE_HISTORY_TTL_HOURS より前、または未取得）をこのキューに積む。
+プロセス内のワーカーがバックグラウンドで馬のページを取得し、出走記録と集計成績を更新する。
+
+キューはメモリ上にだけ持つ。再起動で失われても、次に分析されたときに積み直される。
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models import Horse
+from app.scraper.service import ScraperService
+
+logger = logging.getLogger(__name__)
+
+
+def history_is_stale(last_scraped_at: datetime | None, now: datetime | None = None) -> bool:
+    """過去成績を再取得すべきか（未取得、または鮮度の期限切れ）"""
+    if last_scraped_at is None:
+        return True
+    now = now or datetime.now()
+    return now - last_scraped_at >= timedelta(hours=settings.horse_history_ttl_hours)
+
+
+class HorseRefreshQueue:
+    """馬IDのキューと、それを消化するワーカータスク群"""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        workers: int = 1,
+        service_factory: Callable[[AsyncSession], ScraperService] = ScraperService,
+    ) -> None:
+        self._session_factory = session_factory
+        self._workers = max(1, workers)
+        self._service_factory = service_factory
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._tasks: list[asyncio.Task[None]] = []
+        # キュー投入済み・実行中の馬（同じ馬を二重に取得しない）
+        self._active: set[str] = set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def submit(self, horse_id: str) -> bool:
+        """
+        馬の再取得をキューに入れる。
+
+        Args:
+            horse_id: netkeiba の馬ID
+
+        Returns:
+            新たに投入した場合 True（投入済み・実行中なら False）
+        """
+        if horse_id in self._active:
+            return False
+        self._active.add(horse_id)
+        self._queue.put_nowait(horse_id)
+        return True
+
+    async def start(self) -> None:
+        """ワーカーを起動する"""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"horse-refresh-worker-{i}")
+            for i in range(self._workers)
+        ]
+        logger.info("Started %d horse refresh workers", self._workers)
+
+    async def stop(self) -> None:
+        """ワーカーを停止する（キューに残った馬は次に分析されたときに積み直される）"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def join(self) -> None:
+        """キュー内の馬がすべて終わるまで待つ"""
+        await self._queue.join()
+
+    async def _worker(self) -> None:
+        while True:
+            horse_id = await self._queue.get()
+            try:
+                await self._run(horse_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to refresh horse history for %s", horse_id)
+            finally:
+                self._active.discard(horse_id)
+                self._queue.task_done()
+
+    async def _run(self, horse_id: str) -> None:
+        """馬の過去成績を専用のセッションで取得する（待っている間に更新済みなら何もしない）"""
+        async with self._session_factory() as session:
+            last_scraped_at = await session.scalar(
+                select(Horse.last_scraped_at).where(Horse.horse_id == horse_id)
+            )
+            if not history_is_stale(last_scraped_at):
+                return
+
+            service = self._service_factory(session)
+            try:
+                await service.scrape_horse_history(horse_id)
+            finally:
+                await service.close()
+
+
+_refresh_queue: HorseRefreshQueue | None = None
+
+
+def get_horse_refresh_queue() -> HorseRefreshQueue:
+    """プロセス共有の再取得キューを取得する"""
+    global _refresh_queue
+    if _refresh_queue is None:
+        _refresh_queue = HorseRefreshQueue(async_session)
+    return _refresh_queue
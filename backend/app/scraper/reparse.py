@@ -0,0 +1,403 @@
+"""
+アーカイブからのDB再構築
+
+HTMLアーカイブ (data/raw) に保存済みのページを全コアで並列に再パースし、
+新しい SQLite ファイルに一括で書き込む。完成後にアトミックに差し替える。
+
+パーサーを修正した際に、過去データへ反映するために使う。
+ネットワークには一切アクセスしない。
+
+アーカイブにない情報は差し替え前のDBから引き継ぐ（スクレイプジョブ・開催カレンダー・
+馬の最終取得日時・data_version）。集計成績とレース詳細の文書は新しいDBの内容から作り直す。
+差し替え前のDBにアーカイブにないレースがある場合は、force を指定しない限り差し替えない。
+"""
+
+import asyncio
+import logging
+import os
+import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+from sqlalchemy import Connection, Table, bindparam, create_engine, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.migrations import run_migrations
+from app.models import Base, Horse, Race, RaceEntry
+from app.predictor.analysis import refresh_horse_stats
+from app.read_models.race_documents import refresh_race_documents
+from app.scraper import PAGE_HORSE_RESULT, PAGE_RACE_RESULT
+from app.scraper.archive import RawPageArchive, is_final_page
+from app.scraper.client import decode_html
+from app.scraper.mapping import (
+    entry_horse_id,
+    entry_horse_values,
+    history_entry_values,
+    horse_page_values,
+    horse_profile_updates,
+    race_values,
+    result_entry_values,
+    stub_race_values,
+)
+from app.scraper.parser import (
+    ParsedHorsePage,
+    ParsedRacePage,
+    parse_horse_page,
+    parse_race_result_page,
+)
+
+logger = logging.getLogger(__name__)
+
+# 1回の executemany でまとめて書き込むページ数
+WRITE_BATCH_PAGES = 500
+
+# ワーカーへ一度に渡すページ数（プロセス間通信の回数を減らす）
+PARSE_CHUNK_SIZE = 64
+
+# 集計成績・レース詳細の文書を1回に作り直す件数
+READ_MODEL_BATCH = 500
+
+# 差し替え前のDBからそのまま引き継ぐテーブル（アーカイブからは作れない）
+CARRIED_TABLES = ("scrape_jobs", "scrape_job_dates", "scrape_job_races", "race_calendar")
+
+_SQLITE_HEADER = b"SQLite format 3\x00"
+
+_RACE_URL_PATTERN = re.compile(r"/race/(\d{12})")
+_HORSE_URL_PATTERN = re.compile(r"/horse/result/(\w+)")
+
+# ワーカープロセスに渡す作業単位: (アーカイブルート, ページ種別, 本文ハッシュ, ID)
+_ParseTask = tuple[str, str, str, str]
+
+
+class MissingRacesError(RuntimeError):
+    """差し替え前のDBに、アーカイブから作れないレースがある"""
+
+    def __init__(self, race_ids: list[str]) -> None:
+        self.race_ids = race_ids
+        sample = ", ".join(race_ids[:5])
+        super().__init__(f"{len(race_ids)} races are not in the archive (e.g. {sample})")
+
+
+@dataclass
+class RebuildStats:
+    """再構築結果のサマリー"""
+
+    race_pages: int = 0
+    horse_pages: int = 0
+    failed_pages: int = 0  # パースに失敗した・結果の掲載前に取得したページ
+    races: int = 0
+    horses: int = 0
+    entries: int = 0
+    carried_rows: int = 0  # 差し替え前のDBから引き継いだ行
+
+
+def _parse_archived(task: _ParseTask) -> ParsedRacePage | ParsedHorsePage | None:
+    """アーカイブ済みページを読み込んでパースする（ワーカープロセスで実行）"""
+    root, page_type, sha256, key = task
+    try:
+        content = RawPageArchive(root).read_object(sha256)
+        if not is_final_page(page_type, content):
+            # 結果の掲載前に取得したページからは、出走記録のないレースしか作れない
+            logger.info("Skipping archived page without results: %s (%s)", key, sha256)
+            return None
+        html = decode_html(content)
+        if page_type == PAGE_RACE_RESULT:
+            return parse_race_result_page(html, key)
+        return parse_horse_page(html, key)
+    except Exception:
+        logger.exception("Failed to parse archived page %s (%s)", key, sha256)
+        return None
+
+
+def _iter_tasks(archive: RawPageArchive, page_type: str) -> Iterator[_ParseTask]:
+    """アーカイブの参照からパース作業を列挙する"""
+    pattern = _RACE_URL_PATTERN if page_type == PAGE_RACE_RESULT else _HORSE_URL_PATTERN
+    for page in archive.iter_pages(page_type):
+        match = pattern.search(page.url)
+        if match:
+            yield (str(archive.root), page_type, page.sha256, match.group(1))
+
+
+class _BulkWriter:
+    """
+    主キーをメモリ上で採番し、executemany でまとめて書き込むライター。
+
+    SELECT で ID を引き直す往復をなくすため、netkeiba の ID → 主キーの対応を保持する。
+    """
+
+    def __init__(self, conn: Connection, stats: RebuildStats) -> None:
+        self._conn = conn
+        self._stats = stats
+        self._race_pks: dict[str, int] = {}
+        self._horse_pks: dict[str, int] = {}
+        self._entry_keys: set[tuple[int, int]] = set()
+        self._races: list[dict[str, Any]] = []
+        self._horses: list[dict[str, Any]] = []
+        self._horse_updates: list[dict[str, Any]] = []
+        self._entries: list[dict[str, Any]] = []
+
+    def _add_race(self, values: dict[str, Any]) -> int:
+        pk = len(self._race_pks) + 1
+        self._race_pks[values["race_id"]] = pk
+        self._races.append({"id": pk, **values})
+        return pk
+
+    def _add_horse(self, values: dict[str, Any]) -> int:
+        pk = len(self._horse_pks) + 1
+        self._horse_pks[values["horse_id"]] = pk
+        self._horses.append({"id": pk, **values})
+        return pk
+
+    def _add_entry(self, race_pk: int, horse_pk: int, values: dict[str, Any]) -> None:
+        if (race_pk, horse_pk) in self._entry_keys:
+            return
+        self._entry_keys.add((race_pk, horse_pk))
+        self._entries.append({"race_id": race_pk, "horse_id": horse_pk, **values})
+
+    def add_race_page(self, parsed: ParsedRacePage) -> None:
+        """レース結果ページ1件分の行を追加する"""
+        if parsed.race_info.race_id in self._race_pks:
+            return
+        race_pk = self._add_race(race_values(parsed.race_info))
+
+        for entry in parsed.entries:
+            horse_pk = self._horse_pks.get(entry_horse_id(entry))
+            if horse_pk is None:
+                horse_pk = self._add_horse(entry_horse_values(entry))
+            self._add_entry(race_pk, horse_pk, result_entry_values(entry))
+
+    def add_horse_page(self, parsed: ParsedHorsePage) -> None:
+        """馬の戦績ページ1件分の行を追加する"""
+        horse_pk = self._horse_pks.get(parsed.horse_id)
+        if horse_pk is None:
+            horse_pk = self._add_horse(horse_page_values(parsed))
+        else:
+            self._horse_updates.append({"_id": horse_pk, **horse_profile_updates(parsed)})
+
+        for h_entry in parsed.history:
+            race_pk = self._race_pks.get(h_entry.race_id)
+            if race_pk is None:
+                race_pk = self._add_race(stub_race_values(h_entry))
+            self._add_entry(race_pk, horse_pk, history_entry_values(h_entry))
+
+    def flush(self) -> None:
+        """溜まった行を書き込む"""
+        if self._races:
+            self._conn.execute(insert(cast(Table, Race.__table__)), self._races)
+            self._stats.races += len(self._races)
+        if self._horses:
+            self._conn.execute(insert(cast(Table, Horse.__table__)), self._horses)
+            self._stats.horses += len(self._horses)
+        if self._horse_updates:
+            table = cast(Table, Horse.__table__)
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("_id"))
+                .values(
+                    trainer=bindparam("trainer"),
+                    sire=bindparam("sire"),
+                    dam=bindparam("dam"),
+                )
+            )
+            self._conn.execute(stmt, self._horse_updates)
+        if self._entries:
+            self._conn.execute(insert(cast(Table, RaceEntry.__table__)), self._entries)
+            self._stats.entries += len(self._entries)
+
+        self._races.clear()
+        self._horses.clear()
+        self._horse_updates.clear()
+        self._entries.clear()
+
+
+def _is_sqlite_database(path: Path) -> bool:
+    """SQLite のDBファイルか（ヘッダーで判定する）"""
+    try:
+        with path.open("rb") as f:
+            return f.read(len(_SQLITE_HEADER)) == _SQLITE_HEADER
+    except FileNotFoundError:
+        return False
+
+
+def _columns(conn: Connection, schema: str, table: str) -> list[str]:
+    return [row[1] for row in conn.exec_driver_sql(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _carry_over(conn: Connection, live_path: Path, force: bool) -> int:
+    """
+    差し替え前のDB (live_path) から、アーカイブにない情報を新しいDBに引き継ぐ
+
+    Args:
+        conn: 新しいDBへの接続（書き込み前に呼ぶ。ATTACH はトランザクション内で使えない）
+        live_path: 差し替え前のDB
+        force: アーカイブにないレースがあっても続けるか
+
+    Returns:
+        引き継いだ行数
+
+    Raises:
+        MissingRacesError: アーカイブにないレースがあり、force でない場合
+    """
+    conn.exec_driver_sql("ATTACH DATABASE ? AS live", (str(live_path),))
+    try:
+        live_tables = set(
+            conn.exec_driver_sql("SELECT name FROM live.sqlite_master WHERE type='table'").scalars()
+        )
+        if "races" in live_tables:
+            missing = list(
+                conn.exec_driver_sql(
+                    "SELECT race_id FROM live.races "
+                    "WHERE race_id NOT IN (SELECT race_id FROM main.races) ORDER BY race_id"
+                ).scalars()
+            )
+            if missing and not force:
+                raise MissingRacesError(missing)
+            if missing:
+                logger.warning("Dropping %d races that are not in the archive", len(missing))
+
+        carried = 0
+        for table in CARRIED_TABLES:
+            if table not in live_tables:
+                continue
+            live_columns = set(_columns(conn, "live", table))
+            columns = ", ".join(c for c in _columns(conn, "main", table) if c in live_columns)
+            result = conn.exec_driver_sql(
+                f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM live.{table}"
+            )
+            carried += result.rowcount
+
+        # 馬の最終取得日時（古い順に戦績を再取得する判定に使う）と、races / horses の
+        # data_version を引き継ぐ。内容が変わりうるので版は1つ進め、ETag を必ず変える
+        for table, key in (("horses", "horse_id"), ("races", "race_id")):
+            if table not in live_tables:
+                continue
+            live_columns = set(_columns(conn, "live", table))
+            assignments: list[str] = []
+            if table == "horses" and "last_scraped_at" in live_columns:
+                assignments.append("last_scraped_at = live_row.last_scraped_at")
+            if "data_version" in live_columns:
+                assignments.append("data_version = live_row.data_version + 1")
+            if not assignments:
+                continue
+            result = conn.exec_driver_sql(
+                f"UPDATE main.{table} SET {', '.join(assignments)} "
+                f"FROM live.{table} AS live_row WHERE live_row.{key} = main.{table}.{key}"
+            )
+            carried += result.rowcount
+        conn.commit()
+        return carried
+    finally:
+        conn.exec_driver_sql("DETACH DATABASE live")
+
+
+async def _rebuild_read_models(path: Path) -> None:
+    """新しいDBの内容から、集計成績とレース詳細の文書を作る"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        async with AsyncSession(engine) as session:
+            horse_ids = list(await session.scalars(select(Horse.id).order_by(Horse.id)))
+            for start in range(0, len(horse_ids), READ_MODEL_BATCH):
+                await refresh_horse_stats(session, horse_ids[start : start + READ_MODEL_BATCH])
+            race_pks = list(await session.scalars(select(Race.id).order_by(Race.id)))
+            for start in range(0, len(race_pks), READ_MODEL_BATCH):
+                await refresh_race_documents(session, race_pks[start : start + READ_MODEL_BATCH])
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+
+def rebuild_database(
+    archive: RawPageArchive,
+    output_path: str | Path,
+    workers: int | None = None,
+    force: bool = False,
+) -> RebuildStats:
+    """
+    アーカイブから新しいDBファイルを構築し、output_path にアトミックに差し替える。
+
+    レース結果ページ → 馬の戦績ページの順に処理するため、
+    戦績ページ由来のスタブよりもレース結果ページの情報が優先される。
+    output_path に既存のDBがあれば、アーカイブにない情報を引き継いでから差し替える。
+
+    Args:
+        archive: 読み込むHTMLアーカイブ
+        output_path: 差し替え先の SQLite ファイルパス
+        workers: パースに使うプロセス数（省略時はCPUコア数）
+        force: 既存のDBにアーカイブにないレースがあっても差し替える（それらのレースは失われる）
+
+    Returns:
+        再構築結果のサマリー
+
+    Raises:
+        MissingRacesError: 既存のDBにアーカイブにないレースがあり、force でない場合
+            （既存のDBはそのまま残る）
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".rebuild")
+    tmp_path.unlink(missing_ok=True)
+
+    stats = RebuildStats()
+    engine = create_engine(f"sqlite:///{tmp_path}")
+    try:
+        with engine.begin() as conn:
+            # 差し替え前の一時ファイルなので、耐久性より書き込み速度を優先する
+            conn.exec_driver_sql("PRAGMA journal_mode=OFF")
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            Base.metadata.create_all(conn)
+            # create_all で最新のスキーマになっているので、バージョンを記録する
+            run_migrations(conn)
+
+            writer = _BulkWriter(conn, stats)
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                for page_type in (PAGE_RACE_RESULT, PAGE_HORSE_RESULT):
+                    pending = 0
+                    results = pool.map(
+                        _parse_archived,
+                        _iter_tasks(archive, page_type),
+                        chunksize=PARSE_CHUNK_SIZE,
+                    )
+                    for parsed in results:
+                        if isinstance(parsed, ParsedRacePage):
+                            writer.add_race_page(parsed)
+                            stats.race_pages += 1
+                        elif isinstance(parsed, ParsedHorsePage):
+                            writer.add_horse_page(parsed)
+                            stats.horse_pages += 1
+                        else:
+                            stats.failed_pages += 1
+                            continue
+
+                        pending += 1
+                        if pending >= WRITE_BATCH_PAGES:
+                            writer.flush()
+                            pending = 0
+                    writer.flush()
+
+        if _is_sqlite_database(output_path):
+            with engine.connect() as conn:
+                stats.carried_rows = _carry_over(conn, output_path, force)
+        engine.dispose()
+        asyncio.run(_rebuild_read_models(tmp_path))
+    except BaseException:
+        engine.dispose()
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    # 旧DBのジャーナル・WALが新しいファイルに適用されないよう先に削除してから差し替える
+    for suffix in ("-journal", "-wal", "-shm"):
+        output_path.with_name(output_path.name + suffix).unlink(missing_ok=True)
+    os.replace(tmp_path, output_path)
+
+    logger.info(
+        "Rebuilt %s: %d races, %d horses, %d entries (%d failed pages)",
+        output_path,
+        stats.races,
+        stats.horses,
+        stats.entries,
+        stats.failed_pages,
+    )
+    return stats
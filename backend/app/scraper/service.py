@@ -5,15 +5,60 @@ HTTPクライアント、HTMLパーサー、DB保存を統合する。
 外部公開されるメインインターフェース。
 """
 
+import asyncio
 import logging
-from datetime import date, datetime
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, cast
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Table, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Horse, Race, RaceEntry
+from app.models import (
+    Horse,
+    Race,
+    RaceCalendar,
+    RaceEntry,
+    ScrapeJob,
+    ScrapeJobDate,
+    ScrapeJobRace,
+)
+from app.predictor.analysis import refresh_horse_stats
+from app.read_models.race_documents import refresh_race_documents
+from app.scraper import CALENDAR_EMPTY_TTL, SCRAPE_COMMIT_BATCH
 from app.scraper.client import ScraperClient
-from app.scraper.parser import ParsedRacePage, parse_race_list_page, parse_race_result_page
+from app.scraper.events import (
+    EVENT_DATE_FINISHED,
+    EVENT_JOB_FINISHED,
+    EVENT_JOB_STARTED,
+    EVENT_RACE_FAILED,
+    EVENT_RACE_SAVED,
+    EventBus,
+    ScrapeEvent,
+    get_event_bus,
+)
+from app.scraper.executor import run_parser
+from app.scraper.jobs import create_scrape_job, find_unfinished_job
+from app.scraper.mapping import (
+    entry_horse_id,
+    entry_horse_values,
+    history_entry_values,
+    horse_page_values,
+    horse_profile_updates,
+    race_values,
+    result_entry_values,
+    stub_race_values,
+)
+from app.scraper.parser import (
+    ParsedEntryResult,
+    ParsedHorseHistoryEntry,
+    ParsedRacePage,
+    parse_horse_page,
+    parse_race_list_page,
+    parse_race_result_page,
+)
+from app.scraper.singleflight import SingleFlight, get_single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +66,20 @@ logger = logging.getLogger(__name__)
 class ScraperService:
     """レースデータの収集・保存サービス"""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        events: EventBus | None = None,
+        single_flight: SingleFlight | None = None,
+    ) -> None:
         self._session = session
         self._client = ScraperClient()
+        self._events = events or get_event_bus()
+        self._single_flight = single_flight or get_single_flight()
+        # 出走記録を追加し、集計成績 (horse_stats) の更新が必要な馬の主キー
+        self._stale_stats: set[int] = set()
+        # 内容が変わり、文書 (race_documents) の作り直しが必要なレースの主キー
+        self._stale_races: set[int] = set()
 
     async def close(self) -> None:
         """クライアントをクリーンアップ"""
@@ -33,6 +89,8 @@ class ScraperService:
         """
         指定日の全レースデータを収集・保存する。
 
+        結果ページの取得・パースは並列に行い、完了したものから単一のライターが保存する。
+
         Args:
             target_date: "YYYYMMDD" 形式の日付文字列
 
@@ -42,67 +100,384 @@ class ScraperService:
         logger.info("Scraping races for date: %s", target_date)
 
         # 1. レースID一覧を取得
-        list_html = await self._client.fetch_race_list(target_date)
-        race_ids = parse_race_list_page(list_html)
+        race_ids = await self._list_race_ids(datetime.strptime(target_date, "%Y%m%d").date())
 
         if not race_ids:
             logger.info("No races found for date: %s", target_date)
-            return {"total": 0, "new": 0, "skipped": 0, "errors": 0, "race_ids": []}
+            await self._session.commit()
+            return {
+                "total": 0,
+                "new": 0,
+                "skipped": 0,
+                "errors": 0,
+                "race_ids": [],
+                "failed_race_ids": [],
+            }
 
         logger.info("Found %d races for %s", len(race_ids), target_date)
+        return await self._scrape_races(race_ids)
 
-        new_count = 0
-        skipped_count = 0
-        error_count = 0
-        saved_ids: list[str] = []
+    async def scrape_range(
+        self, date_from: date, date_to: date, job_id: int | None = None
+    ) -> ScrapeJob:
+        """
+        期間内の全レースデータを収集・保存する（バックフィル）。
 
-        # 2. 各レースの詳細を取得
-        for race_id in race_ids:
-            try:
-                # 既存チェック
-                existing = await self._session.execute(
-                    select(Race).where(Race.race_id == race_id)
-                )
-                if existing.scalar_one_or_none() is not None:
-                    logger.debug("Race %s already exists, skipping", race_id)
-                    skipped_count += 1
-                    continue
-
-                # レース結果をスクレイプ
-                result_html = await self._client.fetch_race_result(race_id)
-                parsed = parse_race_result_page(result_html, race_id)
-
-                # DBに保存
-                await self._save_race(parsed)
-                new_count += 1
-                saved_ids.append(race_id)
-                logger.info("Saved race: %s (%s)", race_id, parsed.race_info.name)
-
-            except Exception:
-                error_count += 1
-                logger.exception("Error scraping race %s", race_id)
-                continue
+        進捗は日付ごと・レースごとに scrape_jobs 系テーブルへ記録する。
+        同じ期間の未完了ジョブがあれば、完了済みの日付・レースを飛ばして続きから再開する。
+        開催のない日は開催カレンダーのキャッシュで判定し、一覧ページを再取得しない。
+
+        Args:
+            date_from: 開始日
+            date_to: 終了日（この日を含む）
+            job_id: 再開するジョブのID（省略時は同じ期間の未完了ジョブ、なければ新規作成）
+
+        Returns:
+            ジョブ
+        """
+        job = await self._open_range_job(date_from, date_to, job_id)
+        job_id = job.id
+        job.status = "running"
+        job.error = None
+        await self._session.commit()
+        logger.info("Backfill job %d: %s .. %s", job.id, job.date_from, job.date_to)
+        self._publish(EVENT_JOB_STARTED, job.id, date_from=job.date_from, date_to=job.date_to)
+
+        result = await self._session.execute(
+            select(ScrapeJobDate)
+            .where(ScrapeJobDate.job_id == job.id)
+            .where(ScrapeJobDate.status.in_(("pending", "failed")))
+            .order_by(ScrapeJobDate.date)
+        )
+        try:
+            for job_date in result.scalars().all():
+                await self._scrape_job_date(job, job_date)
+        except asyncio.CancelledError:
+            # 停止による中断は失敗にしない。running のまま残し、次回起動時にキューが再開する
+            logger.info("Backfill job %d interrupted", job_id)
+            raise
+        except BaseException as e:
+            await self._session.rollback()
+            job.status = "failed"
+            job.error = repr(e)
+            await self._session.commit()
+            self._publish(EVENT_JOB_FINISHED, job_id, status=job.status, error=job.error)
+            raise
+
+        # 失敗した日付が残っていれば未完了とし、次回の実行で再開する
+        failed_dates = await self._session.scalar(
+            select(func.count())
+            .select_from(ScrapeJobDate)
+            .where(ScrapeJobDate.job_id == job.id)
+            .where(ScrapeJobDate.status == "failed")
+        )
+        if failed_dates:
+            job.status = "failed"
+            job.error = f"{failed_dates} dates failed"
+        else:
+            job.status = "completed"
+        await self._session.commit()
+        self._publish(EVENT_JOB_FINISHED, job.id, status=job.status, error=job.error)
+        return job
+
+    async def _open_range_job(
+        self, date_from: date, date_to: date, job_id: int | None
+    ) -> ScrapeJob:
+        """再開するジョブを取得する。なければ日付ごとの進捗行とともに作成する"""
+        if job_id is not None:
+            job = await self._session.get(ScrapeJob, job_id)
+            if job is None:
+                msg = f"Scrape job not found: {job_id}"
+                raise ValueError(msg)
+            return job
+
+        job = await find_unfinished_job(self._session, "range", date_from, date_to)
+        if job is None:
+            job = await create_scrape_job(self._session, "range", date_from, date_to)
+        return job
+
+    async def _scrape_job_date(self, job: ScrapeJob, job_date: ScrapeJobDate) -> None:
+        """ジョブの1日分を収集し、日付の進捗を更新する"""
+        try:
+            race_ids = await self._list_race_ids(job_date.date)
+        except Exception:
+            logger.exception("Error listing races for %s", job_date.date)
+            job_date.status = "failed"
+            await self._session.commit()
+            self._publish(EVENT_DATE_FINISHED, job.id, date=job_date.date, status="failed")
+            return
+
+        job_date.race_count = len(race_ids)
+        if not race_ids:
+            job_date.status = "no_races"
+            await self._session.commit()
+            self._publish(EVENT_DATE_FINISHED, job.id, date=job_date.date, status="no_races")
+            return
+
+        await self._session.execute(
+            sqlite_insert(cast(Table, ScrapeJobRace.__table__)).on_conflict_do_nothing(
+                index_elements=["job_id", "race_id"]
+            ),
+            [
+                {"job_id": job.id, "race_id": race_id, "date": job_date.date, "status": "pending"}
+                for race_id in race_ids
+            ],
+        )
+        summary = await self._scrape_races(race_ids, job_id=job.id)
 
+        job_date.status = "failed" if summary["errors"] else "done"
         await self._session.commit()
+        self._publish(
+            EVENT_DATE_FINISHED,
+            job.id,
+            date=job_date.date,
+            status=job_date.status,
+            new=summary["new"],
+            skipped=summary["skipped"],
+            errors=summary["errors"],
+        )
+        logger.info(
+            "Backfill job %d: %s done (%s new, %s skipped, %s errors)",
+            job.id,
+            job_date.date,
+            summary["new"],
+            summary["skipped"],
+            summary["errors"],
+        )
+
+    async def _list_race_ids(self, day: date) -> list[str]:
+        """
+        指定日のレースID一覧を返す。
+
+        開催カレンダーにあればそれを使い、なければレース一覧ページを取得する。
+        結果が確定している過去の日付だけをカレンダーに記録する（コミットは呼び出し側）。
+        空の一覧は障害ページから作られた可能性があるため、CALENDAR_EMPTY_TTL を過ぎたら取り直す。
+        """
+        cached = await self._session.get(RaceCalendar, day)
+        if cached is not None and (
+            cached.race_ids
+            or datetime.now() - cached.fetched_at < timedelta(seconds=CALENDAR_EMPTY_TTL)
+        ):
+            return cached.race_id_list
+
+        await self._release_connection()
+        list_html = await self._client.fetch_race_list(day.strftime("%Y%m%d"))
+        race_ids: list[str] = await run_parser(parse_race_list_page, list_html)
+        if day < date.today():
+            if cached is None:
+                self._session.add(RaceCalendar(date=day, race_ids=",".join(race_ids)))
+            else:
+                cached.race_ids = ",".join(race_ids)
+                cached.fetched_at = datetime.now()
+        return race_ids
+
+    async def _scrape_races(
+        self, race_ids: list[str], job_id: int | None = None
+    ) -> dict[str, int | list[str]]:
+        """
+        レースID一覧のうち未取得のレースを収集・保存する。
+
+        Args:
+            race_ids: netkeiba のレースID一覧
+            job_id: 進捗を記録するジョブのID（省略時は記録しない）
+
+        Returns:
+            収集結果のサマリー
+        """
+        # 未取得のレースを抽出（1回の IN クエリ）
+        existing = await self._session.execute(
+            select(Race.race_id).where(Race.race_id.in_(race_ids))
+        )
+        existing_ids = set(existing.scalars())
+        pending_ids = [race_id for race_id in race_ids if race_id not in existing_ids]
+        if job_id is not None and existing_ids:
+            await self._session.execute(
+                update(ScrapeJobRace)
+                .where(ScrapeJobRace.job_id == job_id)
+                .where(ScrapeJobRace.race_id.in_(existing_ids))
+                .where(ScrapeJobRace.status != "saved")
+                .values(status="skipped", error=None)
+            )
+        await self._release_connection()
+
+        # 取得・パースを並列に走らせ、完了順にキューへ流す
+        # （同時接続数とレート制限はクライアントの共有トークンバケットで担保）
+        queue: asyncio.Queue[tuple[str, ParsedRacePage | Exception]] = asyncio.Queue()
+        producers = [
+            asyncio.create_task(self._fetch_and_parse(race_id, queue)) for race_id in pending_ids
+        ]
+
+        # 単一のライターがキューから取り出してDBに保存する
+        try:
+            saved, failed = await self._write_races(queue, len(pending_ids), job_id)
+        finally:
+            for task in producers:
+                task.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
 
         return {
             "total": len(race_ids),
-            "new": new_count,
-            "skipped": skipped_count,
-            "errors": error_count,
-            "race_ids": saved_ids,
+            "new": len(saved),
+            "skipped": len(existing_ids),
+            "errors": len(failed),
+            "race_ids": [race_id for race_id in pending_ids if race_id in saved],
+            "failed_race_ids": [race_id for race_id in pending_ids if race_id in failed],
         }
 
+    async def _fetch_and_parse(
+        self,
+        race_id: str,
+        queue: "asyncio.Queue[tuple[str, ParsedRacePage | Exception]]",
+    ) -> None:
+        """レース結果ページを取得・パースし、結果（または例外）をキューに入れる"""
+        item: ParsedRacePage | Exception
+        try:
+            result_html = await self._client.fetch_race_result(race_id)
+            item = await run_parser(parse_race_result_page, result_html, race_id)
+        except Exception as e:
+            item = e
+        await queue.put((race_id, item))
+
+    async def _write_races(
+        self,
+        queue: "asyncio.Queue[tuple[str, ParsedRacePage | Exception]]",
+        count: int,
+        job_id: int | None = None,
+    ) -> tuple[set[str], set[str]]:
+        """
+        キューからパース済みレースを取り出して保存する（セッションを使うのはここだけ）。
+
+        レースごとにセーブポイントを切るため、1レースの失敗は他のレースに影響しない。
+        SCRAPE_COMMIT_BATCH 件ごとにコミットする。キューが空で次の結果をネットワーク待ちに
+        なるときは、それまでの分をコミットして書き込み用の接続を返してから待つ。
+        ジョブの進捗はレースの保存と同じトランザクションで更新する。
+
+        Args:
+            queue: (レースID, パース結果または例外) のキュー
+            count: 取り出す件数
+            job_id: 進捗を記録するジョブのID
+
+        Returns:
+            (保存したレースID, 失敗したレースID)
+        """
+        saved: set[str] = set()
+        failed: set[str] = set()
+        # 保存イベントはコミットしてから配信する
+        uncommitted: list[ScrapeEvent] = []
+        started = time.monotonic()
+
+        for _ in range(count):
+            if queue.empty() and self._session.in_transaction():
+                await self._commit_and_publish(uncommitted)
+            race_id, item = await queue.get()
+            if isinstance(item, Exception):
+                failed.add(race_id)
+                logger.error("Error scraping race %s: %s", race_id, item)
+                await self._record_race_progress(job_id, race_id, "failed", repr(item))
+                self._publish(EVENT_RACE_FAILED, job_id, race_id, error=str(item))
+                continue
+
+            try:
+                async with self._session.begin_nested():
+                    race, horse_pks = await self._save_race(item)
+                    await self._record_race_progress(job_id, race_id, "saved")
+            except Exception as e:
+                failed.add(race_id)
+                logger.exception("Error saving race %s", race_id)
+                await self._record_race_progress(job_id, race_id, "failed", repr(e))
+                self._publish(EVENT_RACE_FAILED, job_id, race_id, error=str(e))
+                continue
+
+            saved.add(race_id)
+            self._stale_stats.update(horse_pks)
+            self._stale_races.add(race.id)
+            logger.info("Saved race: %s (%s)", race_id, item.race_info.name)
+            elapsed = time.monotonic() - started
+            uncommitted.append(
+                ScrapeEvent(
+                    EVENT_RACE_SAVED,
+                    job_id,
+                    race_id,
+                    {
+                        "name": item.race_info.name,
+                        "saved": len(saved),
+                        "races_per_min": round(len(saved) * 60 / elapsed, 1) if elapsed else None,
+                    },
+                )
+            )
+            if len(uncommitted) >= SCRAPE_COMMIT_BATCH:
+                await self._commit_and_publish(uncommitted)
+
+        await self._commit_and_publish(uncommitted)
+        return saved, failed
+
+    async def _commit_and_publish(self, events: list[ScrapeEvent]) -> None:
+        """コミットしてから、溜めておいたイベントを配信する"""
+        await self._refresh_read_models()
+        await self._session.commit()
+        for event in events:
+            self._events.publish(event)
+        events.clear()
+
+    async def _release_connection(self) -> None:
+        """
+        ネットワーク待ちの前にトランザクションを終えて、書き込み用の接続をプールに返す。
+
+        書き込み用エンジンの接続は1本なので、取得を待つ間も握っていると
+        他の書き込み（ジョブの登録など）がプールの待ちで止まる。
+        """
+        if self._session.in_transaction():
+            await self._session.commit()
+
+    async def _refresh_read_models(self) -> None:
+        """
+        出走記録を追加した馬の集計成績と、内容が変わったレースの文書を作り直す
+        （コミットと同じトランザクションで行う）
+        """
+        if self._stale_stats:
+            await refresh_horse_stats(self._session, self._stale_stats)
+            self._stale_stats.clear()
+        if self._stale_races:
+            await refresh_race_documents(self._session, self._stale_races)
+            self._stale_races.clear()
+
+    def _publish(
+        self, event_type: str, job_id: int | None, race_id: str | None = None, **data: Any
+    ) -> None:
+        """進捗イベントを配信する"""
+        self._events.publish(ScrapeEvent(event_type, job_id, race_id, data))
+
+    async def _record_race_progress(
+        self, job_id: int | None, race_id: str, status: str, error: str | None = None
+    ) -> None:
+        """ジョブのレースごとの進捗を更新する（ジョブ外の呼び出しでは何もしない）"""
+        if job_id is None:
+            return
+        await self._session.execute(
+            update(ScrapeJobRace)
+            .where(ScrapeJobRace.job_id == job_id)
+            .where(ScrapeJobRace.race_id == race_id)
+            .values(status=status, error=error)
+        )
+
     async def scrape_race(self, race_id: str) -> Race | None:
         """
         単一レースのデータを収集・保存する。
 
+        同じレースを別のリクエストが収集中なら、新たに取得せずその完了を待つ。
+
         Args:
             race_id: netkeiba のレースID
 
         Returns:
-            保存したRaceオブジェクト、または既存の場合はNone
+            保存したRaceオブジェクト、または既存（他のリクエストが保存した場合を含む）の場合はNone
         """
+        race, shared = await self._single_flight.do(
+            ("race", race_id), lambda: self._scrape_race(race_id)
+        )
+        return None if shared else race
+
+    async def _scrape_race(self, race_id: str) -> Race | None:
         # 既存チェック
         existing = await self._session.execute(
             select(Race).where(Race.race_id == race_id)
@@ -111,9 +486,13 @@ class ScraperService:
             logger.info("Race %s already exists", race_id)
             return None
 
+        await self._release_connection()
         result_html = await self._client.fetch_race_result(race_id)
-        parsed = parse_race_result_page(result_html, race_id)
-        race = await self._save_race(parsed)
+        parsed = await run_parser(parse_race_result_page, result_html, race_id)
+        race, horse_pks = await self._save_race(parsed)
+        self._stale_stats.update(horse_pks)
+        self._stale_races.add(race.id)
+        await self._refresh_read_models()
         await self._session.commit()
 
         return race
@@ -122,168 +501,192 @@ class ScraperService:
         """
         馬の過去成績を収集・保存する。
 
+        同じ馬を別のリクエストが収集中なら、新たに取得せずその完了を待ち、
+        保存された馬を自分のセッションで読み直して返す。
+
         Args:
             horse_id: netkeiba の馬ID
         """
+        horse, shared = await self._single_flight.do(
+            ("horse", horse_id), lambda: self._scrape_horse_history(horse_id)
+        )
+        if not shared:
+            return horse
+
+        result = await self._session.execute(
+            select(Horse)
+            .where(Horse.horse_id == horse_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def _scrape_horse_history(self, horse_id: str) -> Horse | None:
         logger.info("Scraping horse history for: %s", horse_id)
-        
+
+        await self._release_connection()
         html = await self._client.fetch_horse_page(horse_id)
-        from app.scraper.parser import parse_horse_page
-        parsed = parse_horse_page(html, horse_id)
+        parsed = await run_parser(parse_horse_page, html, horse_id)
 
         # 馬を取得 or 作成
         result = await self._session.execute(
             select(Horse).where(Horse.horse_id == horse_id)
         )
         horse = result.scalar_one_or_none()
+        now = datetime.now()
         if not horse:
-            horse = Horse(
-                horse_id=horse_id,
-                name=parsed.name,
-                sex=parsed.sex,
-                trainer=parsed.trainer,
-                sire=parsed.sire,
-                dam=parsed.dam
-            )
+            horse = Horse(**horse_page_values(parsed))
             self._session.add(horse)
             await self._session.flush()
         else:
-            # 情報を更新
-            horse.trainer = parsed.trainer
-            horse.sire = parsed.sire
-            horse.dam = parsed.dam
-
-        # 過去成績を保存
-        for h_entry in parsed.history:
-            # レースをチェック
-            r_result = await self._session.execute(
-                select(Race).where(Race.race_id == h_entry.race_id)
-            )
-            race = r_result.scalar_one_or_none()
-            if not race:
-                # スタブとして作成
-                race_date = datetime.strptime(h_entry.date, "%Y-%m-%d").date()
-                race = Race(
-                    race_id=h_entry.race_id,
-                    name=h_entry.race_name,
-                    date=race_date,
-                    venue=h_entry.venue,
-                    course_type=h_entry.course_type,
-                    distance=h_entry.distance,
-                    track_condition=h_entry.track_condition,
-                    num_entries=0 # 不明だが一旦0
+            # 情報を更新（変わった場合は、この馬が出走したレースの詳細の内容も変わる）
+            updates = horse_profile_updates(parsed)
+            if any(getattr(horse, key) != value for key, value in updates.items()):
+                for key, value in updates.items():
+                    setattr(horse, key, value)
+                horse.data_version += 1
+                horse.updated_at = now
+                await self._touch_races(
+                    Race.id.in_(select(RaceEntry.race_id).where(RaceEntry.horse_id == horse.id))
                 )
-                self._session.add(race)
-                await self._session.flush()
-
-            # 出走記録をチェック
-            e_result = await self._session.execute(
-                select(RaceEntry)
-                .where(RaceEntry.race_id == race.id)
-                .where(RaceEntry.horse_id == horse.id)
+        horse.last_scraped_at = now
+
+        # 過去成績を保存（レースの解決と出走記録の追加をそれぞれ一括で行う）
+        if parsed.history:
+            race_pks = await self._resolve_history_races(parsed.history)
+            entries = cast(Table, RaceEntry.__table__)
+            stmt = (
+                sqlite_insert(entries)
+                .on_conflict_do_nothing(index_elements=["race_id", "horse_id"])
+                .returning(entries.c.race_id)
             )
-            if e_result.scalar_one_or_none() is None:
-                entry = RaceEntry(
-                    race_id=race.id,
-                    horse_id=horse.id,
-                    bracket_number=h_entry.bracket_number,
-                    horse_number=h_entry.horse_number,
-                    jockey=h_entry.jockey,
-                    weight_carried=h_entry.weight_carried,
-                    odds=h_entry.odds,
-                    popularity=h_entry.popularity,
-                    finish_position=h_entry.finish_position,
-                    finish_time=h_entry.finish_time,
-                    margin=h_entry.margin,
-                    passing_order=h_entry.passing_order,
-                    last_3f=h_entry.last_3f,
-                    horse_weight=h_entry.horse_weight,
-                    horse_weight_diff=h_entry.horse_weight_diff,
-                    status=h_entry.status
-                )
-                self._session.add(entry)
+            inserted = await self._session.execute(
+                stmt,
+                [
+                    {
+                        "race_id": race_pks[h_entry.race_id],
+                        "horse_id": horse.id,
+                        **history_entry_values(h_entry),
+                    }
+                    for h_entry in parsed.history
+                ],
+            )
+            # 出走記録が増えたレースだけ版を進める（登録済みの記録は何も変わらない）
+            touched = set(inserted.scalars())
+            if touched:
+                await self._touch_races(Race.id.in_(touched))
+            self._stale_stats.add(horse.id)
 
+        await self._refresh_read_models()
         await self._session.commit()
         return horse
 
-    async def _save_race(self, parsed: ParsedRacePage) -> Race:
-        """パース済みデータをDBに保存する"""
-        info = parsed.race_info
+    async def _touch_races(self, condition: ColumnElement[bool]) -> None:
+        """
+        詳細の内容が変わったレースの data_version を進め（レース詳細の ETag が変わる）、
+        文書の作り直しを予約する
+
+        Args:
+            condition: 対象のレースを選ぶ races の条件
+        """
+        races = cast(Table, Race.__table__)
+        touched = await self._session.execute(
+            update(races)
+            .where(condition)
+            .values(data_version=races.c.data_version + 1, updated_at=datetime.now())
+            .returning(races.c.id)
+        )
+        self._stale_races.update(touched.scalars())
+
+    async def _save_race(self, parsed: ParsedRacePage) -> tuple[Race, set[int]]:
+        """
+        パース済みデータをDBに保存する。
 
-        # 日付文字列を date オブジェクトに変換
-        race_date = datetime.strptime(info.date, "%Y-%m-%d").date() if info.date else date.today()
+        出走馬は1回の IN クエリで解決し、未登録の馬は複数行 INSERT でまとめて作成する。
+        出走記録も executemany で一括 INSERT する。
 
+        Returns:
+            (保存したRace, 出走記録を追加した馬の主キー)
+        """
         # Race レコード作成
-        race = Race(
-            race_id=info.race_id,
-            name=info.name,
-            date=race_date,
-            venue=info.venue,
-            course_type=info.course_type,
-            distance=info.distance,
-            direction=info.direction,
-            weather=info.weather,
-            track_condition=info.track_condition,
-            race_class=info.race_class,
-            num_entries=info.num_entries,
-        )
+        race = Race(**race_values(parsed.race_info))
         self._session.add(race)
         await self._session.flush()  # race.id を確定
 
-        # 各出走馬を保存
-        for entry_data in parsed.entries:
-            # Horse を取得 or 作成
-            horse = await self._get_or_create_horse(entry_data)
-
-            # RaceEntry を作成
-            entry = RaceEntry(
-                race_id=race.id,
-                horse_id=horse.id,
-                bracket_number=entry_data.bracket_number,
-                horse_number=entry_data.horse_number,
-                jockey=entry_data.jockey,
-                weight_carried=entry_data.weight_carried,
-                odds=entry_data.odds,
-                popularity=entry_data.popularity,
-                finish_position=entry_data.finish_position,
-                finish_time=entry_data.finish_time,
-                margin=entry_data.margin,
-                passing_order=entry_data.passing_order,
-                last_3f=entry_data.last_3f,
-                horse_weight=entry_data.horse_weight,
-                horse_weight_diff=entry_data.horse_weight_diff,
-                status=entry_data.status,
-            )
-            self._session.add(entry)
+        if not parsed.entries:
+            return race, set()
+
+        # 各出走馬の主キーを解決
+        horse_pks = await self._resolve_horses(parsed.entries)
+
+        # RaceEntry を一括作成
+        await self._session.execute(
+            insert(cast(Table, RaceEntry.__table__)),
+            [
+                {
+                    "race_id": race.id,
+                    "horse_id": horse_pks[entry_horse_id(entry_data)],
+                    **result_entry_values(entry_data),
+                }
+                for entry_data in parsed.entries
+            ],
+        )
 
-        return race
+        return race, set(horse_pks.values())
+
+    async def _resolve_horses(self, entries: list[ParsedEntryResult]) -> dict[str, int]:
+        """
+        出走馬の netkeiba 馬ID → horses.id の対応を返す。未登録の馬は作成する。
 
-    async def _get_or_create_horse(self, entry_data: "ParsedEntryResult") -> Horse:  # type: ignore[name-defined]  # noqa: F821
-        """馬を取得、なければ作成する"""
-        from app.scraper.parser import ParsedEntryResult as _PE  # noqa: F811
+        Args:
+            entries: レース結果の出走馬一覧
 
-        assert isinstance(entry_data, _PE)
+        Returns:
+            netkeiba 馬ID（entry_horse_id）→ 主キー
+        """
+        candidates: dict[str, dict[str, Any]] = {}
+        for entry_data in entries:
+            candidates.setdefault(entry_horse_id(entry_data), entry_horse_values(entry_data))
+
+        result = await self._session.execute(
+            select(Horse.horse_id, Horse.id).where(Horse.horse_id.in_(candidates))
+        )
+        horse_pks: dict[str, int] = {horse_id: pk for horse_id, pk in result}
 
-        if entry_data.horse_id:
-            result = await self._session.execute(
-                select(Horse).where(Horse.horse_id == entry_data.horse_id)
+        missing = [values for key, values in candidates.items() if key not in horse_pks]
+        if missing:
+            created = await self._session.execute(
+                insert(Horse).values(missing).returning(Horse.horse_id, Horse.id)
             )
-            horse = result.scalar_one_or_none()
-            if horse:
-                return horse
-
-        # 性別を分離
-        sex = None
-        if entry_data.sex_age:
-            sex = entry_data.sex_age[0] if entry_data.sex_age else None
-
-        horse = Horse(
-            horse_id=entry_data.horse_id or f"unknown_{entry_data.horse_name}",
-            name=entry_data.horse_name,
-            sex=sex,
-            trainer=entry_data.trainer,
+            horse_pks.update({horse_id: pk for horse_id, pk in created})
+
+        return horse_pks
+
+    async def _resolve_history_races(
+        self, history: list[ParsedHorseHistoryEntry]
+    ) -> dict[str, int]:
+        """
+        戦績のレースID → races.id の対応を返す。未登録のレースはスタブとして作成する。
+
+        Args:
+            history: 馬の戦績一覧
+
+        Returns:
+            netkeiba レースID → 主キー
+        """
+        candidates: dict[str, dict[str, Any]] = {}
+        for h_entry in history:
+            candidates.setdefault(h_entry.race_id, stub_race_values(h_entry))
+
+        result = await self._session.execute(
+            select(Race.race_id, Race.id).where(Race.race_id.in_(candidates))
         )
-        self._session.add(horse)
-        await self._session.flush()
+        race_pks: dict[str, int] = {race_id: pk for race_id, pk in result}
 
-        return horse
+        missing = [values for key, values in candidates.items() if key not in race_pks]
+        if missing:
+            created = await self._session.execute(
+                insert(Race).values(missing).returning(Race.race_id, Race.id)
+            )
+            race_pks.update({race_id: pk for race_id, pk in created})
+
+        return race_pks
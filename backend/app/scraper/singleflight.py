@@ -0,0 +1,71 @@
+"""
+同時リクエストの重複排除 (single-flight)
+
+同じキー（馬ID・レースID）の処理が実行中なら、後から来た呼び出しは新たに実行せず、
+実行中の処理の完了を待って結果を共有する。
+同じページの重複ダウンロードと、同じ行の INSERT 競合（一意制約違反）を防ぐ。
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """キーごとに実行中の処理を1つに束ねるレジストリ（イベントループ内で使う）"""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        キーの処理を実行する。同じキーが実行中ならその結果を待つ。
+
+        Args:
+            key: 重複排除のキー（例: ("horse", "2021104567")）
+            func: 実行する処理
+
+        Returns:
+            (結果, 他の呼び出しの結果を共有したか)
+
+        Raises:
+            実行した処理の例外。共有した呼び出しにも同じ例外が送出される。
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            # 待っている側がキャンセルされても、実行中の処理は止めない
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        # 待つ側がいない場合に「例外が取り出されなかった」警告を出さない
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+
+_single_flight: SingleFlight | None = None
+
+
+def get_single_flight() -> SingleFlight:
+    """プロセス共有のレジストリを取得する"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,69 @@
+"""
+期間バックフィルスクリプト
+
+指定期間の全レースを収集・保存する。進捗は scrape_jobs 系テーブルに記録されるため、
+中断しても同じコマンドを再実行すれば続きから再開する。
+
+    python scripts/backfill.py --from 2024-01-01 --to 2024-12-31
+    python scripts/backfill.py --job-id 3
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.database import async_session
+from app.core.init_db import init_db
+from app.models import ScrapeJob
+from app.scraper.executor import shutdown_parse_executor
+from app.scraper.jobs import job_progress
+from app.scraper.service import ScraperService
+
+logging.basicConfig(level=logging.INFO)
+
+
+async def backfill(date_from: date | None, date_to: date | None, job_id: int | None) -> None:
+    await init_db()
+
+    async with async_session() as session:
+        if job_id is not None:
+            job = await session.get(ScrapeJob, job_id)
+            if job is None:
+                raise SystemExit(f"Scrape job not found: {job_id}")
+            date_from, date_to = job.date_from, job.date_to
+        assert date_from is not None and date_to is not None
+
+        service = ScraperService(session)
+        try:
+            job = await service.scrape_range(date_from, date_to, job_id=job_id)
+        finally:
+            await service.close()
+
+        for key, counts in (await job_progress(session, job.id)).items():
+            print(f"{key}: " + ", ".join(f"{status}={count}" for status, count in counts.items()))
+        print(f"Job {job.id}: {job.status}" + (f" ({job.error})" if job.error else ""))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="期間内のレースデータを収集する")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="開始日")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="終了日")
+    parser.add_argument("--job-id", type=int, default=None, help="再開するジョブのID")
+    args = parser.parse_args()
+
+    if args.job_id is None and (args.date_from is None or args.date_to is None):
+        parser.error("--from と --to、または --job-id を指定してください")
+
+    try:
+        asyncio.run(backfill(args.date_from, args.date_to, args.job_id))
+    finally:
+        shutdown_parse_executor()
+
+
+if __name__ == "__main__":
+    main()
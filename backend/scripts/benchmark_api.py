@@ -0,0 +1,176 @@
+"""
+読み出しAPIのベンチマーク
+
+一時ファイルのDBにレース・出走記録・集計成績を投入し、レース詳細と分析のエンドポイントを
+アプリに直接（ASGI 経由で、ネットワークを通さずに）繰り返し呼んで、1秒あたりのリクエスト数と
+応答時間の中央値をJSONエンコーダーごとに計測する。
+
+    python scripts/benchmark_api.py
+    python scripts/benchmark_api.py --races 200 --duration 5 --encoders json orjson
+    python scripts/benchmark_api.py --no-documents  # レース詳細を文書なし（行から組み立て）で計測
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+import app.core.encoding as encoding
+from app.core.config import settings
+from app.core.database import create_db_engine, get_read_db
+from app.core.encoding import available_encoders
+from app.main import app
+from app.models import Base, Horse, Race, RaceEntry
+from app.predictor.analysis import refresh_horse_stats
+from app.read_models.race_documents import refresh_race_documents
+from app.scraper.mapping import entry_numeric_values
+
+# 1レースあたりの出走頭数（フルゲート）
+FIELD_SIZE = 16
+
+
+async def _seed(engine: AsyncEngine, races: int, horses: int, documents: bool) -> None:
+    """レース・馬・出走記録・集計成績（とレース詳細の文書）を投入する"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(Horse.__table__),
+            [
+                {
+                    "horse_id": f"h{i:07d}", "name": f"馬{i}", "sex": "牡",
+                    "trainer": "調教師", "sire": "父", "dam": "母",
+                    "last_scraped_at": datetime.now(),
+                }
+                for i in range(1, horses + 1)
+            ],
+        )
+        await conn.execute(
+            insert(Race.__table__),
+            [
+                {
+                    "race_id": f"{i:012d}", "name": f"レース{i}",
+                    "date": date(2020, 1, 1) + timedelta(days=i),
+                    "venue": "東京", "course_type": "芝", "distance": 2000,
+                    "num_entries": FIELD_SIZE,
+                }
+                for i in range(1, races + 1)
+            ],
+        )
+        await conn.execute(
+            insert(RaceEntry.__table__),
+            [
+                {
+                    "race_id": race, "horse_id": horse_id, "horse_number": number,
+                    "bracket_number": (number + 1) // 2, "jockey": "騎手",
+                    "weight_carried": 57.0, "odds": 12.3, "popularity": number,
+                    "finish_position": number, "finish_time": "2:01.5", "margin": "クビ",
+                    "passing_order": f"{number}-{number}-{number}", "last_3f": 34.5,
+                    "horse_weight": 480, "horse_weight_diff": 2,
+                    **entry_numeric_values("2:01.5", f"{number}-{number}-{number}", "クビ"),
+                }
+                for race in range(1, races + 1)
+                for number, horse_id in enumerate(
+                    random.sample(range(1, horses + 1), FIELD_SIZE), start=1
+                )
+            ],
+        )
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        horse_ids = list(await session.scalars(select(Horse.id)))
+        await refresh_horse_stats(session, horse_ids)
+        if documents:
+            await refresh_race_documents(session, await session.scalars(select(Race.id)))
+        await session.commit()
+
+
+async def _measure(client: AsyncClient, paths: list[str], duration: float) -> np.ndarray:
+    """duration 秒の間 paths を順に呼び、1回ごとの所要時間（秒）を返す"""
+    latencies: list[float] = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        path = random.choice(paths)
+        started = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, (path, response.status_code)
+    return np.array(latencies)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{Path(tmp) / 'benchmark.db'}"
+        writer = create_db_engine(url)
+        reader = create_db_engine(url, readonly=True, pool_size=1)
+        read_session = async_sessionmaker(reader, class_=AsyncSession, expire_on_commit=False)
+
+        async def override_get_read_db() -> AsyncIterator[AsyncSession]:
+            async with read_session() as session:
+                yield session
+
+        app.dependency_overrides[get_read_db] = override_get_read_db
+        try:
+            await _seed(writer, args.races, args.horses, args.documents)
+            race_ids = [f"{i:012d}" for i in range(1, args.races + 1)]
+            endpoints = {
+                "/api/races/{id}": [f"/api/races/{r}" for r in race_ids],
+                "/api/races/{id}/analysis": [f"/api/races/{r}/analysis" for r in race_ids],
+                "/api/analysis/horses/{id}": [
+                    f"/api/analysis/horses/h{i:07d}" for i in range(1, args.horses + 1)
+                ],
+            }
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                for encoder in args.encoders:
+                    encoding.settings = replace(settings, json_encoder=encoder)
+                    for name, paths in endpoints.items():
+                        await _measure(client, paths, 0.2)  # ウォームアップ
+                        latencies = await _measure(client, paths, args.duration)
+                        print(
+                            f"{encoder:7s} {name:28s} "
+                            f"{len(latencies) / latencies.sum():8.1f} req/s "
+                            f"p50={np.median(latencies) * 1000:6.2f}ms"
+                        )
+        finally:
+            app.dependency_overrides.clear()
+            encoding.settings = settings
+            await reader.dispose()
+            await writer.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="読み出しAPIのベンチマーク")
+    parser.add_argument("--races", type=int, default=100, help="投入するレース数")
+    parser.add_argument("--horses", type=int, default=1000, help="投入する馬の数")
+    parser.add_argument("--duration", type=float, default=3.0, help="1エンドポイントの計測秒数")
+    parser.add_argument(
+        "--encoders",
+        nargs="+",
+        default=available_encoders(),
+        choices=available_encoders(),
+        help="比較するJSONエンコーダー",
+    )
+    parser.add_argument(
+        "--no-documents",
+        dest="documents",
+        action="store_false",
+        help="レース詳細の文書 (race_documents) を作らずに計測する",
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+HTMLパーサーバックエンドのベンチマーク
+
+バックエンドごとに1ページあたりのパース時間を計測する。
+--archive を指定するとアーカイブ済みの実ページを使い、
+省略時はサンプルHTML (tests/fixtures/pages.py) を実ページ相当の行数に増やして使う。
+
+    python scripts/benchmark_parsers.py
+    python scripts/benchmark_parsers.py --archive ../data/raw --limit 200
+"""
+import argparse
+import functools
+import re
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.scraper import PAGE_HORSE_RESULT, PAGE_RACE_RESULT
+from app.scraper.archive import RawPageArchive
+from app.scraper.client import decode_html
+from app.scraper.dom import available_backends
+from app.scraper.parser import parse_horse_page, parse_race_result_page
+from tests.fixtures.pages import SAMPLE_HORSE_HTML, SAMPLE_RACE_RESULT_HTML
+
+# 1ページあたりの行数の目安（フルゲートのレース / 中堅馬の戦績）
+RACE_ROWS = 18
+HORSE_ROWS = 40
+
+
+def _inflate(html: str, table_class: str, rows: int) -> str:
+    """サンプルHTMLのテーブル行を繰り返して指定行数に増やす"""
+    pattern = re.compile(rf'(<table class="{table_class}">.*?</tr>)(.*?)(</table>)', re.S)
+    match = pattern.search(html)
+    assert match is not None
+    body_rows = re.findall(r"<tr>.*?</tr>", match.group(2), re.S)
+    repeated = "".join(body_rows[i % len(body_rows)] for i in range(rows))
+    return html[: match.start(2)] + repeated + html[match.end(2) :]
+
+
+def _mock_pages() -> list[tuple[str, str, str]]:
+    race_html = _inflate(SAMPLE_RACE_RESULT_HTML, "race_table_01", RACE_ROWS)
+    horse_html = _inflate(SAMPLE_HORSE_HTML, "db_h_race_results", HORSE_ROWS)
+    return [
+        (PAGE_RACE_RESULT, "202505010101", race_html),
+        (PAGE_HORSE_RESULT, "2021104567", horse_html),
+    ]
+
+
+def _archived_pages(root: str, limit: int) -> list[tuple[str, str, str]]:
+    archive = RawPageArchive(root)
+    pages: list[tuple[str, str, str]] = []
+    for page_type, pattern in (
+        (PAGE_RACE_RESULT, r"/race/(\d{12})"),
+        (PAGE_HORSE_RESULT, r"/horse/result/(\w+)"),
+    ):
+        for ref in archive.iter_pages(page_type):
+            match = re.search(pattern, ref.url)
+            if match is None:
+                continue
+            html = decode_html(archive.read_object(ref.sha256))
+            pages.append((page_type, match.group(1), html))
+            if sum(1 for p in pages if p[0] == page_type) >= limit:
+                break
+    return pages
+
+
+def _measure(func: Callable[[], object], repeat: int) -> float:
+    """1回あたりの平均実行時間（ミリ秒）"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTMLパーサーバックエンドのベンチマーク")
+    parser.add_argument("--archive", default=None, help="実ページを読むアーカイブのディレクトリ")
+    parser.add_argument("--limit", type=int, default=100, help="種別ごとの最大ページ数")
+    parser.add_argument("--repeat", type=int, default=20, help="1ページあたりの繰り返し回数")
+    args = parser.parse_args()
+
+    pages = _archived_pages(args.archive, args.limit) if args.archive else _mock_pages()
+    if not pages:
+        print("No pages to benchmark")
+        return
+
+    print(f"{'backend':<12} {'page type':<14} {'pages':>6} {'ms/page':>9}")
+    for backend in available_backends():
+        for page_type in (PAGE_RACE_RESULT, PAGE_HORSE_RESULT):
+            targets = [(key, html) for t, key, html in pages if t == page_type]
+            if not targets:
+                continue
+            parse = parse_race_result_page if page_type == PAGE_RACE_RESULT else parse_horse_page
+            total = sum(
+                _measure(functools.partial(parse, html, key, backend), args.repeat)
+                for key, html in targets
+            )
+            print(f"{backend:<12} {page_type:<14} {len(targets):>6} {total / len(targets):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
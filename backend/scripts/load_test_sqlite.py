@@ -0,0 +1,158 @@
+"""
+SQLite の読み書き競合の負荷試験
+
+一時ファイルのDBにレース・出走記録を投入し、書き込み（スクレイプの取り込み相当）を
+続けながら並行して読み出し（レース詳細の取得相当）を行い、読み出しの待ち時間を計測する。
+SQLite の性能プロファイル (SQLITE_PROFILE) ごとに p50 / p95 / p99 を比較する。
+
+    python scripts/load_test_sqlite.py
+    python scripts/load_test_sqlite.py --readers 8 --duration 20 --races 2000
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.database import SQLITE_PROFILE_DEFAULT, SQLITE_PROFILE_PERFORMANCE, create_db_engine
+from app.models import Base, Horse, Race, RaceEntry
+
+# 1レースあたりの出走頭数（フルゲート）
+FIELD_SIZE = 18
+
+
+async def _seed(engine: AsyncEngine, races: int, horses: int) -> None:
+    """レース・馬・出走記録を投入する"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(Horse.__table__),
+            [{"horse_id": f"h{i:07d}", "name": f"馬{i}"} for i in range(1, horses + 1)],
+        )
+        await conn.execute(
+            insert(Race.__table__),
+            [
+                {
+                    "race_id": f"{i:012d}", "name": f"レース{i}",
+                    "date": date(2020, 1, 1) + timedelta(days=i % 2000),
+                    "venue": "東京", "course_type": "芝", "distance": 2000,
+                    "num_entries": FIELD_SIZE,
+                }
+                for i in range(1, races + 1)
+            ],
+        )
+        await conn.execute(
+            insert(RaceEntry.__table__),
+            [
+                {
+                    "race_id": race, "horse_id": horse_id,
+                    "horse_number": number, "finish_position": number,
+                    "passing_order": f"{number}-{number}", "last_3f": 34.5,
+                }
+                for race in range(1, races + 1)
+                for number, horse_id in enumerate(
+                    random.sample(range(1, horses + 1), FIELD_SIZE), start=1
+                )
+            ],
+        )
+
+
+async def _writer(engine: AsyncEngine, races: int, stop: asyncio.Event) -> int:
+    """出走記録の更新を1レースずつのトランザクションで続け、件数を返す"""
+    writes = 0
+    while not stop.is_set():
+        race = random.randint(1, races)
+        async with engine.begin() as conn:
+            await conn.execute(
+                RaceEntry.__table__.update()
+                .where(RaceEntry.race_id == race)
+                .values(last_3f=round(random.uniform(33.0, 37.0), 1))
+            )
+        writes += 1
+        await asyncio.sleep(0)
+    return writes
+
+
+async def _reader(
+    engine: AsyncEngine, races: int, stop: asyncio.Event, latencies: list[float]
+) -> None:
+    """レースと出走記録の読み出しを続け、1回ごとの所要時間を記録する"""
+    while not stop.is_set():
+        race = random.randint(1, races)
+        started = time.perf_counter()
+        async with engine.connect() as conn:
+            await conn.execute(select(Race).where(Race.id == race))
+            await conn.execute(select(RaceEntry).where(RaceEntry.race_id == race))
+        latencies.append(time.perf_counter() - started)
+
+
+async def run_profile(
+    profile: str, races: int, horses: int, readers: int, duration: float
+) -> tuple[np.ndarray, int]:
+    """1プロファイル分の負荷試験を実行し、読み出しの所要時間（秒）と書き込み回数を返す"""
+    config = replace(settings, sqlite_profile=profile)
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{Path(tmp) / 'load_test.db'}"
+        writer = create_db_engine(url, config)
+        reader = create_db_engine(url, config, readonly=True, pool_size=readers)
+        try:
+            await _seed(writer, races, horses)
+            stop = asyncio.Event()
+            latencies: list[float] = []
+            write_task = asyncio.create_task(_writer(writer, races, stop))
+            read_tasks = [
+                asyncio.create_task(_reader(reader, races, stop, latencies))
+                for _ in range(readers)
+            ]
+            await asyncio.sleep(duration)
+            stop.set()
+            writes = await write_task
+            await asyncio.gather(*read_tasks)
+        finally:
+            await reader.dispose()
+            await writer.dispose()
+    return np.array(latencies), writes
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    for profile in args.profiles:
+        latencies, writes = await run_profile(
+            profile, args.races, args.horses, args.readers, args.duration
+        )
+        p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+        print(
+            f"{profile:12s} reads={len(latencies):7d} writes={writes:6d} "
+            f"p50={p50:7.2f}ms p95={p95:7.2f}ms p99={p99:7.2f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite の読み書き競合の負荷試験")
+    parser.add_argument("--races", type=int, default=1000, help="投入するレース数")
+    parser.add_argument("--horses", type=int, default=5000, help="投入する馬の数")
+    parser.add_argument("--readers", type=int, default=4, help="並行して読み出すタスク数")
+    parser.add_argument("--duration", type=float, default=10.0, help="1プロファイルの計測秒数")
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=[SQLITE_PROFILE_DEFAULT, SQLITE_PROFILE_PERFORMANCE],
+        choices=[SQLITE_PROFILE_DEFAULT, SQLITE_PROFILE_PERFORMANCE],
+        help="比較するプロファイル",
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
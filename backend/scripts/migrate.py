@@ -0,0 +1,62 @@
+"""
+スキーマのマイグレーション実行スクリプト
+
+未適用のマイグレーション (app.core.migrations) を実行する。アプリ起動時にも自動で
+実行されるが、大きなDBの索引作成や列の埋め直しを起動前に済ませたいときに使う。
+
+    python scripts/migrate.py            # 未適用のものを実行
+    python scripts/migrate.py --status   # 現在のバージョンと未適用の一覧を表示するだけ
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.database import engine
+from app.core.init_db import init_db
+from app.core.migrations import MIGRATIONS, get_schema_version, pending_migrations
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def show_status() -> None:
+    """現在のバージョンと未適用のマイグレーションを表示する"""
+    async with engine.connect() as conn:
+        version = await conn.run_sync(get_schema_version)
+        pending = await conn.run_sync(pending_migrations)
+    print(f"Schema version: {version} (latest {MIGRATIONS[-1].version})")
+    for migration in pending:
+        print(f"  pending {migration.version}: {migration.description}")
+
+
+async def migrate() -> None:
+    """テーブルを作成し、未適用のマイグレーションを実行する"""
+    await init_db()
+    async with engine.connect() as conn:
+        version = await conn.run_sync(get_schema_version)
+    print(f"Schema version: {version}")
+
+
+async def run(status_only: bool) -> None:
+    """状態の表示またはマイグレーションを実行し、接続を閉じる"""
+    try:
+        await (show_status() if status_only else migrate())
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="スキーマのマイグレーションを実行する")
+    parser.add_argument("--status", action="store_true", help="実行せずに状態だけ表示する")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.status))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+集計成績の再構築スクリプト
+
+全馬の horse_stats を出走記録から計算し直す。テーブル追加前のデータの取り込みや、
+脚質判定の規則を変えた後に実行する（通常の取り込みでは ScraperService が随時更新する）。
+
+    python scripts/rebuild_horse_stats.py
+    python scripts/rebuild_horse_stats.py --batch-size 5000
+
+脚質は頭数で正規化した位置取りから一括判定する（app.predictor.logic.classify_horses）ため、
+1バッチ数千頭でも1回のクエリと1回のベクトル演算で済む。
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.core.database import async_session
+from app.core.init_db import init_db
+from app.models import Horse
+from app.predictor.analysis import refresh_horse_stats
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(batch_size: int) -> int:
+    """全馬の集計成績を batch_size 頭ずつ計算し直し、件数を返す"""
+    await init_db()
+
+    async with async_session() as session:
+        horse_ids = list(await session.scalars(select(Horse.id).order_by(Horse.id)))
+        for start in range(0, len(horse_ids), batch_size):
+            await refresh_horse_stats(session, horse_ids[start : start + batch_size])
+            await session.commit()
+            done = min(start + batch_size, len(horse_ids))
+            logger.info("Rebuilt %d / %d horses", done, len(horse_ids))
+
+    return len(horse_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="全馬の集計成績 (horse_stats) を再構築する")
+    parser.add_argument("--batch-size", type=int, default=2000, help="1回に計算する頭数")
+    args = parser.parse_args()
+
+    count = asyncio.run(rebuild(args.batch_size))
+    print(f"Rebuilt stats for {count} horses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+レース詳細の文書の再構築スクリプト
+
+全レースの race_documents をレース・出走記録から作り直す。テーブル追加前のデータや、
+アーカイブから作り直したDBに実行する（通常の取り込みでは ScraperService が随時更新する）。
+文書がないレースもAPIは行から組み立てて返すため、実行しなくても応答は変わらない。
+
+    python scripts/rebuild_race_documents.py
+    python scripts/rebuild_race_documents.py --batch-size 1000
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.core.database import async_session
+from app.core.init_db import init_db
+from app.models import Race
+from app.read_models.race_documents import refresh_race_documents
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(batch_size: int) -> int:
+    """全レースの文書を batch_size 件ずつ作り直し、件数を返す"""
+    await init_db()
+
+    async with async_session() as session:
+        race_pks = list(await session.scalars(select(Race.id).order_by(Race.id)))
+        for start in range(0, len(race_pks), batch_size):
+            await refresh_race_documents(session, race_pks[start : start + batch_size])
+            await session.commit()
+            done = min(start + batch_size, len(race_pks))
+            logger.info("Rebuilt %d / %d races", done, len(race_pks))
+
+    return len(race_pks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="全レースの文書 (race_documents) を再構築する")
+    parser.add_argument("--batch-size", type=int, default=500, help="1回に作り直すレース数")
+    args = parser.parse_args()
+
+    count = asyncio.run(rebuild(args.batch_size))
+    print(f"Rebuilt documents for {count} races")
+
+
+if __name__ == "__main__":
+    main()
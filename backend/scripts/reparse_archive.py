@@ -0,0 +1,65 @@
+"""
+アーカイブ再パーススクリプト
+
+data/raw に保存済みのHTMLを全コアで再パースし、DBを作り直す。
+パーサー修正後に過去データへ反映する際に使う（ネットワークアクセスなし）。
+
+    python scripts/reparse_archive.py
+    python scripts/reparse_archive.py --output ../data/keiba_rebuilt.db --workers 8
+
+差し替え先のDBを使用中のAPIサーバーは、完了後に再起動すること。
+スクレイプジョブ・開催カレンダー・馬の最終取得日時は差し替え前のDBから引き継ぐ。
+差し替え前のDBにアーカイブにないレースがあると中止する（--force で、それらを捨てて差し替える）。
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.scraper.archive import RawPageArchive
+from app.scraper.reparse import MissingRacesError, rebuild_database
+
+logging.basicConfig(level=logging.INFO)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTMLアーカイブからDBを再構築する")
+    parser.add_argument(
+        "--archive", default=settings.raw_archive_dir, help="HTMLアーカイブのディレクトリ"
+    )
+    parser.add_argument(
+        "--output",
+        default=make_url(settings.database_url).database,
+        help="差し替え先の SQLite ファイル",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="パースに使うプロセス数")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="差し替え前のDBにアーカイブにないレースがあっても差し替える（それらは失われる）",
+    )
+    args = parser.parse_args()
+
+    try:
+        stats = rebuild_database(
+            RawPageArchive(args.archive), args.output, workers=args.workers, force=args.force
+        )
+    except MissingRacesError as e:
+        print(f"Aborted: {e}. The existing database was left unchanged; use --force to drop them.")
+        sys.exit(1)
+    print(
+        f"Pages: {stats.race_pages} races / {stats.horse_pages} horses "
+        f"({stats.failed_pages} failed)"
+    )
+    print(f"Rows: {stats.races} races / {stats.horses} horses / {stats.entries} entries")
+    print(f"Carried over {stats.carried_rows} rows from the previous database")
+
+
+if __name__ == "__main__":
+    main()
@@ -42,10 +42,8 @@ async def verify_scraper():
                 f.write(html)
             print("Saved HTML to debug_race.html")
 
-            # スクレイピング実行（内部で再度フェッチされるがキャッシュはないので2回叩くことになるが許容）
-            # 修正: service.scrape_race は内部で fetch するので、ここでは parse_race_result_page を直接呼んでデバッグするか、
-            # service のメソッドを呼ぶか。
-            # service.scrape_race を呼ぶとDB保存まで行われるので、それを維持。
+            # スクレイピング実行（DB保存まで行う）
+            # 直前に取得したHTMLはアーカイブ (data/raw) に保存済みなので、再度のアクセスは発生しない
             race = await service.scrape_race(target_race_id)
             
             if race:
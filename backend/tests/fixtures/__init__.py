@@ -0,0 +1,3 @@
+"""
+テスト・開発用スクリプトで共用するフィクスチャ
+"""
@@ -0,0 +1,125 @@
+"""
+netkeiba.com のページを模したサンプルHTML
+
+パーサー・スクレイパーのテストと、パーサーのベンチマーク (scripts/benchmark_parsers.py) で共用する。
+アプリケーション (app パッケージ) からは参照しない。
+実際のページから必要な構造だけを残したもの。
+"""
+
+SAMPLE_RACE_RESULT_HTML = """
+<html>
+<head><title>テスト記念(G1) レース結果</title></head>
+<body>
+<p class="smalltxt">2025年6月1日 1回東京1日目</p>
+<h1 class="racedata_title">テスト記念</h1>
+<span>芝右2000m</span>
+<span>天候：晴</span>
+<span>芝：良</span>
+<span class="GradeIcon">G1</span>
+
+<table class="race_table_01">
+<tr><th>着順</th><th>枠番</th><th>馬番</th><th>馬名</th><th>性齢</th><th>斤量</th><th>騎手</th><th>タイム</th><th>着差</th><th>通過</th><th>上り</th><th>馬体重</th><th>単勝</th><th>人気</th><th>調教師</th></tr>
+<tr>
+  <td>1</td>
+  <td>3</td>
+  <td>5</td>
+  <td><a href="/horse/2021104567/">テストディープ</a></td>
+  <td>牡4</td>
+  <td>57.0</td>
+  <td>テスト騎手A</td>
+  <td>1:59.5</td>
+  <td></td>
+  <td>3-3-2-1</td>
+  <td>33.8</td>
+  <td>468(-4)</td>
+  <td>3.5</td>
+  <td>1</td>
+  <td><a href="/trainer/00001/">テスト調教師A</a></td>
+</tr>
+<tr>
+  <td>2</td>
+  <td>5</td>
+  <td>9</td>
+  <td><a href="/horse/2021104568/">テストアーモンド</a></td>
+  <td>牝4</td>
+  <td>55.0</td>
+  <td>テスト騎手B</td>
+  <td>1:59.8</td>
+  <td>クビ</td>
+  <td>5-5-4-2</td>
+  <td>33.5</td>
+  <td>456(+2)</td>
+  <td>5.2</td>
+  <td>2</td>
+  <td><a href="/trainer/00002/">テスト調教師B</a></td>
+</tr>
+<tr>
+  <td>3</td>
+  <td>7</td>
+  <td>13</td>
+  <td><a href="/horse/2021104569/">テストコントレイル</a></td>
+  <td>牡5</td>
+  <td>58.0</td>
+  <td>テスト騎手C</td>
+  <td>2:00.1</td>
+  <td>1 1/2</td>
+  <td>1-1-1-3</td>
+  <td>34.6</td>
+  <td>480(0)</td>
+  <td>12.4</td>
+  <td>5</td>
+  <td><a href="/trainer/00003/">テスト調教師C</a></td>
+</tr>
+</table>
+</body>
+</html>
+"""
+
+SAMPLE_RACE_LIST_HTML = """
+<html>
+<body>
+<div class="race_list">
+  <a href="/race/202506010101/">1R</a>
+  <a href="/race/202506010102/">2R</a>
+  <a href="/race/202506010103/">3R</a>
+  <a href="/race/202506010104/">4R</a>
+  <a href="/other/page/">その他リンク</a>
+</div>
+</body>
+</html>
+"""
+
+SAMPLE_HORSE_HTML = """
+<html>
+<body>
+<div class="horse_title"><h1>テストディープ</h1></div>
+<div class="db_prof_area_02"><p class="txt_01">牡4歳 鹿毛</p></div>
+<table class="db_prof_table">
+<tr><th>調教師</th><td><a href="/trainer/00001/">テスト調教師A</a>(美浦)</td></tr>
+</table>
+<table class="blood_table">
+<tr><td><a href="/horse/sire0001/">テストサイアー</a></td></tr>
+<tr><td><a href="/horse/dam00001/">テストマザー</a></td></tr>
+</table>
+<table class="db_h_race_results">
+<tr><th>日付</th><th>開催</th><th>天気</th><th>R</th><th>レース名</th><th>映像</th><th>枠番</th><th>馬番</th><th>オッズ</th><th>人気</th><th>着順</th><th>頭数</th><th>騎手</th><th>斤量</th><th>距離</th><th>水分量</th><th>馬場</th><th>馬場指数</th><th>タイム</th><th>着差</th><th>ﾀｲﾑ指数</th><th>通過</th><th>ペース</th><th>上り</th><th>馬体重</th></tr>
+<tr>
+  <td>2025/06/01</td><td>1東京1</td><td>晴</td><td>11</td>
+  <td><a href="/race/202505010111/">テスト記念(G1)</a></td><td></td>
+  <td>3</td><td>5</td><td>3.5</td><td>1</td><td>1</td><td>16</td>
+  <td>テスト騎手A</td><td>57.0</td><td>芝2000</td><td></td><td>良</td><td></td>
+  <td>1:59.5</td><td>-0.3</td><td></td><td>3-3-2-1</td><td>35.0-34.2</td>
+  <td>33.8</td><td>468(-4)</td>
+</tr>
+<tr>
+  <td>2025/04/20</td><td>2中山8</td><td>曇</td><td>10</td>
+  <td><a href="/race/202506020810/">テストステークス</a></td><td></td>
+  <td>1</td><td>2</td><td>8.1</td><td>4</td><td>取</td><td>12</td>
+  <td>テスト騎手B</td><td>56.0</td><td>ダ1800</td><td></td><td>稍</td><td></td>
+  <td></td><td></td><td></td><td></td><td></td>
+  <td></td><td>472(+6)</td>
+</tr>
+</table>
+</body>
+</html>
+"""
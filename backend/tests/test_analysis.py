@@ -7,8 +7,10 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.main import app
 from app.models import Race, Horse, RaceEntry
-from datetime import date
-from app.core.database import get_db
+from datetime import date, datetime, timedelta
+from app.core.database import get_db, get_read_db
+from app.predictor.analysis import refresh_horse_stats
+from sqlalchemy import event
 
 # テスト用DBセッションフィクスチャ
 from sqlalchemy.orm import sessionmaker
@@ -28,6 +30,7 @@ async def test_session() -> AsyncSession:
         yield session
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     yield session
     
     await session.close()
@@ -36,8 +39,26 @@ async def test_session() -> AsyncSession:
     await engine.dispose()
     app.dependency_overrides.clear()
 
+class _RecordingRefreshQueue:
+    """投入された馬IDを記録するだけの再取得キュー（ネットワークへ出ない）"""
+
+    def __init__(self) -> None:
+        self.submitted: list[str] = []
+
+    def submit(self, horse_id: str) -> bool:
+        self.submitted.append(horse_id)
+        return True
+
+
+@pytest.fixture
+def scraped(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """再取得キューに積まれた馬IDのリスト"""
+    queue = _RecordingRefreshQueue()
+    monkeypatch.setattr("app.api.routes.get_horse_refresh_queue", lambda: queue)
+    return queue.submitted
+
 @pytest.mark.asyncio
-async def test_analyze_horse_stats(test_session: AsyncSession) -> None:
+async def test_analyze_horse_stats(test_session: AsyncSession, scraped: list[str]) -> None:
     # データ投入
     race = Race(
         race_id="202401010101", name="テストレース", date=date(2024, 1, 1),
@@ -49,7 +70,7 @@ async def test_analyze_horse_stats(test_session: AsyncSession) -> None:
     
     # 逃げた履歴 (通過順 1-1-1)
     entry = RaceEntry(
-        race_id=race.id, horse_id=horse.id, 
+        race_id=race.id, horse_id=horse.id, horse_number=1,
         passing_order="1-1-1", finish_position=1, last_3f=34.0
     )
     test_session.add(entry)
@@ -66,3 +87,76 @@ async def test_analyze_horse_stats(test_session: AsyncSession) -> None:
     assert data["style"] == "NIGE"
     assert data["stats"]["speed"] == 90.0  # (100 - (34.0 - 33.0)*10) = 90
     assert data["stats"]["races_count"] == 1.0
+    # 過去成績が未取得なので、応答は手元のデータで返しつつ再取得を予約する
+    assert data["stale"] is True
+    assert scraped == ["2021101234"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_race_horses_batched(test_session: AsyncSession, scraped: list[str]) -> None:
+    """集計済みの成績を頭数によらない回数のクエリで引くこと"""
+    races = [
+        Race(
+            race_id=f"2024010101{i:02d}", name=f"テストレース{i}", date=date(2024, 1, i),
+            venue="東京", course_type="芝", distance=2000, num_entries=16,
+        )
+        for i in range(1, 4)
+    ]
+    horses = [
+        Horse(horse_id="2021100001", name="逃げ馬", sex="牡", last_scraped_at=datetime.now()),
+        Horse(horse_id="2021100002", name="追込馬", sex="牝", last_scraped_at=datetime.now()),
+        Horse(
+            horse_id="2021100003", name="新馬", sex="牡",
+            last_scraped_at=datetime.now() - timedelta(days=30),
+        ),
+    ]
+    test_session.add_all([*races, *horses])
+    await test_session.flush()
+
+    entries = []
+    for race in races:
+        entries.append(RaceEntry(
+            race_id=race.id, horse_id=horses[0].id, horse_number=1,
+            passing_order="1-1-1", last_3f=35.0,
+        ))
+        entries.append(RaceEntry(
+            race_id=race.id, horse_id=horses[1].id, horse_number=2,
+            passing_order="14-14-12", last_3f=33.5,
+        ))
+    # 新馬は最新レースのみ（通過順・上がりの記録なし）
+    entries.append(RaceEntry(race_id=races[-1].id, horse_id=horses[2].id, horse_number=3))
+    test_session.add_all(entries)
+    # 取り込み時と同じく集計成績を保存しておく
+    await test_session.flush()
+    await refresh_horse_stats(test_session, [horse.id for horse in horses])
+    await test_session.commit()
+
+    statements: list[str] = []
+
+    @event.listens_for(test_session.bind.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(f"/api/races/{races[-1].race_id}/analysis")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["2021100001"]["style"] == "NIGE"
+    assert data["2021100001"]["stats"]["speed"] == 80.0
+    assert data["2021100001"]["stats"]["races_count"] == 3
+    assert data["2021100002"]["style"] == "OIKOMI"
+    assert data["2021100002"]["stats"]["speed"] == 95.0
+    assert data["2021100003"]["style"] == "UNKNOWN"
+    assert data["2021100003"]["stats"]["speed"] == 70.0
+    assert data["2021100003"]["stats"]["races_count"] == 1
+
+    # 取得から時間が経った馬だけ再取得を予約する
+    assert [horse_id for horse_id, analysis in data.items() if analysis["stale"]] == ["2021100003"]
+    assert scraped == ["2021100003"]
+    # レース / 出走馬（出走記録と結合）の読み込み + 集計成績 1回（再計算はしない）
+    queries = [s for s in statements if s.lstrip().upper().startswith(("SELECT", "INSERT"))]
+    assert len(queries) == 3
+    assert not any("recency" in s for s in queries)
+
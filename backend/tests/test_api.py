@@ -2,15 +2,35 @@
 APIエンドポイントのテスト
 """
 
+import gzip
+import json
+from dataclasses import replace
 from datetime import date
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from pydantic import TypeAdapter
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.core.database import get_db
+from app.api.pagination import get_race_count_cache
+from app.api.schemas import (
+    EntryResponse,
+    HorseAnalysisResponse,
+    HorseResponse,
+    RaceDetailResponse,
+)
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.encoding import available_encoders
 from app.main import app
-from app.models import Base, Horse, Race, RaceEntry
+from app.models import Base, Horse, HorseStats, Race, RaceDocument, RaceEntry
+from app.read_models.race_documents import (
+    ENTRY_FIELDS,
+    HORSE_FIELDS,
+    RACE_DETAIL_FIELDS,
+    refresh_race_documents,
+)
 
 
 @pytest.fixture
@@ -34,6 +54,7 @@ async def test_session() -> AsyncSession:  # type: ignore[misc]
         yield session  # type: ignore[misc]
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     yield session  # type: ignore[misc]
 
@@ -166,6 +187,196 @@ async def test_get_horse_not_found(test_session: AsyncSession) -> None:
     assert response.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_race_detail_conditional_get(seeded_session: AsyncSession) -> None:
+    """ETag が一致すれば出走記録を読まずに 304 を返し、版が進めば 200 に戻ること"""
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/races/202506010101")
+        etag = first.headers["etag"]
+        assert first.headers["last-modified"].endswith("GMT")
+        # 出走記録が1件しかないスタブは結果が確定していない
+        assert first.headers["cache-control"] == "no-cache"
+
+        sync_engine = seeded_session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", _record)
+        try:
+            cached = await client.get("/api/races/202506010101", headers={"If-None-Match": etag})
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", _record)
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+        # 文書とレースの行だけを読み、出走記録は読まない
+        assert len(statements) == 2
+        assert not any("race_entries.horse_id" in s for s in statements)
+
+        since = await client.get(
+            "/api/races/202506010101",
+            headers={"If-Modified-Since": first.headers["last-modified"]},
+        )
+        assert since.status_code == 304
+
+        race = await seeded_session.scalar(select(Race))
+        assert race is not None
+        race.data_version += 1
+        await seeded_session.commit()
+        changed = await client.get("/api/races/202506010101", headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["entries"][0]["horse"]["name"] == "テストディープ"
+
+
+@pytest.mark.asyncio
+async def test_race_detail_served_from_document(seeded_session: AsyncSession) -> None:
+    """取り込み時の文書があれば1回の主キー検索で返し、行から組み立てた応答と同じになること"""
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        assembled = await client.get("/api/races/202506010101")
+
+        race = await seeded_session.scalar(select(Race))
+        assert race is not None
+        await refresh_race_documents(seeded_session, [race.id])
+        await seeded_session.commit()
+
+        sync_engine = seeded_session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", _record)
+        try:
+            gzipped = await client.get("/api/races/202506010101")
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", _record)
+        plain = await client.get(
+            "/api/races/202506010101", headers={"Accept-Encoding": "identity"}
+        )
+        cached = await client.get(
+            "/api/races/202506010101", headers={"If-None-Match": gzipped.headers["etag"]}
+        )
+
+    assert len(statements) == 1
+    assert "race_documents" in statements[0]
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in gzipped.headers["vary"]
+    assert gzipped.headers["etag"] == f"W/{assembled.headers['etag']}"
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == assembled.headers["etag"]
+    assert gzipped.json() == plain.json() == assembled.json()
+    assert cached.status_code == 304
+
+
+def test_document_fields_match_response_model() -> None:
+    """レース詳細の文書の列が応答モデルのフィールドと一致すること"""
+    assert RACE_DETAIL_FIELDS == [
+        name for name in RaceDetailResponse.model_fields if name != "entries"
+    ]
+    assert set(ENTRY_FIELDS) == set(EntryResponse.model_fields) - {"horse", "corner_positions"}
+    assert HORSE_FIELDS == list(HorseResponse.model_fields)
+
+
+@pytest.mark.asyncio
+async def test_outdated_document_is_not_served(seeded_session: AsyncSession) -> None:
+    """文書の形が変わる前に作った文書は使わず、行から組み立てて返すこと"""
+    race = await seeded_session.scalar(select(Race))
+    assert race is not None
+    await refresh_race_documents(seeded_session, [race.id])
+    document = await seeded_session.get(RaceDocument, "202506010101")
+    assert document is not None
+    document.schema_tag = "outdated"
+    document.body = gzip.compress(b"{}")
+    await seeded_session.commit()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/races/202506010101")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "テスト記念"
+
+
+@pytest.mark.asyncio
+async def test_final_race_is_cached_briefly(seeded_session: AsyncSession) -> None:
+    """開催日を過ぎて全出走馬の記録がそろったレースは短い期間だけ確認なしでキャッシュさせること"""
+    race = await seeded_session.scalar(select(Race))
+    assert race is not None
+    race.num_entries = 1
+    await seeded_session.commit()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/races/202506010101")
+
+    assert response.headers["cache-control"] == f"public, max-age={settings.race_cache_max_age}"
+
+
+@pytest.mark.asyncio
+async def test_horse_conditional_get(seeded_session: AsyncSession) -> None:
+    """馬の情報も ETag が一致すれば 304 を返すこと"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/horses/2021104567")
+        cached = await client.get(
+            "/api/horses/2021104567", headers={"If-None-Match": f'W/{first.headers["etag"]}'}
+        )
+        other = await client.get("/api/horses/2021104567", headers={"If-None-Match": '"other"'})
+
+    assert first.headers["cache-control"] == "no-cache"
+    assert cached.status_code == 304
+    assert other.status_code == 200
+    assert other.json() == first.json()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoder", available_encoders())
+async def test_fast_json_matches_pydantic(
+    seeded_session: AsyncSession, monkeypatch: pytest.MonkeyPatch, encoder: str
+) -> None:
+    """検証を省いた応答が、response_model で直列化した場合と同じJSONになること"""
+    monkeypatch.setattr("app.core.encoding.settings", replace(settings, json_encoder=encoder))
+    # 過去成績の再取得はキューに積むだけにする
+    monkeypatch.setattr(
+        "app.api.routes.get_horse_refresh_queue", lambda: _RecordingQueue()
+    )
+    horse = await seeded_session.scalar(select(Horse))
+    assert horse is not None
+    seeded_session.add(
+        HorseStats(horse_id=horse.id, style="SENKO", speed=88.0, races_count=4)
+    )
+    await seeded_session.commit()
+
+    cases = [
+        ("/api/races/202506010101", RaceDetailResponse),
+        ("/api/races/202506010101/analysis", TypeAdapter(dict[str, HorseAnalysisResponse])),
+        ("/api/analysis/horses/2021104567", HorseAnalysisResponse),
+    ]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for path, model in cases:
+            response = await client.get(path)
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            validated = (
+                model.validate_json(response.content)
+                if isinstance(model, TypeAdapter)
+                else model.model_validate_json(response.content)
+            )
+            expected = (
+                model.dump_json(validated)
+                if isinstance(model, TypeAdapter)
+                else validated.model_dump_json()
+            )
+            assert json.loads(response.content) == json.loads(expected)
+
+
 @pytest.mark.asyncio
 async def test_list_races_filter_by_venue(seeded_session: AsyncSession) -> None:
     """会場名でフィルタリングできること"""
@@ -180,3 +391,131 @@ async def test_list_races_filter_by_venue(seeded_session: AsyncSession) -> None:
         response = await client.get("/api/races", params={"venue": "中山"})
         assert response.status_code == 200
         assert len(response.json()) == 0
+
+
+@pytest.mark.asyncio
+async def test_list_races_keyset_pagination(test_session: AsyncSession) -> None:
+    """カーソルをたどると新しい順に重複・漏れなく全件を取得でき、総件数も返ること"""
+    get_race_count_cache().clear()
+    # 同じ日のレースを含む 7件
+    test_session.add_all(
+        Race(
+            race_id=f"20250{month}0101{number:02d}", name=f"レース{month}-{number}",
+            date=date(2025, month, 1), venue="東京", course_type="芝", distance=1600,
+        )
+        for month in (4, 5, 6)
+        for number in range(1, 4 if month != 6 else 2)
+    )
+    await test_session.commit()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        pages: list[list[str]] = []
+        params: dict[str, str | int] = {"limit": 3, "include_total": "true"}
+        while True:
+            response = await client.get("/api/races", params=params)
+            assert response.status_code == 200
+            assert response.headers["X-Total-Count"] == "7"
+            pages.append([race["race_id"] for race in response.json()])
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+
+        # 総件数はレースが追加されたら数え直す
+        test_session.add(
+            Race(
+                race_id="202507010101", name="追加", date=date(2025, 7, 1),
+                venue="中山", course_type="芝", distance=1600,
+            )
+        )
+        await test_session.commit()
+        response = await client.get("/api/races", params={"include_total": "true"})
+        assert response.headers["X-Total-Count"] == "8"
+        response = await client.get(
+            "/api/races", params={"include_total": "true", "venue": "東京"}
+        )
+        assert response.headers["X-Total-Count"] == "7"
+
+        response = await client.get("/api/races", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+    assert pages == [
+        ["202506010101", "202505010101", "202505010102"],
+        ["202505010103", "202504010101", "202504010102"],
+        ["202504010103"],
+    ]
+
+
+class _RecordingQueue:
+    """投入されたジョブIDを記録するだけのジョブキュー"""
+
+    def __init__(self) -> None:
+        self.submitted: list[int] = []
+
+    def submit(self, job_id: int) -> bool:
+        self.submitted.append(job_id)
+        return True
+
+
+@pytest.fixture
+def job_queue(monkeypatch: pytest.MonkeyPatch) -> _RecordingQueue:
+    queue = _RecordingQueue()
+    monkeypatch.setattr("app.api.routes.get_job_queue", lambda: queue)
+    return queue
+
+
+@pytest.mark.asyncio
+async def test_scrape_enqueues_job(test_session: AsyncSession, job_queue: _RecordingQueue) -> None:
+    """スクレイプはジョブとして登録され、すぐに 202 が返ること"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/scrape", json={"date": "20250601"})
+        assert response.status_code == 202
+        job = response.json()
+        assert job["kind"] == "date"
+        assert job["status"] == "pending"
+        assert job["date_from"] == job["date_to"] == "2025-06-01"
+        assert job["dates"] == {"pending": 1}
+        assert job_queue.submitted == [job["job_id"]]
+
+        # 未完了の同じジョブがあれば新しく作らない
+        again = await client.post("/api/scrape", json={"date": "20250601"})
+        assert again.json()["job_id"] == job["job_id"]
+
+        status = await client.get(f"/api/scrape/jobs/{job['job_id']}")
+        assert status.status_code == 200
+        assert status.json()["status"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_scrape_range_enqueues_job(
+    test_session: AsyncSession, job_queue: _RecordingQueue
+) -> None:
+    """期間指定のジョブは日付ごとの進捗行を持つこと"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/scrape/range", json={"date_from": "2025-06-01", "date_to": "2025-06-07"}
+        )
+        assert response.status_code == 202
+        assert response.json()["dates"] == {"pending": 7}
+
+        invalid = await client.post(
+            "/api/scrape/range", json={"date_from": "2025-06-07", "date_to": "2025-06-01"}
+        )
+        assert invalid.status_code == 422
+
+        too_long = await client.post(
+            "/api/scrape/range", json={"date_from": "2020-01-01", "date_to": "2025-06-01"}
+        )
+        assert too_long.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_scrape_job_not_found(test_session: AsyncSession) -> None:
+    """存在しないジョブIDで404が返ること"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/scrape/jobs/999")
+
+    assert response.status_code == 404
@@ -0,0 +1,220 @@
+"""
+HTTPクライアント・レートリミッターのテスト
+
+httpx.MockTransport を使い、netkeiba.com へは実際にアクセスしない。
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.scraper import ARCHIVE_PENDING_TTL, PAGE_HORSE_RESULT, PAGE_RACE_RESULT
+from app.scraper.archive import RawPageArchive, is_final_page
+from app.scraper.client import ScraperClient
+from app.scraper.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    """トークンバケットのテスト"""
+
+    def test_reserve_spacing(self) -> None:
+        """バケットが空になった後は 1/rate 秒ずつ間隔が空くこと"""
+        limiter = RateLimiter(rate=10.0, burst=1.0)
+
+        assert limiter.reserve() == 0.0
+        assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+        assert limiter.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_backoff_on_429(self) -> None:
+        """429 を受けるとレートが下がり、Retry-After の間は発行されないこと"""
+        limiter = RateLimiter(rate=10.0, burst=1.0, min_rate=1.0)
+
+        limiter.record_response(429, 0.1, retry_after=3.0)
+
+        assert limiter.rate == 5.0
+        assert limiter.reserve() >= 3.0
+
+    def test_backoff_floor(self) -> None:
+        """減速しても下限レートを下回らないこと"""
+        limiter = RateLimiter(rate=10.0, burst=1.0, min_rate=2.0)
+
+        for _ in range(10):
+            limiter.record_error()
+
+        assert limiter.rate == 2.0
+
+    def test_latency_degradation(self) -> None:
+        """レイテンシが基準より大きく悪化すると減速し、回復すると元に戻ること"""
+        limiter = RateLimiter(rate=10.0, burst=1.0, min_rate=1.0)
+
+        for _ in range(5):
+            limiter.record_response(200, 0.1)
+        assert limiter.rate == 10.0
+
+        for _ in range(10):
+            limiter.record_response(200, 2.0)
+        assert limiter.rate < 10.0
+
+        for _ in range(100):
+            limiter.record_response(200, 0.1)
+        assert limiter.rate == 10.0
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> RawPageArchive:
+    """テスト用の一時アーカイブ"""
+    return RawPageArchive(tmp_path / "raw")
+
+
+def _make_client(
+    transport: httpx.MockTransport, archive: RawPageArchive, max_concurrency: int = 4
+) -> ScraperClient:
+    """モックトランスポートを差し込んだクライアントを作る"""
+    limiter = RateLimiter(rate=1000.0, burst=100.0)
+    client = ScraperClient(limiter=limiter, max_concurrency=max_concurrency, archive=archive)
+    client._client = httpx.AsyncClient(transport=transport)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_fetch_pages_bounded_concurrency(archive: RawPageArchive) -> None:
+    """同時実行数が max_concurrency を超えないこと"""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, content=str(request.url).encode("utf-8"))
+
+    client = _make_client(httpx.MockTransport(handler), archive, max_concurrency=3)
+    urls = [f"https://db.netkeiba.com/race/2025060101{i:02d}/" for i in range(1, 13)]
+    try:
+        pages = await client.fetch_pages(urls)
+    finally:
+        await client.close()
+
+    assert pages == urls
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_retries_on_server_error(archive: RawPageArchive) -> None:
+    """5xx の後にリトライして取得できること"""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, content="レース結果".encode("euc-jp"))
+
+    client = _make_client(httpx.MockTransport(handler), archive)
+    try:
+        html = await client.fetch_page("https://db.netkeiba.com/race/202506010101/")
+    finally:
+        await client.close()
+
+    assert html == "レース結果"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_race_results_collects_errors(archive: RawPageArchive) -> None:
+    """失敗したレースは例外として返り、他のレースは取得できること"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "202506010102" in str(request.url):
+            return httpx.Response(404)
+        return httpx.Response(200, content=b"ok")
+
+    client = _make_client(httpx.MockTransport(handler), archive)
+    try:
+        pages = await client.fetch_race_results(["202506010101", "202506010102"])
+    finally:
+        await client.close()
+
+    assert pages["202506010101"] == "ok"
+    assert isinstance(pages["202506010102"], httpx.HTTPStatusError)
+
+
+# 結果の表がある（確定済みの）レース結果ページ
+_RESULT_PAGE = b'<table class="race_table_01"><tr><td><a href="/horse/2021104567/">A</a></td></tr>'
+
+
+class TestRawPageArchive:
+    """HTMLアーカイブのテスト"""
+
+    def test_put_and_get(self, archive: RawPageArchive) -> None:
+        """保存した本文を取得できること"""
+        url = "https://db.netkeiba.com/race/202506010101/"
+        archive.put(url, PAGE_RACE_RESULT, "<html>結果</html>".encode("euc-jp"))
+
+        assert archive.get(url, PAGE_RACE_RESULT) == "<html>結果</html>".encode("euc-jp")
+        assert archive.get(url, PAGE_HORSE_RESULT) is None
+
+    def test_content_addressed(self, archive: RawPageArchive) -> None:
+        """同じ本文は1つのオブジェクトとして保存されること"""
+        archive.put("https://db.netkeiba.com/race/1/", PAGE_RACE_RESULT, b"same")
+        archive.put("https://db.netkeiba.com/race/2/", PAGE_RACE_RESULT, b"same")
+
+        objects = list((archive.root / "objects").glob("*/*.html.gz"))
+        assert len(objects) == 1
+        assert len(list(archive.iter_pages(PAGE_RACE_RESULT))) == 2
+
+    def test_ttl_expired(self, archive: RawPageArchive, monkeypatch: pytest.MonkeyPatch) -> None:
+        """馬の戦績ページは有効期限切れで再取得対象になり、レース結果は無期限であること"""
+        horse_url = "https://db.netkeiba.com/horse/result/2021104567/"
+        race_url = "https://db.netkeiba.com/race/202506010101/"
+        archive.put(horse_url, PAGE_HORSE_RESULT, b"horse")
+        archive.put(race_url, PAGE_RACE_RESULT, _RESULT_PAGE)
+
+        later = time.time() + 365 * 24 * 60 * 60
+        monkeypatch.setattr(time, "time", lambda: later)
+
+        assert archive.get(horse_url, PAGE_HORSE_RESULT) is None
+        assert archive.get(race_url, PAGE_RACE_RESULT) == _RESULT_PAGE
+
+    def test_pending_race_result_expires(
+        self, archive: RawPageArchive, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """結果の掲載前に取得したレース結果ページは、短い有効期限で取得し直すこと"""
+        race_url = "https://db.netkeiba.com/race/202506010101/"
+        pending = b"<html><p>This race has not been run yet</p></html>"
+        archive.put(race_url, PAGE_RACE_RESULT, pending)
+        assert archive.get(race_url, PAGE_RACE_RESULT) == pending
+
+        later = time.time() + ARCHIVE_PENDING_TTL + 1
+        monkeypatch.setattr(time, "time", lambda: later)
+
+        assert archive.get(race_url, PAGE_RACE_RESULT) is None
+        assert not is_final_page(PAGE_RACE_RESULT, pending)
+        assert is_final_page(PAGE_RACE_RESULT, _RESULT_PAGE)
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_reads_through_archive(archive: RawPageArchive) -> None:
+    """2回目の取得はアーカイブから返り、ネットワークにアクセスしないこと"""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, content="レース結果".encode("euc-jp"))
+
+    client = _make_client(httpx.MockTransport(handler), archive)
+    try:
+        first = await client.fetch_race_result("202506010101")
+        second = await client.fetch_race_result("202506010101")
+    finally:
+        await client.close()
+
+    assert first == second == "レース結果"
+    assert calls == 1
@@ -0,0 +1,58 @@
+"""
+DB接続（SQLite の性能プロファイルと書き込み/読み出しエンジン）のテスト
+"""
+
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.database import (
+    SQLITE_PROFILE_DEFAULT,
+    SQLITE_PROFILE_PERFORMANCE,
+    create_db_engine,
+    sqlite_pragmas,
+)
+
+
+def test_sqlite_pragmas_by_profile() -> None:
+    """性能プロファイルでだけ WAL 等を設定し、読み出し用には query_only を付けること"""
+    performance = sqlite_pragmas(replace(settings, sqlite_profile=SQLITE_PROFILE_PERFORMANCE))
+    default = sqlite_pragmas(replace(settings, sqlite_profile=SQLITE_PROFILE_DEFAULT), True)
+
+    assert "PRAGMA journal_mode=WAL" in performance
+    assert "PRAGMA synchronous=NORMAL" in performance
+    assert "PRAGMA query_only=ON" not in performance
+    assert default == [
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        "PRAGMA query_only=ON",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reader_and_writer_engines(tmp_path: Path) -> None:
+    """ファイルDBで WAL が有効になり、読み出し用エンジンからは書き込めないこと"""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'keiba.db'}"
+    config = replace(settings, sqlite_profile=SQLITE_PROFILE_PERFORMANCE)
+    writer = create_db_engine(url, config)
+    reader = create_db_engine(url, config, readonly=True, pool_size=2)
+    try:
+        async with writer.begin() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+            await conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+            await conn.execute(text("INSERT INTO t (id) VALUES (1)"))
+
+        async with reader.connect() as conn:
+            assert (await conn.execute(text("SELECT count(*) FROM t"))).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await conn.execute(text("INSERT INTO t (id) VALUES (2)"))
+
+        assert writer.pool.size() == 1
+        assert reader.pool.size() == 2
+    finally:
+        await reader.dispose()
+        await writer.dispose()
@@ -0,0 +1,106 @@
+"""
+スクレイプ進捗イベントのテスト
+
+イベントバスの上限・フィルタ、ScraperService からの配信、SSE の送出形式を検証する。
+"""
+
+import json
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.routes import _scrape_event_stream
+from app.scraper.events import (
+    EVENT_RACE_FAILED,
+    EVENT_RACE_SAVED,
+    EventBus,
+    ScrapeEvent,
+)
+from app.scraper.service import ScraperService
+from tests.test_service import _StubClient
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest() -> None:
+    """満杯の購読者は古いイベントから捨て、発行側を待たせないこと"""
+    bus = EventBus(maxsize=2)
+    subscription = bus.subscribe()
+
+    for i in range(3):
+        bus.publish(ScrapeEvent(EVENT_RACE_SAVED, race_id=str(i)))
+
+    assert subscription.dropped == 1
+    assert (await subscription.get()).race_id == "1"
+    assert (await subscription.get()).race_id == "2"
+
+
+@pytest.mark.asyncio
+async def test_subscribe_to_job() -> None:
+    """ジョブIDを指定した購読者はそのジョブのイベントだけを受け取ること"""
+    bus = EventBus(maxsize=1)
+    subscription = bus.subscribe(job_id=2)
+
+    bus.publish(ScrapeEvent(EVENT_RACE_SAVED, job_id=1, race_id="a"))
+    bus.publish(ScrapeEvent(EVENT_RACE_SAVED, job_id=2, race_id="b"))
+
+    assert (await subscription.get()).race_id == "b"
+
+    bus.unsubscribe(subscription)
+    for race_id in ("c", "d"):
+        bus.publish(ScrapeEvent(EVENT_RACE_SAVED, job_id=2, race_id=race_id))
+    assert subscription.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_service_publishes_race_events(db_session: AsyncSession) -> None:
+    """保存・失敗したレースごとにイベントが配信されること"""
+    bus = EventBus()
+    subscription = bus.subscribe()
+    client = _StubClient()
+    client.race_pages["202506010103"] = httpx.ConnectError("connection refused")
+    service = ScraperService(db_session, events=bus)
+    service._client = client  # type: ignore[assignment]
+
+    await service.scrape_date("20250601")
+
+    events = [await subscription.get() for _ in range(4)]
+    failed = [e for e in events if e.type == EVENT_RACE_FAILED]
+    saved = [e for e in events if e.type == EVENT_RACE_SAVED]
+    assert [e.race_id for e in failed] == ["202506010103"]
+    assert failed[0].data["error"] == "connection refused"
+    assert sorted(e.race_id for e in saved) == ["202506010101", "202506010102", "202506010104"]
+    assert saved[0].data["name"] == "テスト記念"
+    assert sorted(e.data["saved"] for e in saved) == [1, 2, 3]
+
+
+class _FakeRequest:
+    """切断されないリクエスト"""
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+@pytest.mark.asyncio
+async def test_event_stream_format() -> None:
+    """SSE の event/data 形式で送り出し、捨てたイベント数を通知すること"""
+    bus = EventBus(maxsize=1)
+    subscription = bus.subscribe()
+    bus.publish(ScrapeEvent(EVENT_RACE_SAVED, job_id=1, race_id="a"))
+    bus.publish(ScrapeEvent(EVENT_RACE_SAVED, job_id=1, race_id="b", data={"name": "テスト"}))
+
+    stream = _scrape_event_stream(_FakeRequest(), bus, subscription)  # type: ignore[arg-type]
+    dropped = await anext(stream)
+    message = await anext(stream)
+    await stream.aclose()
+
+    # 切断（ジェネレーターの終了）で購読が解除され、以降は配られない
+    for race_id in ("c", "d"):
+        bus.publish(ScrapeEvent(EVENT_RACE_SAVED, job_id=1, race_id=race_id))
+    assert subscription.dropped == 0
+
+    assert dropped == 'event: dropped\ndata: {"count": 1}\n\n'
+    assert message.startswith("event: race_saved\ndata: ")
+    payload = json.loads(message.removeprefix("event: race_saved\ndata: "))
+    assert payload["race_id"] == "b"
+    assert payload["data"] == {"name": "テスト"}
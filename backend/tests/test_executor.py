@@ -0,0 +1,50 @@
+"""
+パース実行環境のテスト
+
+プロセスプール・スレッドプールのどちらでも同じパース結果が得られることを確認する。
+"""
+
+import asyncio
+import dataclasses
+import pickle
+
+import pytest
+
+from app.scraper import executor as executor_module
+from app.scraper.executor import create_parse_executor, run_parser, shutdown_parse_executor
+from app.scraper.parser import parse_horse_page, parse_race_result_page
+from tests.fixtures.pages import SAMPLE_HORSE_HTML, SAMPLE_RACE_RESULT_HTML
+
+
+def test_parsed_pages_are_picklable() -> None:
+    """パース結果がプロセス間で受け渡しできること"""
+    race = parse_race_result_page(SAMPLE_RACE_RESULT_HTML, "202505010111")
+    horse = parse_horse_page(SAMPLE_HORSE_HTML, "2021104567")
+
+    assert pickle.loads(pickle.dumps(race)) == race
+    assert pickle.loads(pickle.dumps(horse)) == horse
+
+
+def test_unknown_mode() -> None:
+    """未知の実行方式はエラーになること"""
+    with pytest.raises(ValueError):
+        create_parse_executor("gpu")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["process", "thread", "inline"])
+async def test_run_parser(mode: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """各実行方式でイベントループ上と同じ結果が返ること"""
+    settings = dataclasses.replace(executor_module.settings, parse_executor=mode, parse_workers=2)
+    monkeypatch.setattr(executor_module, "settings", settings)
+    monkeypatch.setattr(executor_module, "_executor", None)
+    try:
+        results = await asyncio.gather(
+            run_parser(parse_race_result_page, SAMPLE_RACE_RESULT_HTML, "202505010111"),
+            run_parser(parse_horse_page, SAMPLE_HORSE_HTML, "2021104567"),
+        )
+    finally:
+        shutdown_parse_executor()
+
+    assert results[0] == parse_race_result_page(SAMPLE_RACE_RESULT_HTML, "202505010111")
+    assert results[1] == parse_horse_page(SAMPLE_HORSE_HTML, "2021104567")
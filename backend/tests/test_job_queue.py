@@ -0,0 +1,230 @@
+"""
+スクレイプジョブキューのテスト
+
+in-memory DB とスタブのHTTPクライアントでワーカーを動かし、ジョブの状態遷移を検証する。
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.database import create_db_engine, get_db
+from app.main import app
+from app.models import Base, Race, ScrapeJob
+from app.scraper.job_queue import ScrapeJobQueue
+from app.scraper.jobs import create_scrape_job, job_progress
+from app.scraper.service import ScraperService
+from tests.test_service import _StubClient
+
+
+@pytest.fixture
+async def session_factory() -> async_sessionmaker[AsyncSession]:  # type: ignore[misc]
+    """ワーカーとテストで同じ in-memory DB を共有するセッションファクトリ"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+def _stub_service(session: AsyncSession) -> ScraperService:
+    service = ScraperService(session)
+    service._client = _StubClient()  # type: ignore[assignment]
+    return service
+
+
+async def _create_job(
+    session_factory: async_sessionmaker[AsyncSession], day: date, status: str = "pending"
+) -> int:
+    async with session_factory() as session:
+        job = await create_scrape_job(session, "date", day, day)
+        job.status = status
+        await session.commit()
+        return job.id
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_submitted_job(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """投入したジョブがバックグラウンドで実行され、完了状態になること"""
+    queue = ScrapeJobQueue(session_factory, workers=2, service_factory=_stub_service)
+    await queue.start()
+    try:
+        job_id = await _create_job(session_factory, date(2025, 6, 1))
+        assert queue.submit(job_id)
+        assert not queue.submit(job_id)  # 投入済みのジョブは二重に入らない
+        await queue.join()
+    finally:
+        await queue.stop()
+
+    async with session_factory() as session:
+        job = await session.get(ScrapeJob, job_id)
+        assert job is not None
+        assert job.status == "completed"
+        assert await job_progress(session, job_id) == {
+            "dates": {"done": 1},
+            "races": {"saved": 4},
+        }
+        assert await session.scalar(select(func.count()).select_from(Race)) == 4
+
+
+@pytest.mark.asyncio
+async def test_start_requeues_unfinished_jobs(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """起動時に未完了のジョブを積み直して再開すること"""
+    interrupted = await _create_job(session_factory, date(2025, 6, 1), status="running")
+    finished = await _create_job(session_factory, date(2025, 6, 2), status="completed")
+
+    queue = ScrapeJobQueue(session_factory, service_factory=_stub_service)
+    await queue.start()
+    try:
+        await queue.join()
+    finally:
+        await queue.stop()
+
+    async with session_factory() as session:
+        job = await session.get(ScrapeJob, interrupted)
+        assert job is not None
+        assert job.status == "completed"
+        # 完了済みのジョブは実行されない
+        assert (await job_progress(session, finished))["dates"] == {"pending": 1}
+
+
+class _BlockingClient(_StubClient):
+    """指定した日付のレース一覧、または指定したレースの結果の取得で止まるクライアント"""
+
+    def __init__(self, block: str) -> None:
+        super().__init__()
+        self.block = block
+        self.blocked = asyncio.Event()
+
+    async def _wait_if_blocked(self, key: str) -> None:
+        if key == self.block:
+            self.blocked.set()
+            await asyncio.Event().wait()
+
+    async def fetch_race_list(self, date_str: str) -> str:
+        await self._wait_if_blocked(date_str)
+        return await super().fetch_race_list(date_str)
+
+    async def fetch_race_result(self, race_id: str) -> str:
+        await self._wait_if_blocked(race_id)
+        return await super().fetch_race_result(race_id)
+
+
+@pytest.mark.asyncio
+async def test_stop_keeps_job_resumable(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """停止で中断したジョブは失敗にならず、次の起動で残りの日付から再開すること"""
+    async with session_factory() as session:
+        job = await create_scrape_job(session, "range", date(2025, 6, 1), date(2025, 6, 2))
+        await session.commit()
+        job_id = job.id
+
+    client = _BlockingClient("20250602")
+
+    def blocking_service(session: AsyncSession) -> ScraperService:
+        service = ScraperService(session)
+        service._client = client  # type: ignore[assignment]
+        return service
+
+    queue = ScrapeJobQueue(session_factory, service_factory=blocking_service)
+    await queue.start()
+    queue.submit(job_id)
+    await asyncio.wait_for(client.blocked.wait(), timeout=5)
+    await queue.stop()
+
+    async with session_factory() as session:
+        interrupted = await session.get(ScrapeJob, job_id)
+        assert interrupted is not None
+        assert interrupted.status == "running"
+        assert interrupted.error is None
+        assert (await job_progress(session, job_id))["dates"] == {"done": 1, "pending": 1}
+
+    resumed_client = _StubClient()
+
+    def stub_service(session: AsyncSession) -> ScraperService:
+        service = ScraperService(session)
+        service._client = resumed_client  # type: ignore[assignment]
+        return service
+
+    queue = ScrapeJobQueue(session_factory, service_factory=stub_service)
+    await queue.start()
+    try:
+        await queue.join()
+    finally:
+        await queue.stop()
+
+    assert resumed_client.fetched_lists == ["20250602"]
+    async with session_factory() as session:
+        resumed = await session.get(ScrapeJob, job_id)
+        assert resumed is not None
+        assert resumed.status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_job_does_not_hold_writer_while_fetching(tmp_path: Path) -> None:
+    """ジョブが取得を待つ間は書き込み用の接続を返し、POST /api/scrape が待たされないこと"""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'keiba.db'}"
+    # 書き込み用と同じ接続1本のプール（接続を握ったままなら1秒で TimeoutError）
+    writer = create_db_engine(url, replace(settings, db_pool_timeout=1.0))
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(writer, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        job = await create_scrape_job(session, "range", date(2025, 6, 1), date(2025, 6, 1))
+        await session.commit()
+        job_id = job.id
+
+    # 4レース中3レースを保存した後、残りの1レースの取得で止まる
+    client = _BlockingClient("202506010104")
+
+    def blocking_service(session: AsyncSession) -> ScraperService:
+        service = ScraperService(session)
+        service._client = client  # type: ignore[assignment]
+        return service
+
+    async def override_get_db() -> AsyncIterator[AsyncSession]:
+        async with factory() as session:
+            yield session
+            await session.commit()
+
+    queue = ScrapeJobQueue(factory, service_factory=blocking_service)
+    await queue.start()
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        queue.submit(job_id)
+        await asyncio.wait_for(client.blocked.wait(), timeout=5)
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as http:
+            response = await http.post("/api/scrape", json={"date": "20250602"})
+
+        assert response.status_code == 202
+        # 取得を待つ前に、保存済みの3レースはコミットされている
+        for _ in range(50):
+            async with factory() as session:
+                saved = await session.scalar(select(func.count()).select_from(Race))
+            if saved == 3:
+                break
+            await asyncio.sleep(0.05)
+        assert saved == 3
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await queue.stop()
+        await writer.dispose()
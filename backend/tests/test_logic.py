@@ -0,0 +1,95 @@
+"""
+脚質判定のテスト
+
+頭数による正規化と、多数の馬をまとめて判定する一括APIを検証する。
+"""
+
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from app.predictor.analysis import CORNER_COLUMNS, summarize_histories
+from app.predictor.logic import (
+    RunningStyle,
+    classify_horses,
+    corner_position_rates,
+    determine_running_style,
+    passing_position_rates,
+)
+from app.scraper.mapping import corner_positions
+
+
+def test_position_rates_normalized_by_field_size() -> None:
+    """同じ通過順でも頭数が少ないレースほど後方の位置取りになること"""
+    rates = passing_position_rates(
+        ["5-5-5", "5-5-5", "1-1", "9-x-3", None, "20-20"],
+        [9, 17, 0, 16, 16, 18],
+    )
+
+    assert rates[0] == 0.5
+    assert rates[1] == 0.25
+    assert rates[2] == 0.0  # 頭数不明でも先頭は 0.0
+    assert np.isnan(rates[3])  # 数値でない区間を含む
+    assert np.isnan(rates[4])
+    assert rates[5] == 1.0  # 頭数を超える通過順は最後方に収める
+
+
+def test_corner_rates_match_passing_orders() -> None:
+    """数値化済みのコーナー順位からも、通過順の文字列と同じ位置取りになること"""
+    orders = ["3-3-2-1", "5-4", "", "9-x"]
+    field = [16, 12, 0, 16]
+    corners = np.array(
+        [[np.nan if p is None else p for p in corner_positions(o)] for o in orders]
+    )
+
+    np.testing.assert_allclose(
+        corner_position_rates(corners, field), passing_position_rates(orders, field)
+    )
+
+
+def test_classify_horses_batch() -> None:
+    """1出走1要素の配列から、馬ごとの脚質をまとめて判定すること"""
+    rates = passing_position_rates(
+        ["1-1-1", "2-1", "8-8-6", "12-12-10", "", "14-14"],
+        [16, 16, 16, 16, 16, 8],
+    )
+    result = classify_horses([1, 1, 2, 2, 3, 4], rates)
+
+    assert result.loc[1, "style"] == RunningStyle.NIGE.value
+    assert result.loc[2, "style"] == RunningStyle.SASHI.value
+    assert result.loc[3, "style"] == RunningStyle.UNKNOWN.value
+    assert result.loc[4, "style"] == RunningStyle.OIKOMI.value
+    assert result.loc[1, "position_rate"] < result.loc[2, "position_rate"]
+
+
+def test_single_horse_matches_batch() -> None:
+    """1頭用の determine_running_style が一括判定と同じ結果になること"""
+    samples = {
+        1: ["1-1-1", "2-3"],
+        2: ["4-5-6", None, ""],
+        3: ["8-9-x", "7-7-7"],
+        4: ["12-13-14"],
+        5: [None],
+    }
+    history = pd.DataFrame(
+        [
+            {
+                "horse_id": horse_id, "date": date(2024, 1, 1), "num_entries": 0,
+                **dict(zip(CORNER_COLUMNS, corner_positions(order), strict=True)),
+                "passing_order": order,
+                "last_3f": None, "races_count": len(orders),
+            }
+            for horse_id, orders in samples.items()
+            for order in orders
+        ]
+    )
+    summary = summarize_histories(history, [*samples, 6])
+
+    for horse_id, orders in samples.items():
+        expected = determine_running_style([SimpleNamespace(passing_order=o) for o in orders])
+        assert summary.at[horse_id, "style"] == expected.value
+    assert determine_running_style([]) == RunningStyle.UNKNOWN
+    assert summary.at[6, "style"] == RunningStyle.UNKNOWN.value
+    assert summary.at[6, "races_count"] == 0
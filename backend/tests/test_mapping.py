@@ -0,0 +1,55 @@
+"""
+パース結果 → DBカラム変換のテスト
+
+文字列カラムから集計用の数値カラムへの変換を検証する。
+"""
+
+import pytest
+
+from app.scraper.mapping import corner_positions, finish_time_seconds, margin_lengths
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("1:33.5", 93.5), ("2:01.0", 121.0), ("59.8", 59.8), ("", None), (None, None), ("計不", None)],
+)
+def test_finish_time_seconds(value: str | None, expected: float | None) -> None:
+    """走破タイムを秒に変換すること"""
+    assert finish_time_seconds(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("3-3-2-1", [3, 3, 2, 1]),
+        ("5-4", [None, None, 5, 4]),  # コーナーが2つのレースは後ろ詰め
+        ("1-2-3-4-5", [2, 3, 4, 5]),
+        ("9-x", [None, None, None, None]),
+        ("", [None, None, None, None]),
+    ],
+)
+def test_corner_positions(value: str, expected: list[int | None]) -> None:
+    """通過順をコーナーごとの順位に変換すること"""
+    assert corner_positions(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("ハナ", 0.05),
+        ("クビ", 0.25),
+        ("1/2", 0.5),
+        ("1.1/2", 1.5),
+        ("1 1/2", 1.5),
+        ("2.3/4", 2.75),
+        ("3", 3.0),
+        ("大", 10.0),
+        ("同着", 0.0),
+        ("", None),
+        ("-0.3", None),  # 戦績ページの秒差は馬身にしない
+        ("0.5", None),
+    ],
+)
+def test_margin_lengths(value: str, expected: float | None) -> None:
+    """着差の表記を馬身に変換すること"""
+    assert margin_lengths(value) == expected
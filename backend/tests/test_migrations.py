@@ -0,0 +1,166 @@
+"""
+スキーマのマイグレーションと索引のテスト
+
+主要なクエリが EXPLAIN QUERY PLAN で索引を使い、テーブル全体を走査しないことを確認する。
+"""
+
+from datetime import date
+from typing import Any
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api.pagination import encode_race_cursor
+from app.core.migrations import MIGRATIONS, get_schema_version, run_migrations
+from app.models import Base
+from app.predictor.analysis import load_histories
+
+
+async def _index_names(conn: AsyncConnection, table: str) -> set[str]:
+    rows = await conn.execute(text(f"PRAGMA index_list({table})"))
+    return {row[1] for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_migrations_upgrade_existing_db() -> None:
+    """バージョン管理以前のDBに列と索引が追加され、バージョンが記録されること"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # 索引と数値カラムがない頃の状態に戻す
+        await conn.execute(text("DROP INDEX ix_race_entries_horse_id"))
+        await conn.execute(text("DROP INDEX ix_races_date_race_id"))
+        await conn.execute(text("DROP INDEX ix_races_venue_date_race_id"))
+        await conn.execute(text("ALTER TABLE race_entries DROP COLUMN margin_lengths"))
+        assert await conn.run_sync(get_schema_version) == 0
+
+        applied = await conn.run_sync(run_migrations)
+
+        assert applied == [migration.version for migration in MIGRATIONS]
+        assert await conn.run_sync(get_schema_version) == MIGRATIONS[-1].version
+        assert "ix_race_entries_horse_id" in await _index_names(conn, "race_entries")
+        assert {"ix_races_date_race_id", "ix_races_venue_date_race_id"} <= await _index_names(
+            conn, "races"
+        )
+        # 一覧用の索引に置き換えた古い索引は残らない
+        assert "ix_races_venue_date" not in await _index_names(conn, "races")
+        columns = {row[1] for row in await conn.execute(text("PRAGMA table_info(race_entries)"))}
+        assert "margin_lengths" in columns
+
+        # 適用済みなら何もしない
+        assert await conn.run_sync(run_migrations) == []
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_first_migration_adds_only_its_columns() -> None:
+    """マイグレーション1は自分の列だけを足し、後のバージョンの列はそれぞれのマイグレーションに任せること"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("ALTER TABLE horses DROP COLUMN last_scraped_at"))
+        await conn.execute(text("ALTER TABLE horses DROP COLUMN data_version"))
+
+        await conn.run_sync(MIGRATIONS[0].upgrade)
+
+        columns = {row[1] for row in await conn.execute(text("PRAGMA table_info(horses)"))}
+        assert "last_scraped_at" in columns
+        assert "data_version" not in columns
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_migrations_on_fresh_db() -> None:
+    """create_all で作った新しいDBにも全マイグレーションがエラーなく適用されること"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        assert await conn.run_sync(run_migrations) == [m.version for m in MIGRATIONS]
+    await engine.dispose()
+
+
+async def _query_plans(session: AsyncSession, run: Any) -> list[str]:
+    """run() が発行した SELECT ごとに EXPLAIN QUERY PLAN を取り、計画の行を返す"""
+    executed: list[tuple[str, Any]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            executed.append((statement, parameters))
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        await run()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+    connection = await session.connection()
+    details: list[str] = []
+    for statement, parameters in executed:
+        result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        details.extend(row[3] for row in result)
+    return details
+
+
+@pytest.mark.asyncio
+async def test_history_query_uses_horse_index(db_session: AsyncSession) -> None:
+    """過去成績の読み込みが race_entries を horse_id の索引で検索すること"""
+    plans = await _query_plans(db_session, lambda: load_histories(db_session, [1, 2, 3]))
+
+    assert any("race_entries USING INDEX ix_race_entries_horse_id" in p for p in plans)
+    assert not any(p.startswith("SCAN race_entries") for p in plans)
+    assert not any(p.startswith("SCAN races") for p in plans)
+
+
+async def _race_list_plans(session: AsyncSession, params: dict[str, str]) -> list[str]:
+    """GET /api/races が発行したクエリの実行計画"""
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.database import get_read_db
+    from app.main import app
+
+    async def override_get_read_db() -> AsyncSession:  # type: ignore[misc]
+        yield session
+
+    async def _list() -> None:
+        response = await client.get("/api/races", params=params)
+        assert response.status_code == 200
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            return await _query_plans(session, _list)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_race_list_query_uses_venue_date_index(db_session: AsyncSession) -> None:
+    """会場・日付で絞ったレース一覧が、索引の順に読むだけで並べ替えなしに返ること"""
+    plans = await _race_list_plans(
+        db_session,
+        {
+            "venue": "東京",
+            "date_from": date(2025, 1, 1).isoformat(),
+            "date_to": date(2025, 12, 31).isoformat(),
+            "cursor": encode_race_cursor(date(2025, 6, 1), "202506010101"),
+            "include_total": "true",
+        },
+    )
+
+    assert any("races USING INDEX ix_races_venue_date_race_id" in p for p in plans)
+    assert not any(p.startswith("SCAN races") for p in plans)
+    assert not any("TEMP B-TREE" in p for p in plans)
+
+
+@pytest.mark.asyncio
+async def test_race_list_pages_without_sort(db_session: AsyncSession) -> None:
+    """絞り込みなしのレース一覧も、並び順の索引を読むだけで次のページを返すこと"""
+    cursor = encode_race_cursor(date(2025, 6, 1), "202506010101")
+    plans = await _race_list_plans(db_session, {"cursor": cursor})
+
+    assert any("races USING INDEX ix_races_date_race_id" in p for p in plans)
+    assert not any("TEMP B-TREE" in p for p in plans)
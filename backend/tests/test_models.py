@@ -7,10 +7,16 @@ Race, Horse, RaceEntry のCRUD操作をテストする。
 from datetime import date
 
 import pytest
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
 
-from app.models import Horse, Race, RaceEntry
+from app.core.migrations import (
+    _add_data_versions,
+    _add_missing_columns,
+    _backfill_entry_numbers,
+)
+from app.models import Base, Horse, Race, RaceEntry
 
 
 @pytest.mark.asyncio
@@ -186,3 +192,63 @@ async def test_unique_constraint_race_horse(db_session: AsyncSession) -> None:
 
     with pytest.raises(IntegrityError):
         await db_session.flush()
+
+
+@pytest.mark.asyncio
+async def test_add_missing_columns() -> None:
+    """既存テーブルにバージョン管理以前の列が足され、後の列は後のマイグレーションで足されること"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        # last_scraped_at 列がない古い horses テーブル
+        await conn.execute(
+            text(
+                "CREATE TABLE horses "
+                "(id INTEGER PRIMARY KEY, horse_id VARCHAR(20), name VARCHAR(50))"
+            )
+        )
+        await conn.execute(
+            text("INSERT INTO horses (horse_id, name) VALUES ('2021104567', 'テスト')")
+        )
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+
+        columns = {row[1] for row in await conn.execute(text("PRAGMA table_info(horses)"))}
+        assert "last_scraped_at" in columns
+        assert "data_version" not in columns
+
+        await conn.run_sync(_add_data_versions)
+        # 既存の行は残り、既定値を持つ NOT NULL の列は既定値で埋まる
+        assert await conn.scalar(text("SELECT name FROM horses")) == "テスト"
+        assert await conn.scalar(text("SELECT data_version FROM horses")) == 1
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_backfill_entry_numbers(db_session: AsyncSession) -> None:
+    """既存の出走記録の数値カラムが文字列カラムから埋まること"""
+    race = Race(
+        race_id="202506010101", name="テスト", date=date(2025, 6, 1),
+        venue="東京", course_type="芝", distance=2000,
+    )
+    horse = Horse(horse_id="2021104567", name="テスト")
+    db_session.add_all([race, horse])
+    await db_session.flush()
+    db_session.add(
+        RaceEntry(
+            race_id=race.id, horse_id=horse.id, horse_number=1,
+            finish_time="1:33.5", passing_order="2-2", margin="クビ",
+        )
+    )
+    await db_session.commit()
+
+    connection = await db_session.connection()
+    assert await connection.run_sync(_backfill_entry_numbers, 1) == 1
+
+    entry = await db_session.scalar(
+        select(RaceEntry).execution_options(populate_existing=True)
+    )
+    assert entry is not None
+    assert entry.finish_time_sec == 93.5
+    assert (entry.pass_1, entry.pass_2, entry.pass_3, entry.pass_4) == (None, None, 2, 2)
+    assert entry.margin_lengths == 0.25
@@ -1,101 +1,31 @@
 """
 HTMLパーサーのテスト
 
-モックHTMLを使用してパースロジックを単体テストする。
+サンプルHTML (tests/fixtures/pages.py) を使用してパースロジックを単体テストする。
 netkeiba.comへの実際のアクセスは不要。
 """
 
+import pytest
+
+from app.scraper.dom import (
+    BACKEND_HTML_PARSER,
+    BACKEND_LXML,
+    BACKEND_SELECTOLAX,
+    available_backends,
+    parse_document,
+)
+from app.scraper.mapping import margin_lengths
 from app.scraper.parser import (
     ParsedEntryResult,
+    parse_horse_page,
     parse_race_list_page,
     parse_race_result_page,
 )
-
-# === モックHTML ===
-
-MOCK_RACE_RESULT_HTML = """
-<html>
-<head><title>テスト記念(G1) レース結果</title></head>
-<body>
-<p class="smalltxt">2025年6月1日 1回東京1日目</p>
-<h1 class="racedata_title">テスト記念</h1>
-<span>芝右2000m</span>
-<span>天候：晴</span>
-<span>芝：良</span>
-<span class="GradeIcon">G1</span>
-
-<table class="race_table_01">
-<tr><th>着順</th><th>枠番</th><th>馬番</th><th>馬名</th><th>性齢</th><th>斤量</th><th>騎手</th><th>タイム</th><th>着差</th><th>通過</th><th>上り</th><th>馬体重</th><th>単勝</th><th>人気</th><th>調教師</th></tr>
-<tr>
-  <td>1</td>
-  <td>3</td>
-  <td>5</td>
-  <td><a href="/horse/2021104567/">テストディープ</a></td>
-  <td>牡4</td>
-  <td>57.0</td>
-  <td>テスト騎手A</td>
-  <td>1:59.5</td>
-  <td></td>
-  <td>3-3-2-1</td>
-  <td>33.8</td>
-  <td>468(-4)</td>
-  <td>3.5</td>
-  <td>1</td>
-  <td><a href="/trainer/00001/">テスト調教師A</a></td>
-</tr>
-<tr>
-  <td>2</td>
-  <td>5</td>
-  <td>9</td>
-  <td><a href="/horse/2021104568/">テストアーモンド</a></td>
-  <td>牝4</td>
-  <td>55.0</td>
-  <td>テスト騎手B</td>
-  <td>1:59.8</td>
-  <td>クビ</td>
-  <td>5-5-4-2</td>
-  <td>33.5</td>
-  <td>456(+2)</td>
-  <td>5.2</td>
-  <td>2</td>
-  <td><a href="/trainer/00002/">テスト調教師B</a></td>
-</tr>
-<tr>
-  <td>3</td>
-  <td>7</td>
-  <td>13</td>
-  <td><a href="/horse/2021104569/">テストコントレイル</a></td>
-  <td>牡5</td>
-  <td>58.0</td>
-  <td>テスト騎手C</td>
-  <td>2:00.1</td>
-  <td>1 1/2</td>
-  <td>1-1-1-3</td>
-  <td>34.6</td>
-  <td>480(0)</td>
-  <td>12.4</td>
-  <td>5</td>
-  <td><a href="/trainer/00003/">テスト調教師C</a></td>
-</tr>
-</table>
-</body>
-</html>
-"""
-
-MOCK_RACE_LIST_HTML = """
-<html>
-<body>
-<div class="race_list">
-  <a href="/race/202506010101/">1R</a>
-  <a href="/race/202506010102/">2R</a>
-  <a href="/race/202506010103/">3R</a>
-  <a href="/race/202506010104/">4R</a>
-  <a href="/other/page/">その他リンク</a>
-</div>
-</body>
-</html>
-"""
-
+from tests.fixtures.pages import (
+    SAMPLE_HORSE_HTML,
+    SAMPLE_RACE_LIST_HTML,
+    SAMPLE_RACE_RESULT_HTML,
+)
 
 # === テスト ===
 
@@ -105,7 +35,7 @@ class TestParseRaceResultPage:
 
     def test_parse_race_info(self) -> None:
         """レース基本情報を正しくパースできること"""
-        result = parse_race_result_page(MOCK_RACE_RESULT_HTML, "202505010101")
+        result = parse_race_result_page(SAMPLE_RACE_RESULT_HTML, "202505010101")
         info = result.race_info
 
         assert info.race_id == "202505010101"
@@ -118,14 +48,14 @@ class TestParseRaceResultPage:
 
     def test_parse_entries_count(self) -> None:
         """出走馬の数が正しいこと"""
-        result = parse_race_result_page(MOCK_RACE_RESULT_HTML, "202505010101")
+        result = parse_race_result_page(SAMPLE_RACE_RESULT_HTML, "202505010101")
 
         assert len(result.entries) == 3
         assert result.race_info.num_entries == 3
 
     def test_parse_first_place(self) -> None:
         """1着馬のデータが正しくパースされること"""
-        result = parse_race_result_page(MOCK_RACE_RESULT_HTML, "202505010101")
+        result = parse_race_result_page(SAMPLE_RACE_RESULT_HTML, "202505010101")
         first: ParsedEntryResult = result.entries[0]
 
         assert first.finish_position == 1
@@ -146,7 +76,7 @@ class TestParseRaceResultPage:
 
     def test_parse_second_place(self) -> None:
         """2着馬の着差がパースされること"""
-        result = parse_race_result_page(MOCK_RACE_RESULT_HTML, "202505010101")
+        result = parse_race_result_page(SAMPLE_RACE_RESULT_HTML, "202505010101")
         second = result.entries[1]
 
         assert second.finish_position == 2
@@ -157,7 +87,7 @@ class TestParseRaceResultPage:
 
     def test_parse_third_place(self) -> None:
         """3着馬（逃げ馬）のデータが正しいこと"""
-        result = parse_race_result_page(MOCK_RACE_RESULT_HTML, "202505010101")
+        result = parse_race_result_page(SAMPLE_RACE_RESULT_HTML, "202505010101")
         third = result.entries[2]
 
         assert third.finish_position == 3
@@ -167,6 +97,47 @@ class TestParseRaceResultPage:
         assert third.horse_weight == 480
         assert third.horse_weight_diff == 0
 
+    def test_ignores_text_outside_race_header(self) -> None:
+        """ナビゲーション・フッターのテキストをレース情報として拾わないこと"""
+        html = SAMPLE_RACE_RESULT_HTML.replace(
+            "<body>",
+            "<body><div class='nav'><span>ダ左1200m 特集</span><span>天候：雨</span></div>",
+        ).replace("</body>", "<div class='footer'><span>芝：不良</span></div></body>")
+        info = parse_race_result_page(html, "202505010101").race_info
+
+        assert info.course_type == "芝"
+        assert info.distance == 2000
+        assert info.direction == "右"
+        assert info.weather == "晴"
+        assert info.track_condition == "良"
+        assert len(parse_race_result_page(html, "202505010101").entries) == 3
+
+    def test_grade_from_race_name(self) -> None:
+        """グレードアイコンがない場合はレース名のローマ数字表記から推定すること"""
+        html = SAMPLE_RACE_RESULT_HTML.replace('<span class="GradeIcon">G1</span>', "").replace(
+            ">テスト記念</h1>", ">テスト杯(GII)</h1>"
+        )
+        info = parse_race_result_page(html, "202505010101").race_info
+
+        assert info.name == "テスト杯(GII)"
+        assert info.race_class == "G2"
+
+    def test_columns_follow_header(self) -> None:
+        """見出しの並びが変わっても各フィールドを正しく読むこと"""
+        html = SAMPLE_RACE_RESULT_HTML.replace(
+            "<th>馬体重</th><th>単勝</th><th>人気</th>",
+            "<th>単勝</th><th>人気</th><th>馬体重</th>",
+        ).replace(
+            "<td>468(-4)</td>\n  <td>3.5</td>\n  <td>1</td>",
+            "<td>3.5</td>\n  <td>1</td>\n  <td>468(-4)</td>",
+        )
+        first = parse_race_result_page(html, "202505010101").entries[0]
+
+        assert first.odds == 3.5
+        assert first.popularity == 1
+        assert first.horse_weight == 468
+        assert first.horse_weight_diff == -4
+
     def test_empty_html(self) -> None:
         """空っぽのHTMLでもクラッシュしないこと"""
         result = parse_race_result_page("<html><body></body></html>", "000000000000")
@@ -180,7 +151,7 @@ class TestParseRaceListPage:
 
     def test_parse_race_ids(self) -> None:
         """レースIDを正しく抽出すること"""
-        race_ids = parse_race_list_page(MOCK_RACE_LIST_HTML)
+        race_ids = parse_race_list_page(SAMPLE_RACE_LIST_HTML)
 
         assert len(race_ids) == 4
         assert "202506010101" in race_ids
@@ -201,3 +172,144 @@ class TestParseRaceListPage:
         """レースリンクがないHTMLでは空リストが返ること"""
         race_ids = parse_race_list_page("<html><body>no races</body></html>")
         assert race_ids == []
+
+
+class TestParseHorsePage:
+    """馬の戦績ページのパーステスト"""
+
+    def test_parse_profile(self) -> None:
+        """馬の基本情報・血統を正しくパースできること"""
+        result = parse_horse_page(SAMPLE_HORSE_HTML, "2021104567")
+
+        assert result.horse_id == "2021104567"
+        assert result.name == "テストディープ"
+        assert result.sex == "牡"
+        assert result.age == 4
+        assert result.trainer == "テスト調教師A"
+        assert result.sire == "テストサイアー"
+        assert result.dam == "テストマザー"
+
+    def test_parse_history(self) -> None:
+        """過去成績の各行をパースできること"""
+        result = parse_horse_page(SAMPLE_HORSE_HTML, "2021104567")
+
+        assert len(result.history) == 2
+        first = result.history[0]
+        assert first.race_id == "202505010111"
+        assert first.date == "2025-06-01"
+        assert first.race_name == "テスト記念(G1)"
+        assert first.bracket_number == 3
+        assert first.horse_number == 5
+        assert first.odds == 3.5
+        assert first.popularity == 1
+        assert first.finish_position == 1
+        assert first.num_entries == 16
+        assert first.jockey == "テスト騎手A"
+        assert first.weight_carried == 57.0
+        assert first.track_condition == "良"
+        assert first.course_type == "芝"
+        assert first.distance == 2000
+        assert first.finish_time == "1:59.5"
+        assert first.passing_order == "3-3-2-1"
+        assert first.last_3f == 33.8
+        assert first.horse_weight == 468
+        assert first.horse_weight_diff == -4
+
+    def test_parse_scratched(self) -> None:
+        """取消の行はステータスが scratched になること"""
+        result = parse_horse_page(SAMPLE_HORSE_HTML, "2021104567")
+        second = result.history[1]
+
+        assert second.status == "scratched"
+        assert second.finish_position is None
+        assert second.course_type == "ダート"
+        assert second.distance == 1800
+        assert second.track_condition == "稍"
+
+    def test_columns_follow_header(self) -> None:
+        """列が追加されても見出しに従って各フィールドを読むこと"""
+        html = SAMPLE_HORSE_HTML.replace("<th>R</th>", "<th>R</th><th>賞金</th>").replace(
+            "<td>11</td>", "<td>11</td><td>20000.0</td>"
+        )
+        result = parse_horse_page(html, "2021104567")
+        first = result.history[0]
+
+        assert first.race_id == "202505010111"
+        assert first.horse_number == 5
+        assert first.odds == 3.5
+        assert first.finish_position == 1
+        assert first.num_entries == 16
+        assert first.distance == 2000
+        assert first.last_3f == 33.8
+        assert first.horse_weight == 468
+
+    def test_unmeasured_horse_weight(self) -> None:
+        """馬体重が「計不」でも行が欠けないこと"""
+        html = SAMPLE_HORSE_HTML.replace("<td>472(+6)</td>", "<td>計不</td>")
+        result = parse_horse_page(html, "2021104567")
+
+        assert len(result.history) == 2
+        assert result.history[1].horse_weight is None
+        assert result.history[1].horse_weight_diff is None
+
+
+@pytest.mark.parametrize("backend", [BACKEND_LXML, BACKEND_SELECTOLAX])
+class TestBackendParity:
+    """高速バックエンドが html.parser と同じパース結果を返すことのテスト"""
+
+    @pytest.fixture(autouse=True)
+    def _require_backend(self, backend: str) -> None:
+        if backend not in available_backends():
+            pytest.skip(f"{backend} is not installed")
+
+    def test_race_result_page(self, backend: str) -> None:
+        expected = parse_race_result_page(SAMPLE_RACE_RESULT_HTML, "202505010101")
+        actual = parse_race_result_page(SAMPLE_RACE_RESULT_HTML, "202505010101", backend=backend)
+        assert actual == expected
+
+    def test_race_list_page(self, backend: str) -> None:
+        expected = parse_race_list_page(SAMPLE_RACE_LIST_HTML)
+        assert parse_race_list_page(SAMPLE_RACE_LIST_HTML, backend=backend) == expected
+
+    def test_horse_page(self, backend: str) -> None:
+        expected = parse_horse_page(SAMPLE_HORSE_HTML, "2021104567")
+        assert parse_horse_page(SAMPLE_HORSE_HTML, "2021104567", backend=backend) == expected
+
+    def test_empty_html(self, backend: str) -> None:
+        result = parse_race_result_page("<html><body></body></html>", "000000000000", backend)
+        assert result.entries == []
+        assert parse_race_list_page("<html><body>no races</body></html>", backend) == []
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1 1/2", 1.5),
+        ("1.1/2", 1.5),
+        ("1/2", 0.5),
+        ("ハナ", 0.05),
+        ("0.5", None),  # 戦績ページの秒差
+    ],
+)
+def test_margin_lengths_formats(value: str, expected: float | None) -> None:
+    """結果ページの着差の表記を馬身に変換すること"""
+    assert margin_lengths(value) == expected
+
+
+def test_sample_page_margins_are_numeric() -> None:
+    """サンプルの結果ページの着差が全て馬身に変換できること"""
+    result = parse_race_result_page(SAMPLE_RACE_RESULT_HTML, "202505010101")
+    margins = [entry.margin for entry in result.entries if entry.margin]
+    assert margins
+    assert all(margin_lengths(margin) is not None for margin in margins)
+
+
+def test_unknown_backend() -> None:
+    """未知のバックエンド名はエラーになること"""
+    with pytest.raises(ValueError):
+        parse_document("<html></html>", "regex")
+
+
+def test_default_backend_available() -> None:
+    """追加依存なしの html.parser は常に利用できること"""
+    assert BACKEND_HTML_PARSER in available_backends()
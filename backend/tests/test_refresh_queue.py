@@ -0,0 +1,73 @@
+"""
+馬の過去成績の再取得キューのテスト
+
+in-memory DB とスタブのHTTPクライアントでワーカーを動かし、鮮度の判定と更新を検証する。
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Horse, HorseStats
+from app.scraper.refresh_queue import HorseRefreshQueue, history_is_stale
+from app.scraper.service import ScraperService
+from tests.test_job_queue import _stub_service, session_factory  # noqa: F401
+
+
+def test_history_is_stale() -> None:
+    """未取得・期限切れの馬だけが再取得の対象になること"""
+    now = datetime(2025, 6, 1, 12, 0)
+    assert history_is_stale(None, now)
+    assert history_is_stale(now - timedelta(days=30), now)
+    assert not history_is_stale(now - timedelta(hours=1), now)
+
+
+@pytest.mark.asyncio
+async def test_worker_refreshes_stale_horse(
+    session_factory: async_sessionmaker[AsyncSession],  # noqa: F811
+) -> None:
+    """積まれた馬の過去成績を取得し、取得日時と集計成績を更新すること"""
+    queue = HorseRefreshQueue(session_factory, service_factory=_stub_service)
+    await queue.start()
+    try:
+        assert queue.submit("2021104567")
+        assert not queue.submit("2021104567")  # 投入済みの馬は二重に入らない
+        await queue.join()
+    finally:
+        await queue.stop()
+
+    async with session_factory() as session:
+        horse = await session.scalar(select(Horse).where(Horse.horse_id == "2021104567"))
+        assert horse is not None
+        assert not history_is_stale(horse.last_scraped_at)
+        stats = await session.get(HorseStats, horse.id)
+        assert stats is not None
+        assert stats.races_count == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_skips_fresh_horse(
+    session_factory: async_sessionmaker[AsyncSession],  # noqa: F811
+) -> None:
+    """待っている間に取得済みになった馬は取得し直さないこと"""
+    async with session_factory() as session:
+        session.add(Horse(horse_id="2021104567", name="取得済み", last_scraped_at=datetime.now()))
+        await session.commit()
+
+    started: list[AsyncSession] = []
+
+    def recording_service(session: AsyncSession) -> ScraperService:
+        started.append(session)
+        return _stub_service(session)
+
+    queue = HorseRefreshQueue(session_factory, service_factory=recording_service)
+    await queue.start()
+    try:
+        queue.submit("2021104567")
+        await queue.join()
+    finally:
+        await queue.stop()
+
+    assert started == []
@@ -0,0 +1,170 @@
+"""
+アーカイブからのDB再構築のテスト
+
+一時ディレクトリのアーカイブにサンプルHTMLを保存し、再パース結果のDBを検証する。
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.core.migrations import MIGRATIONS
+from app.scraper import NETKEIBA_BASE_URL, PAGE_HORSE_RESULT, PAGE_RACE_RESULT
+from app.scraper.archive import RawPageArchive
+from app.scraper.reparse import MissingRacesError, rebuild_database
+from tests.fixtures.pages import SAMPLE_HORSE_HTML, SAMPLE_RACE_RESULT_HTML
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> RawPageArchive:
+    """レース結果1件・馬の戦績1件を保存したアーカイブ"""
+    archive = RawPageArchive(tmp_path / "raw")
+    archive.put(
+        f"{NETKEIBA_BASE_URL}/race/202505010111/",
+        PAGE_RACE_RESULT,
+        SAMPLE_RACE_RESULT_HTML.encode("euc-jp"),
+    )
+    archive.put(
+        f"{NETKEIBA_BASE_URL}/horse/result/2021104567/",
+        PAGE_HORSE_RESULT,
+        SAMPLE_HORSE_HTML.encode("euc-jp"),
+    )
+    return archive
+
+
+def test_rebuild_database(archive: RawPageArchive, tmp_path: Path) -> None:
+    """レース・馬・出走記録が一括で書き込まれること"""
+    output = tmp_path / "keiba.db"
+
+    stats = rebuild_database(archive, output, workers=2)
+
+    assert stats.race_pages == 1
+    assert stats.horse_pages == 1
+    assert stats.failed_pages == 0
+    # レース結果1件 + 戦績由来のスタブ1件
+    assert stats.races == 2
+    assert stats.horses == 3
+    # 結果ページ3頭 + スタブレースの1行（結果ページと重複する行は除外）
+    assert stats.entries == 4
+
+    with sqlite3.connect(output) as conn:
+        name, num_entries = conn.execute(
+            "SELECT name, num_entries FROM races WHERE race_id = '202505010111'"
+        ).fetchone()
+        assert name == "テスト記念"
+        assert num_entries == 3
+
+        sire, trainer = conn.execute(
+            "SELECT sire, trainer FROM horses WHERE horse_id = '2021104567'"
+        ).fetchone()
+        assert sire == "テストサイアー"
+        assert trainer == "テスト調教師A"
+
+        (count,) = conn.execute(
+            "SELECT COUNT(*) FROM race_entries e JOIN horses h ON h.id = e.horse_id "
+            "WHERE h.horse_id = '2021104567'"
+        ).fetchone()
+        assert count == 2
+
+
+def test_rebuild_replaces_existing_file(archive: RawPageArchive, tmp_path: Path) -> None:
+    """既存のDBファイルが差し替えられ、一時ファイルが残らないこと"""
+    output = tmp_path / "keiba.db"
+    output.write_bytes(b"old database")
+
+    rebuild_database(archive, output, workers=1)
+
+    with sqlite3.connect(output) as conn:
+        (count,) = conn.execute("SELECT COUNT(*) FROM races").fetchone()
+    assert count == 2
+    assert not (tmp_path / "keiba.db.rebuild").exists()
+
+
+def test_rebuild_skips_pages_without_results(archive: RawPageArchive, tmp_path: Path) -> None:
+    """結果の掲載前に取得したレース結果ページからはレースを作らないこと"""
+    archive.put(
+        f"{NETKEIBA_BASE_URL}/race/202506010101/",
+        PAGE_RACE_RESULT,
+        "<html><body>レース結果はまだありません</body></html>".encode("euc-jp"),
+    )
+    output = tmp_path / "keiba.db"
+
+    stats = rebuild_database(archive, output, workers=1)
+
+    assert stats.race_pages == 1
+    assert stats.failed_pages == 1
+    with sqlite3.connect(output) as conn:
+        assert conn.execute("SELECT 1 FROM races WHERE race_id = '202506010101'").fetchone() is None
+
+
+def test_rebuild_keeps_live_state(archive: RawPageArchive, tmp_path: Path) -> None:
+    """アーカイブにないジョブ・カレンダー・最終取得日時・版を差し替え前のDBから引き継ぐこと"""
+    output = tmp_path / "keiba.db"
+    rebuild_database(archive, output, workers=1)
+    with sqlite3.connect(output) as conn:
+        conn.execute(
+            "INSERT INTO scrape_jobs "
+            "(id, kind, date_from, date_to, status, created_at, updated_at) "
+            "VALUES (7, 'range', '2025-06-01', '2025-06-02', 'running', "
+            "'2025-06-03 00:00:00', '2025-06-03 00:00:00')"
+        )
+        conn.execute(
+            "INSERT INTO scrape_job_dates (job_id, date, status) VALUES (7, '2025-06-01', 'done')"
+        )
+        conn.execute(
+            "INSERT INTO race_calendar (date, race_ids, fetched_at) "
+            "VALUES ('2025-06-02', '', '2025-06-03 00:00:00')"
+        )
+        conn.execute(
+            "UPDATE horses SET last_scraped_at = '2025-06-10 12:00:00' "
+            "WHERE horse_id = '2021104567'"
+        )
+        conn.execute("UPDATE races SET data_version = 5 WHERE race_id = '202505010111'")
+
+    stats = rebuild_database(archive, output, workers=1)
+
+    assert stats.carried_rows > 0
+    with sqlite3.connect(output) as conn:
+        assert conn.execute("SELECT id, status FROM scrape_jobs").fetchall() == [(7, "running")]
+        assert conn.execute("SELECT status FROM scrape_job_dates").fetchall() == [("done",)]
+        assert conn.execute("SELECT date FROM race_calendar").fetchall() == [("2025-06-02",)]
+        (last_scraped_at,) = conn.execute(
+            "SELECT last_scraped_at FROM horses WHERE horse_id = '2021104567'"
+        ).fetchone()
+        assert last_scraped_at.startswith("2025-06-10 12:00:00")
+        # 内容が変わりうるので版は進める
+        (version,) = conn.execute(
+            "SELECT data_version FROM races WHERE race_id = '202505010111'"
+        ).fetchone()
+        assert version == 6
+        # 集計成績と文書は新しい内容から作り、スキーマのバージョンも記録する
+        (stats_count,) = conn.execute("SELECT COUNT(*) FROM horse_stats").fetchone()
+        (document_count,) = conn.execute("SELECT COUNT(*) FROM race_documents").fetchone()
+        (user_version,) = conn.execute("PRAGMA user_version").fetchone()
+    assert stats_count == 3
+    assert document_count == 2
+    assert user_version == MIGRATIONS[-1].version
+
+
+def test_rebuild_refuses_to_drop_races(archive: RawPageArchive, tmp_path: Path) -> None:
+    """差し替え前のDBにアーカイブにないレースがあれば、force なしでは差し替えないこと"""
+    output = tmp_path / "keiba.db"
+    rebuild_database(archive, output, workers=1)
+    with sqlite3.connect(output) as conn:
+        conn.execute(
+            "INSERT INTO races (race_id, name, date, venue, course_type, distance, data_version) "
+            "VALUES ('201001010101', '古いレース', '2010-01-01', '中山', '芝', 1600, 1)"
+        )
+
+    with pytest.raises(MissingRacesError) as excinfo:
+        rebuild_database(archive, output, workers=1)
+
+    assert excinfo.value.race_ids == ["201001010101"]
+    assert not (tmp_path / "keiba.db.rebuild").exists()
+    with sqlite3.connect(output) as conn:
+        assert conn.execute("SELECT 1 FROM races WHERE race_id = '201001010101'").fetchone()
+
+    rebuild_database(archive, output, workers=1, force=True)
+    with sqlite3.connect(output) as conn:
+        assert conn.execute("SELECT 1 FROM races WHERE race_id = '201001010101'").fetchone() is None
@@ -0,0 +1,438 @@
+"""
+スクレイパーサービスのテスト
+
+HTTPクライアントをモックHTMLを返すスタブに差し替え、DB保存の結果を検証する。
+netkeiba.comへの実際のアクセスは不要。
+"""
+
+import gzip
+import json
+from datetime import date, datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    Horse,
+    HorseStats,
+    Race,
+    RaceCalendar,
+    RaceDocument,
+    RaceEntry,
+    ScrapeJobDate,
+    ScrapeJobRace,
+)
+from app.scraper.service import ScraperService
+from tests.fixtures.pages import SAMPLE_HORSE_HTML, SAMPLE_RACE_LIST_HTML, SAMPLE_RACE_RESULT_HTML
+
+
+class _StubClient:
+    """ページ種別ごとに固定のHTMLを返すクライアント"""
+
+    def __init__(
+        self, race_html: str = SAMPLE_RACE_RESULT_HTML, horse_html: str = SAMPLE_HORSE_HTML
+    ) -> None:
+        self.race_html = race_html
+        self.horse_html = horse_html
+        # 日付・レースIDごとの差し替え（HTML または送出する例外）
+        self.race_lists: dict[str, str | Exception] = {}
+        self.race_pages: dict[str, str | Exception] = {}
+        # 取得したページの記録
+        self.fetched_lists: list[str] = []
+        self.fetched_races: list[str] = []
+
+    async def fetch_race_list(self, date_str: str) -> str:
+        self.fetched_lists.append(date_str)
+        page = self.race_lists.get(date_str, SAMPLE_RACE_LIST_HTML)
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    async def fetch_race_result(self, race_id: str) -> str:
+        self.fetched_races.append(race_id)
+        page = self.race_pages.get(race_id, self.race_html)
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    async def fetch_horse_page(self, horse_id: str) -> str:
+        return self.horse_html
+
+    async def close(self) -> None:
+        pass
+
+
+def _race_list_html(*race_ids: str) -> str:
+    links = "".join(f'<a href="/race/{race_id}/">R</a>' for race_id in race_ids)
+    return f"<html><body><div class='race_list'>{links}</div></body></html>"
+
+
+_NO_RACES_HTML = _race_list_html()
+
+
+@pytest.fixture
+def service(db_session: AsyncSession) -> ScraperService:
+    service = ScraperService(db_session)
+    service._client = _StubClient()  # type: ignore[assignment]
+    return service
+
+
+def _count_statements(session: AsyncSession) -> list[str]:
+    """セッションのエンジンで実行されたSQL文を記録するリストを返す"""
+    statements: list[str] = []
+
+    @event.listens_for(session.bind.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_scrape_race_saves_entries(service: ScraperService, db_session: AsyncSession) -> None:
+    """レース・出走馬・出走記録が保存されること"""
+    race = await service.scrape_race("202505010111")
+
+    assert race is not None
+    entries = (
+        await db_session.execute(
+            select(Horse.horse_id, RaceEntry.horse_number, RaceEntry.finish_position)
+            .join(RaceEntry.horse)
+            .where(RaceEntry.race_id == race.id)
+            .order_by(RaceEntry.finish_position)
+        )
+    ).all()
+    assert [tuple(e) for e in entries] == [
+        ("2021104567", 5, 1),
+        ("2021104568", 9, 2),
+        ("2021104569", 13, 3),
+    ]
+
+    # 集計用の数値カラムも取り込み時に入る
+    second = await db_session.scalar(
+        select(RaceEntry).where(RaceEntry.race_id == race.id, RaceEntry.finish_position == 2)
+    )
+    assert second is not None
+    assert (second.pass_1, second.pass_2, second.pass_3, second.pass_4) == (5, 5, 4, 2)
+    assert second.margin_lengths == 0.25
+
+
+@pytest.mark.asyncio
+async def test_scrape_race_reuses_existing_horses(
+    service: ScraperService, db_session: AsyncSession
+) -> None:
+    """登録済みの馬は作り直さず、既存の行に出走記録を紐付けること"""
+    existing = Horse(horse_id="2021104568", name="テストアーモンド", sire="既存サイアー")
+    db_session.add(existing)
+    await db_session.commit()
+
+    race = await service.scrape_race("202505010111")
+
+    assert race is not None
+    assert await db_session.scalar(select(func.count()).select_from(Horse)) == 3
+    entry = await db_session.scalar(select(RaceEntry).where(RaceEntry.horse_id == existing.id))
+    assert entry is not None
+    assert entry.horse_number == 9
+
+
+@pytest.mark.asyncio
+async def test_save_race_uses_constant_queries(
+    service: ScraperService, db_session: AsyncSession
+) -> None:
+    """出走頭数に関わらず、馬の解決と出走記録の保存が一定回数のクエリで済むこと"""
+    statements = _count_statements(db_session)
+
+    await service.scrape_race("202505010111")
+
+    # 既存チェック / Race INSERT / 馬の IN 検索 / 馬の一括 INSERT / 出走記録の一括 INSERT
+    # / 集計成績の再計算 (SELECT + UPSERT) / レース詳細の文書 (レース・出走記録の SELECT + UPSERT)
+    queries = [s for s in statements if s.lstrip().upper().startswith(("SELECT", "INSERT"))]
+    assert len(queries) == 10
+    assert await db_session.scalar(select(func.count()).select_from(Race)) == 1
+
+
+@pytest.mark.asyncio
+async def test_scrape_date(service: ScraperService, db_session: AsyncSession) -> None:
+    """未取得のレースだけを保存し、取得・保存に失敗したレースを個別に報告すること"""
+    db_session.add(
+        Race(
+            race_id="202506010101",
+            name="既存レース",
+            date=date(2025, 6, 1),
+            venue="中山",
+            course_type="芝",
+            distance=1600,
+        )
+    )
+    await db_session.commit()
+
+    client = service._client
+    assert isinstance(client, _StubClient)
+    client.race_pages["202506010103"] = httpx.ConnectError("connection refused")
+    # 同じ馬が2行ある結果ページは uq_race_horse 違反で保存に失敗する
+    client.race_pages["202506010104"] = SAMPLE_RACE_RESULT_HTML.replace(
+        "/horse/2021104568/", "/horse/2021104567/"
+    )
+
+    result = await service.scrape_date("20250601")
+
+    assert result == {
+        "total": 4,
+        "new": 1,
+        "skipped": 1,
+        "errors": 2,
+        "race_ids": ["202506010102"],
+        "failed_race_ids": ["202506010103", "202506010104"],
+    }
+    saved = (await db_session.execute(select(Race.race_id).order_by(Race.race_id))).scalars()
+    # 失敗したレースの行はセーブポイントごと取り消される
+    assert list(saved) == ["202506010101", "202506010102"]
+    assert await db_session.scalar(select(func.count()).select_from(RaceEntry)) == 3
+
+
+async def _job_statuses(
+    session: AsyncSession, model: type[ScrapeJobDate] | type[ScrapeJobRace], job_id: int
+) -> dict[str, str]:
+    key = ScrapeJobDate.date if model is ScrapeJobDate else ScrapeJobRace.race_id
+    result = await session.execute(select(key, model.status).where(model.job_id == job_id))
+    return {str(k): status for k, status in result}
+
+
+@pytest.mark.asyncio
+async def test_scrape_range(service: ScraperService, db_session: AsyncSession) -> None:
+    """期間内の各日を収集し、開催のない日をカレンダーに記録すること"""
+    client = service._client
+    assert isinstance(client, _StubClient)
+    client.race_lists["20250602"] = _NO_RACES_HTML
+
+    job = await service.scrape_range(date(2025, 6, 1), date(2025, 6, 2))
+
+    assert job.status == "completed"
+    assert await _job_statuses(db_session, ScrapeJobDate, job.id) == {
+        "2025-06-01": "done",
+        "2025-06-02": "no_races",
+    }
+    races = await _job_statuses(db_session, ScrapeJobRace, job.id)
+    assert races == {f"20250601010{i}": "saved" for i in range(1, 5)}
+    calendar = await db_session.get(RaceCalendar, date(2025, 6, 2))
+    assert calendar is not None
+    assert calendar.race_id_list == []
+
+
+@pytest.mark.asyncio
+async def test_scrape_range_resumes(service: ScraperService, db_session: AsyncSession) -> None:
+    """再実行時は完了済みの日付・レースを飛ばし、失敗したところから続けること"""
+    client = service._client
+    assert isinstance(client, _StubClient)
+    client.race_pages["202506010103"] = httpx.ConnectError("connection refused")
+    client.race_lists["20250602"] = _race_list_html("202506010201")
+    client.race_lists["20250603"] = httpx.ConnectError("connection refused")
+
+    first = await service.scrape_range(date(2025, 6, 1), date(2025, 6, 3))
+
+    assert first.status == "failed"
+    assert await _job_statuses(db_session, ScrapeJobDate, first.id) == {
+        "2025-06-01": "failed",
+        "2025-06-02": "done",
+        "2025-06-03": "failed",
+    }
+    assert (await _job_statuses(db_session, ScrapeJobRace, first.id))["202506010103"] == "failed"
+
+    # 障害が解消した後の再実行
+    client.race_pages.clear()
+    del client.race_lists["20250603"]
+    client.fetched_lists.clear()
+    client.fetched_races.clear()
+
+    second = await service.scrape_range(date(2025, 6, 1), date(2025, 6, 3))
+
+    assert second.id == first.id
+    assert second.status == "completed"
+    # 6/1 の一覧はカレンダーから読み、失敗したレースだけを取り直す
+    assert client.fetched_lists == ["20250603"]
+    assert client.fetched_races == ["202506010103"]
+    assert set((await _job_statuses(db_session, ScrapeJobDate, first.id)).values()) == {"done"}
+
+
+@pytest.mark.asyncio
+async def test_empty_calendar_expires(service: ScraperService, db_session: AsyncSession) -> None:
+    """空の一覧は有効期限を過ぎたら取り直し、レースのある一覧はそのまま使うこと"""
+    client = service._client
+    assert isinstance(client, _StubClient)
+    db_session.add_all(
+        [
+            RaceCalendar(
+                date=date(2025, 6, 1), race_ids="", fetched_at=datetime.now() - timedelta(days=2)
+            ),
+            RaceCalendar(date=date(2025, 6, 2), race_ids="", fetched_at=datetime.now()),
+            RaceCalendar(
+                date=date(2025, 6, 3),
+                race_ids="202506030101",
+                fetched_at=datetime.now() - timedelta(days=30),
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    assert len(await service._list_race_ids(date(2025, 6, 1))) == 4
+    assert await service._list_race_ids(date(2025, 6, 2)) == []
+    assert await service._list_race_ids(date(2025, 6, 3)) == ["202506030101"]
+    assert client.fetched_lists == ["20250601"]
+    await db_session.commit()
+
+    # 取り直した一覧で記録を更新する
+    client.fetched_lists.clear()
+    assert len(await service._list_race_ids(date(2025, 6, 1))) == 4
+    assert client.fetched_lists == []
+
+
+async def _horse_race_ids(session: AsyncSession, horse: Horse) -> list[str]:
+    result = await session.execute(
+        select(Race.race_id)
+        .join(RaceEntry, RaceEntry.race_id == Race.id)
+        .where(RaceEntry.horse_id == horse.id)
+        .order_by(Race.race_id)
+    )
+    return list(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_scrape_horse_history_links_existing_races(
+    service: ScraperService, db_session: AsyncSession
+) -> None:
+    """保存済みのレースはそのまま使い、未登録のレースだけスタブを作ること"""
+    await service.scrape_race("202505010111")
+
+    horse = await service.scrape_horse_history("2021104567")
+
+    assert horse is not None
+    assert horse.sire == "テストサイアー"
+    assert await _horse_race_ids(db_session, horse) == ["202505010111", "202506020810"]
+    stub = await db_session.scalar(select(Race).where(Race.race_id == "202506020810"))
+    assert stub is not None
+    # 頭数は戦績の「頭数」列から入る
+    assert stub.num_entries == 12
+    assert stub.course_type == "ダート"
+    # 結果ページ由来の出走記録は上書きされない
+    entry = await db_session.scalar(
+        select(RaceEntry)
+        .join(Race, RaceEntry.race_id == Race.id)
+        .where(Race.race_id == "202505010111", RaceEntry.horse_id == horse.id)
+    )
+    assert entry is not None
+    assert entry.horse_number == 5
+    assert entry.finish_time == "1:59.5"
+    assert entry.finish_time_sec == 119.5
+
+
+@pytest.mark.asyncio
+async def test_scrape_horse_history_is_idempotent(
+    service: ScraperService, db_session: AsyncSession
+) -> None:
+    """同じ馬を2回取得しても出走記録が重複しないこと"""
+    await service.scrape_horse_history("2021104567")
+    horse = await service.scrape_horse_history("2021104567")
+
+    assert horse is not None
+    assert await db_session.scalar(select(func.count()).select_from(RaceEntry)) == 2
+    assert await db_session.scalar(select(func.count()).select_from(Race)) == 2
+
+
+async def _race_versions(session: AsyncSession) -> dict[str, int]:
+    result = await session.execute(select(Race.race_id, Race.data_version))
+    return {race_id: version for race_id, version in result}
+
+
+@pytest.mark.asyncio
+async def test_scrape_horse_history_bumps_changed_races(
+    service: ScraperService, db_session: AsyncSession
+) -> None:
+    """出走記録が増えたレースと、情報が変わった馬のレースだけ data_version が進むこと"""
+    await service.scrape_race("202505010111")
+    assert await _race_versions(db_session) == {"202505010111": 1}
+
+    horse = await service.scrape_horse_history("2021104567")
+    assert horse is not None
+    # 結果ページで作った馬に血統が入り、出走済みのレースの詳細も変わる。スタブは記録が増えた
+    assert horse.data_version == 2
+    assert await _race_versions(db_session) == {"202505010111": 2, "202506020810": 2}
+
+    # 同じ内容の再取得では何も変わらない
+    await service.scrape_horse_history("2021104567")
+    await db_session.refresh(horse)
+    assert horse.data_version == 2
+    assert await _race_versions(db_session) == {"202505010111": 2, "202506020810": 2}
+
+    client = service._client
+    assert isinstance(client, _StubClient)
+    client.horse_html = SAMPLE_HORSE_HTML.replace("テストサイアー", "別のサイアー")
+    await service.scrape_horse_history("2021104567")
+    await db_session.refresh(horse)
+    assert horse.data_version == 3
+    assert await _race_versions(db_session) == {"202505010111": 3, "202506020810": 3}
+
+
+@pytest.mark.asyncio
+async def test_race_documents_follow_ingest(
+    service: ScraperService, db_session: AsyncSession
+) -> None:
+    """レースを保存・更新するたびに、同じトランザクションで文書が作り直されること"""
+    await service.scrape_race("202505010111")
+    document = await db_session.get(RaceDocument, "202505010111")
+    assert document is not None
+    body = json.loads(gzip.decompress(document.body))
+    assert body["race_id"] == "202505010111"
+    assert [e["horse_number"] for e in body["entries"]] == [5, 9, 13]
+    assert body["entries"][0]["horse"]["sire"] is None
+
+    await service.scrape_horse_history("2021104567")
+    result = await db_session.scalars(
+        select(RaceDocument).execution_options(populate_existing=True)
+    )
+    documents = {document.race_id: document for document in result}
+    # 戦績から作ったスタブにも文書ができ、版はレースの行と一致する
+    assert {race_id: d.data_version for race_id, d in documents.items()} == (
+        await _race_versions(db_session)
+    )
+    body = json.loads(gzip.decompress(documents["202505010111"].body))
+    assert body["entries"][0]["horse"]["sire"] == "テストサイアー"
+
+
+@pytest.mark.asyncio
+async def test_scrape_horse_history_uses_constant_queries(
+    service: ScraperService, db_session: AsyncSession
+) -> None:
+    """戦績の行数に関わらず、一定回数のクエリで保存できること"""
+    statements = _count_statements(db_session)
+
+    await service.scrape_horse_history("2021104567")
+
+    # 馬の検索 / 馬の INSERT / レースの IN 検索 / スタブの一括 INSERT / 出走記録の一括 UPSERT
+    # / 集計成績の再計算 (SELECT + UPSERT) / レース詳細の文書 (レース・出走記録の SELECT + UPSERT)
+    queries = [s for s in statements if s.lstrip().upper().startswith(("SELECT", "INSERT"))]
+    assert len(queries) == 10
+    assert any("ON CONFLICT" in s for s in queries)
+
+
+@pytest.mark.asyncio
+async def test_horse_stats_follow_ingest(service: ScraperService, db_session: AsyncSession) -> None:
+    """レース・戦績を保存するたびに、その馬の集計成績が更新されること"""
+    await service.scrape_race("202505010111")
+    horse = await db_session.scalar(select(Horse).where(Horse.horse_id == "2021104567"))
+    assert horse is not None
+    stats = await db_session.get(HorseStats, horse.id)
+    assert stats is not None
+    assert stats.races_count == 1
+    assert stats.last_race_date == date(2025, 6, 1)
+
+    await service.scrape_horse_history("2021104567")
+    await db_session.refresh(stats)
+    # 戦績の1件は保存済みのレースと重なる
+    assert stats.races_count == 2
+    assert stats.style != "UNKNOWN"
+    # 全出走馬に行がある
+    assert await db_session.scalar(select(func.count()).select_from(HorseStats)) == (
+        await db_session.scalar(select(func.count()).select_from(Horse))
+    )
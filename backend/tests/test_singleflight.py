@@ -0,0 +1,133 @@
+"""
+single-flight（同時リクエストの重複排除）のテスト
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Horse, RaceEntry
+from app.scraper.service import ScraperService
+from app.scraper.singleflight import SingleFlight
+from tests.test_service import _StubClient
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution() -> None:
+    """同じキーの同時呼び出しは1回だけ実行され、結果を共有すること"""
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "done"
+
+    tasks = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert flight.in_flight("key")
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert sorted(results, key=lambda r: r[1]) == [("done", False), ("done", True), ("done", True)]
+    assert not flight.in_flight("key")
+
+
+@pytest.mark.asyncio
+async def test_error_is_shared_and_key_released() -> None:
+    """実行中の例外は待っていた呼び出しにも送出され、次の呼び出しは再実行されること"""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail() -> None:
+        await release.wait()
+        raise RuntimeError("boom")
+
+    tasks = [asyncio.create_task(flight.do("key", fail)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def succeed() -> int:
+        return 1
+
+    assert await flight.do("key", succeed) == (1, False)
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancellation_does_not_cancel_leader() -> None:
+    """待っている側がキャンセルされても、実行中の処理は続くこと"""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work() -> str:
+        await release.wait()
+        return "done"
+
+    leader = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    follower.cancel()
+    release.set()
+
+    assert await leader == ("done", False)
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+
+
+class _SlowClient(_StubClient):
+    """馬のページ取得を、解放されるまで止めておくクライアント"""
+
+    def __init__(self, release: asyncio.Event) -> None:
+        super().__init__()
+        self.release = release
+        self.horse_fetches = 0
+
+    async def fetch_horse_page(self, horse_id: str) -> str:
+        self.horse_fetches += 1
+        await self.release.wait()
+        return await super().fetch_horse_page(horse_id)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_horse_history_scrapes_fetch_once() -> None:
+    """別セッションから同じ馬を同時に取得しても、ダウンロードと保存は1回で済むこと"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    flight = SingleFlight()
+    release = asyncio.Event()
+    client = _SlowClient(release)
+
+    async def scrape() -> Horse | None:
+        async with factory() as session:
+            service = ScraperService(session, single_flight=flight)
+            service._client = client  # type: ignore[assignment]
+            horse = await service.scrape_horse_history("2021104567")
+            # 自分のセッションで読み直した行が返る
+            assert horse is None or horse in session
+            return horse
+
+    tasks = [asyncio.create_task(scrape()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    release.set()
+    horses = await asyncio.gather(*tasks)
+
+    assert client.horse_fetches == 1
+    assert {h.horse_id for h in horses if h is not None} == {"2021104567"}
+    async with factory() as session:
+        assert await session.scalar(select(func.count()).select_from(Horse)) == 1
+        assert await session.scalar(select(func.count()).select_from(RaceEntry)) == 2
+
+    await engine.dispose()
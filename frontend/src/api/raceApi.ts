@@ -1,13 +1,19 @@
-import type { HorseAnalysisResponse, RaceDetailResponse, RaceListItem } from "../types";
+import type { HorseAnalysisResponse, RaceDetailResponse, RaceListPage } from "../types";
 
 const API_BASE = import.meta.env.VITE_API_BASE || "/api";
 
 export const raceApi = {
-    // レース一覧取得
-    getRaces: async (): Promise<RaceListItem[]> => {
-        const response = await fetch(`${API_BASE}/races`);
+    // レース一覧取得（新しい順。続きは nextCursor を渡して取得する）
+    getRaces: async (cursor?: string): Promise<RaceListPage> => {
+        const params = new URLSearchParams();
+        if (cursor) params.set("cursor", cursor);
+        const query = params.toString();
+        const response = await fetch(`${API_BASE}/races${query ? `?${query}` : ""}`);
         if (!response.ok) throw new Error("Failed to fetch races");
-        return response.json();
+        return {
+            races: await response.json(),
+            nextCursor: response.headers.get("X-Next-Cursor"),
+        };
     },
 
     // レース詳細取得
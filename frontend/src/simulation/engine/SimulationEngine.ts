@@ -92,10 +92,9 @@ export class SimulationEngine {
         // 各馬の速度を算出
         this._speeds = horses.map((h) => {
             // 実データ（結果）がある場合はそれを利用する "Result Mode"
-            // finish_time (秒換算) があるかどうか
-            if (h.entry.finish_time) {
-                // finish_time は "1:23.4" などの形式かもしれないし、秒数かもしれない
-                // ここでは単純化のため、別途パースが必要だが、EntryResponseの型定義ではstring
+            // finish_time_sec (秒換算済み) があるかどうか
+            if (h.entry.finish_time_sec) {
+                // タイムはバックエンドで秒に変換済み（finish_time の文字列をパースする必要はない）
                 // Phase C-1 で詳細実装するが、まずは既存ロジックの延長で対応
                 // 実データがある場合、そのタイムでゴールするように逆算するべきだが
                 // 現状は簡易的にスピード指数を使用
@@ -37,12 +37,21 @@ export function useRaceData(): UseRaceDataReturn {
 
     // レース一覧取得
     useEffect(() => {
+        let cancelled = false;
         const fetchRaces = async () => {
             try {
-                const data = await raceApi.getRaces();
-                setRaces(data);
-                if (data.length > 0) {
-                    setSelectedRaceId(data[0].race_id);
+                // 最初のページを表示してから、nextCursor がなくなるまで続きを読み足す
+                let page = await raceApi.getRaces();
+                if (cancelled) return;
+                setRaces(page.races);
+                if (page.races.length > 0) {
+                    setSelectedRaceId(page.races[0].race_id);
+                }
+                while (page.nextCursor) {
+                    page = await raceApi.getRaces(page.nextCursor);
+                    if (cancelled) return;
+                    const more = page.races;
+                    setRaces((prev) => [...prev, ...more]);
                 }
             } catch (e: unknown) {
                 // eslint-disable-next-line no-console
@@ -50,6 +59,9 @@ export function useRaceData(): UseRaceDataReturn {
             }
         };
         void fetchRaces();
+        return () => {
+            cancelled = true;
+        };
     }, []);
 
     // レース詳細 & 馬分析データの読み込み
@@ -30,6 +30,9 @@ export interface EntryResponse {
     horse_weight?: number;
     horse_weight_diff?: number;
     status: string;
+    finish_time_sec?: number; // 走破タイム（秒）
+    corner_positions?: (number | null)[]; // 1〜4コーナーの通過順位
+    margin_lengths?: number; // 前の馬との着差（馬身）
 }
 
 export interface RaceListItem {
@@ -44,6 +47,13 @@ export interface RaceListItem {
     num_entries?: number;
 }
 
+/** レース一覧の1ページ (GET /api/races) */
+export interface RaceListPage {
+    races: RaceListItem[];
+    /** 次ページのカーソル（最終ページなら null） */
+    nextCursor: string | null;
+}
+
 export interface RaceDetailResponse {
     race_id: string;
     name: string;
@@ -64,4 +74,5 @@ export interface HorseAnalysisResponse {
     name: string;
     style: string;
     stats: Record<string, number>;
+    stale?: boolean; // 過去成績の再取得待ち（バックグラウンドで更新中）
 }